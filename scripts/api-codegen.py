@@ -53,6 +53,90 @@ typemap = {
     "null": "None",
 }
 
+# 只读 action：没有副作用，NapCatClient 会合并参数相同的在途调用，断线重连后也可重放。
+# 逐个列出而不按名称前缀推断：新增的 action 需要人工确认后加入
+READ_ONLY = {
+    "get_group_album_media_list",
+    "get_qun_album_list",
+    "get_doubt_friends_add_request",
+    "get_private_file_url",
+    "get_unidirectional_friend_list",
+    "get_msg",
+    "get_forward_msg",
+    "get_login_info",
+    "get_stranger_info",
+    "get_friend_list",
+    "get_group_info",
+    "get_group_list",
+    "get_group_member_info",
+    "get_group_member_list",
+    "get_group_honor_info",
+    "get_record",
+    "get_image",
+    "can_send_image",
+    "can_send_record",
+    "get_status",
+    "get_version_info",
+    "_get_model_show",
+    "get_online_clients",
+    "get_group_msg_history",
+    "ocr_image",
+    ".ocr_image",
+    "get_group_system_msg",
+    "get_essence_msg_list",
+    "get_group_at_all_remain",
+    "_get_group_notice",
+    "get_group_file_system_info",
+    "get_group_root_files",
+    "get_group_files_by_folder",
+    "get_group_file_url",
+    "check_url_safely",
+    "get_robot_uin_range",
+    "get_friends_with_category",
+    "get_file",
+    "translate_en2zh",
+    "get_friend_msg_history",
+    "get_collection_list",
+    "get_recent_contact",
+    "get_profile_like",
+    "fetch_custom_face",
+    "fetch_emoji_like",
+    "get_group_info_ex",
+    "get_group_detail_info",
+    "get_group_ignore_add_request",
+    "nc_get_packet_status",
+    "nc_get_user_status",
+    "get_group_shut_list",
+    "get_guild_list",
+    "get_guild_service_profile",
+    "get_group_ignored_notifies",
+    "get_ai_characters",
+    "get_fileset_info",
+    "get_flash_file_list",
+    "get_flash_file_url",
+    "get_fileset_id",
+    "get_online_file_msg",
+}
+
+# 名称像查询但不能合并或重放的 action：签发凭证 / 密钥 (每个调用方应拿到各自的结果)，或在服务端生成内容
+NOT_READ_ONLY = {
+    "get_cookies",
+    "get_csrf_token",
+    "get_credentials",
+    "get_clientkey",
+    "get_rkey",
+    "get_rkey_server",
+    "nc_get_rkey",
+    "get_ai_record",
+    "get_mini_app_ark",
+    "get_share_link",
+}
+
+def is_read_only(operation_id: str) -> bool:
+    if operation_id not in READ_ONLY and operation_id not in NOT_READ_ONLY and operation_id.startswith(("get_", "fetch_", "nc_get_", "_get_")):
+        print(f"warning: {operation_id} is not classified, treated as not read-only")
+    return operation_id in READ_ONLY
+
 client_api_code = """# Auto-generated file. Do not modify directly.
 # 自动生成的文件。请勿直接修改。
 
@@ -62,6 +146,7 @@ from .types.schemas import (
 """
 
 api_func_code = ""
+read_only_actions: list[str] = []
 
 for endpoint in api_schema["paths"].values():
     method = endpoint.get("post", {})
@@ -76,6 +161,9 @@ for endpoint in api_schema["paths"].values():
     else:
         client_api_code += f"   {RequestClassName},\n   {ResponseClassName},\n"
 
+    if is_read_only(operation_id):
+        read_only_actions.append(operation_id)
+
     doc_str = docstring_map.get(operation_id, '        \"\"\"\n        未提供描述\n        \"\"\"')
     # 3. 自适应生成函数签名
     if is_union_request:
@@ -110,7 +198,14 @@ for endpoint in api_schema["paths"].values():
         content += f"\n\ntype {ResponseClassName} = {typemap[responseSchema['type']]}\n"
         continue
 
+read_only_code = "".join(f'    "{action}",\n' for action in read_only_actions)
+
 client_api_code += f""")
+
+# 只读 action (无副作用)：参数相同的在途调用会被合并，断线时在途的调用可在新连接上重放
+READ_ONLY_ACTIONS: frozenset[str] = frozenset({{
+{read_only_code}}})
+
 # 定义一个 Protocol，避免循环导入 Client 类，同时保证类型提示
 class CallActionProtocol(Protocol):
     async def call_action(self, action: str, params: Mapping[str, Any] | None = None) -> Any: ...
@@ -6,6 +6,17 @@ __version__ = "0.3.4"
 # 2. 核心功能组件
 from .client import NapCatClient
 from .server import ReverseWebSocketServer
+from .broadcast import Block, DropNewest, DropOldest, SpillToDisk
+from .filters import EventFilter
+from .reconnect import ReconnectPolicy
+from .backfill import Backfill
+from .outbox import Priority
+from .prometheus import MetricsExporter
+from .roster import Roster
+from .member_cache import MemberCache
+from .friend_cache import FriendCache
+from .group_cache import GroupCache
+from .message_store import MessageStore
 
 # 3. 常用类型快捷导入
 # 用户经常需要判断事件类型或构建消息，直接放在顶层很方便
@@ -18,6 +29,9 @@ from .types import (
     MetaEvent,
     # 消息段构造器
     MessageSegment,
+    # 校验模式
+    ValidationMode,
+    set_validation_mode,
 )
 
 # 4. 如果用户需要更深层的类型，可以保留 types 模块本身
@@ -29,6 +43,22 @@ __all__ = [
     # Core
     "NapCatClient",
     "ReverseWebSocketServer",
+    "ReconnectPolicy",
+    "Backfill",
+    "Priority",
+    "MetricsExporter",
+    "Roster",
+    "MemberCache",
+    "FriendCache",
+    "GroupCache",
+    "MessageStore",
+
+    # Backpressure Policies
+    "DropOldest",
+    "DropNewest",
+    "Block",
+    "SpillToDisk",
+    "EventFilter",
     
     # Common Events
     "NapCatEvent",
@@ -39,6 +69,10 @@ __all__ = [
     
     # Messaging
     "MessageSegment",
+
+    # Validation
+    "ValidationMode",
+    "set_validation_mode",
     
     # Modules
     "types",
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from .broadcast import EventHub
+    from .client import NapCatClient
+
+logger = logging.getLogger("napcat.backfill")
+
+# ("group", group_id) 或 ("private", user_id)
+type Peer = tuple[str, int]
+
+
+@dataclass(slots=True)
+class BackfillStats:
+    runs: int = 0
+    fetched: int = 0
+    injected: int = 0
+    duplicates: int = 0
+    failed_peers: int = 0
+
+
+class Backfill:
+    """
+    断线补偿：记录每个群 / 好友最后一条消息的 message_seq，
+    重连后通过 get_group_msg_history / get_friend_msg_history 拉取断线期间的消息，
+    按 message_id 去重后以 backfilled=True 注入事件流。
+
+    :param page_size: 每次历史查询的条数
+    :param max_pages: 单个会话最多向前翻的页数，防止长时间断线后无限回溯
+    :param concurrency: 同时拉取历史的会话数上限
+    :param max_peers: 记录游标的会话数上限，超出时淘汰最久没有消息的会话
+    :param seen_capacity: 用于去重的 message_id 窗口大小
+    """
+
+    def __init__(
+        self,
+        *,
+        page_size: int = 20,
+        max_pages: int = 5,
+        concurrency: int = 4,
+        max_peers: int = 1000,
+        seen_capacity: int = 10_000,
+    ):
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.max_peers = max_peers
+        self.seen_capacity = seen_capacity
+        self.stats = BackfillStats()
+        # peer -> (message_seq, time)，按最近活跃排序
+        self._cursors: OrderedDict[Peer, tuple[int, int]] = OrderedDict()
+        self._seen: OrderedDict[int, None] = OrderedDict()
+
+    def observe(self, raw: dict[str, Any]) -> bool:
+        """EventHub 的 tap：记录游标并丢弃已经分发过的重复消息"""
+        if raw.get("post_type") != "message":
+            return True
+        message_id = raw.get("message_id")
+        if isinstance(message_id, int):
+            if message_id in self._seen:
+                self.stats.duplicates += 1
+                return False
+            self._seen[message_id] = None
+            if len(self._seen) > self.seen_capacity:
+                self._seen.popitem(last=False)
+        if (peer := _peer_of(raw)) is not None:
+            seq, ts = raw.get("message_seq"), raw.get("time")
+            if isinstance(seq, int) and isinstance(ts, int):
+                last = self._cursors.get(peer)
+                # 补发的旧消息不回退游标
+                if last is None or ts >= last[1]:
+                    self._cursors[peer] = (seq, ts)
+                    self._cursors.move_to_end(peer)
+                    if len(self._cursors) > self.max_peers:
+                        self._cursors.popitem(last=False)
+        return True
+
+    async def run(self, client: "NapCatClient", hub: "EventHub") -> int:
+        """拉取所有已知会话的缺失消息并注入 hub，返回注入条数"""
+        self.stats.runs += 1
+        peers: asyncio.Queue[tuple[Peer, tuple[int, int]]] = asyncio.Queue()
+        for item in list(self._cursors.items()):
+            peers.put_nowait(item)
+        injected = 0
+
+        async def worker() -> None:
+            nonlocal injected
+            while not peers.empty():
+                peer, cursor = peers.get_nowait()
+                try:
+                    missed = await self._fetch_missed(client, peer, cursor)
+                except Exception as e:
+                    self.stats.failed_peers += 1
+                    logger.warning(f"Backfill failed for {peer}: {e!r}")
+                    continue
+                for raw in missed:
+                    if raw.get("message_id") in self._seen:
+                        continue
+                    # 与实时事件走同一个分发队列，Block 订阅者积压时保持顺序
+                    hub.dispatch(raw | {"backfilled": True})
+                    injected += 1
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, peers.qsize()))))
+        self.stats.injected += injected
+        if injected:
+            logger.info(f"Backfilled {injected} messages")
+        return injected
+
+    async def _fetch_missed(
+        self, client: "NapCatClient", peer: Peer, cursor: tuple[int, int]
+    ) -> list[dict[str, Any]]:
+        """从最新一页开始向前翻页，直到遇到游标所在的消息；返回按时间升序排列的缺失消息"""
+        kind, peer_id = peer
+        last_seq, last_time = cursor
+        action = "get_group_msg_history" if kind == "group" else "get_friend_msg_history"
+        id_key = "group_id" if kind == "group" else "user_id"
+        params: dict[str, Any] = {id_key: str(peer_id), "count": self.page_size}
+
+        pages: list[list[dict[str, Any]]] = []
+        for _ in range(self.max_pages):
+            data = await client.call_action(action, params)
+            messages = cast(list[dict[str, Any]], (data or {}).get("messages") or [])
+            self.stats.fetched += len(messages)
+            reached = len(messages) < self.page_size
+            page: list[dict[str, Any]] = []
+            for m in messages:
+                if m.get("message_seq") == last_seq or _message_time(m) < last_time:
+                    reached = True
+                elif m.get("user_id") != m.get("self_id"):  # 自己发出的消息不补发
+                    page.append(m)
+            pages.append(page)
+            if reached:
+                break
+            oldest = min(messages, key=_message_time)
+            params["message_seq"] = str(oldest.get("message_seq", oldest.get("message_id")))
+
+        # 相邻两页在翻页边界处会重叠一条
+        unique = {m.get("message_id"): m for page in reversed(pages) for m in page}
+        return sorted(unique.values(), key=_message_time)
+
+
+def _peer_of(raw: Mapping[str, Any]) -> Peer | None:
+    message_type = raw.get("message_type")
+    if message_type == "group":
+        peer_id = raw.get("group_id")
+    elif message_type == "private":
+        peer_id = raw.get("user_id")
+    else:
+        return None
+    if isinstance(peer_id, str) and peer_id.isdigit():
+        peer_id = int(peer_id)
+    if not isinstance(peer_id, int):
+        return None
+    return (message_type, peer_id)
+
+
+def _message_time(m: dict[str, Any]) -> int:
+    return cast(int, m.get("time", 0))
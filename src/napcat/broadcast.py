@@ -0,0 +1,609 @@
+import asyncio
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+from asyncio import Future, Task
+from collections import Counter, deque
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import IO, Any
+
+import orjson
+
+logger = logging.getLogger("napcat.broadcast")
+
+LagHandler = Callable[[int], None]
+Decoder = Callable[[dict[str, Any]], Any]
+RawFilter = Callable[[dict[str, Any]], bool]
+# 在分发前观察每一帧原始事件，返回 False 时丢弃该帧 (如去重)
+RawTap = Callable[[dict[str, Any]], bool | None]
+_UNSET = object()
+
+
+def _log_lag(skipped: int) -> None:
+    logger.warning(f"Event subscriber lagged behind, skipped {skipped} events")
+
+
+def _accepts(accept: RawFilter, raw: dict[str, Any]) -> bool:
+    """调用用户提供的过滤器；抛出异常时记录日志并视为拒绝，不影响读循环与其他订阅者"""
+    try:
+        return accept(raw)
+    except Exception:
+        logger.exception("Event filter raised, event skipped for this subscriber")
+        return False
+
+
+class EventRing[T]:
+    """
+    单生产者、多消费者的环形缓冲。
+    所有订阅者共享同一份存储，每个订阅者只持有一个读游标，
+    因此写入开销与内存占用都不随订阅者数量增长。
+    """
+
+    def __init__(self, capacity: int = 500):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._buf: list[T | None] = [None] * capacity
+        # 累计写入条数，同时也是下一条的序号
+        self._seq = 0
+        self._waiter: Future[None] | None = None
+        self._closed = False
+        self.subscribers = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def publish(self, item: T) -> None:
+        if self._closed:
+            return
+        self._buf[self._seq % self.capacity] = item
+        self._seq += 1
+        self._wake()
+
+    def close(self) -> None:
+        """关闭后订阅者消费完剩余数据即结束迭代"""
+        self._closed = True
+        self._wake()
+
+    def subscribe(self, on_lag: LagHandler | None = None) -> "RingSubscriber[T]":
+        return RingSubscriber(self, on_lag)
+
+    def _wake(self) -> None:
+        if (waiter := self._waiter) is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _wait(self) -> None:
+        if self._waiter is None:
+            self._waiter = asyncio.get_running_loop().create_future()
+        await self._waiter
+
+
+class RingSubscriber[T]:
+    """
+    环形缓冲的读游标，作为异步迭代器使用。
+    落后超过容量时直接跳到最旧的可读位置，并通过 on_lag 报告跳过的条数。
+    """
+
+    __slots__ = ("_ring", "_next", "_on_lag", "skipped", "_active")
+
+    def __init__(self, ring: EventRing[T], on_lag: LagHandler | None = None):
+        self._ring = ring
+        self._next = ring._seq
+        self._on_lag = on_lag or _log_lag
+        self.skipped = 0
+        self._active = True
+        ring.subscribers += 1
+
+    @property
+    def pending(self) -> int:
+        """尚未读取的条数（可能超过容量，超出部分会在下次读取时被跳过）"""
+        return self._ring._seq - self._next
+
+    def close(self) -> None:
+        if self._active:
+            self._active = False
+            self._ring.subscribers -= 1
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> T:
+        ring = self._ring
+        while self._next == ring._seq:
+            if ring._closed or not self._active:
+                self.close()
+                raise StopAsyncIteration
+            await ring._wait()
+
+        lag = ring._seq - self._next
+        if lag > ring.capacity:
+            skipped = lag - ring.capacity
+            self._next += skipped
+            self.skipped += skipped
+            self._on_lag(skipped)
+
+        item = ring._buf[self._next % ring.capacity]
+        self._next += 1
+        return item  # type: ignore[return-value]
+
+
+class Envelope:
+    """
+    环形缓冲中的一条事件：保存原始 dict，首次被读取时才解码，
+    解码结果被所有订阅者共享。
+    """
+
+    __slots__ = ("raw", "_decoder", "_event")
+
+    def __init__(self, raw: dict[str, Any], decoder: Decoder | None):
+        self.raw = raw
+        self._decoder = decoder
+        self._event: Any = _UNSET
+
+    @property
+    def event(self) -> Any:
+        """解码后的事件；解码失败时为 None"""
+        if self._event is _UNSET:
+            if self._decoder is None:
+                self._event = self.raw
+            else:
+                try:
+                    self._event = self._decoder(self.raw)
+                except Exception as e:
+                    logger.warning(f"Failed to decode event: {e}")
+                    self._event = None
+        return self._event
+
+
+@dataclass(slots=True)
+class SubscriberStats:
+    depth: int = 0
+    high_water: int = 0
+    dropped: int = 0
+    spilled: int = 0
+
+
+class BackpressurePolicy(ABC):
+    """
+    订阅者的背压策略。每次 events() 订阅使用一个独立的策略实例，
+    订阅期间可通过 policy.stats 读取 depth / high_water / dropped 计数。
+    """
+
+    def __init__(self):
+        self._stats = SubscriberStats()
+        # 作用于原始 dict 的过滤器，由 EventHub.subscribe 设置
+        self.filter: RawFilter | None = None
+
+    @property
+    def stats(self) -> SubscriberStats:
+        return self._stats
+
+    @abstractmethod
+    def attach(self, hub: "EventHub") -> None: ...
+
+    @abstractmethod
+    def detach(self) -> None: ...
+
+    @abstractmethod
+    async def get(self) -> Envelope:
+        """取下一条事件，没有更多事件时抛出 StopAsyncIteration"""
+
+
+class DropOldest(BackpressurePolicy):
+    """
+    默认策略：直接读取共享环形缓冲，不占用额外内存。
+    落后超过缓冲容量时跳过最旧的事件，并以跳过条数调用 on_lag。
+    """
+
+    def __init__(self, on_lag: LagHandler | None = None):
+        super().__init__()
+        self._on_lag = on_lag or _log_lag
+        self._sub: RingSubscriber[Envelope] | None = None
+
+    @property
+    def stats(self) -> SubscriberStats:
+        """
+        由读游标的落后量即时计算：消费者停滞时积压照样反映出来。
+        已被覆盖、尚未在读取时跳过的事件也计入 dropped
+        """
+        stats = self._stats
+        if overwritten := self._sample():
+            return SubscriberStats(stats.depth, stats.high_water, stats.dropped + overwritten, stats.spilled)
+        return stats
+
+    def _sample(self) -> int:
+        """按读游标当前的落后量更新 depth / high_water，返回已被覆盖、尚未跳过的条数"""
+        if (sub := self._sub) is None:
+            return 0
+        stats = self._stats
+        lag = sub.pending
+        capacity = sub._ring.capacity
+        stats.depth = min(lag, capacity)
+        if stats.depth > stats.high_water:
+            stats.high_water = stats.depth
+        return max(0, lag - capacity)
+
+    def attach(self, hub: "EventHub") -> None:
+        self._sub = hub.ring.subscribe(self._lagged)
+
+    def detach(self) -> None:
+        if self._sub:
+            self._sub.close()
+
+    def _lagged(self, skipped: int) -> None:
+        self._stats.dropped += skipped
+        self._on_lag(skipped)
+
+    async def get(self) -> Envelope:
+        assert self._sub is not None, "policy not attached"
+        # 落后量在两次读取之间只增不减，读取前记下峰值
+        self._sample()
+        env = await self._sub.__anext__()
+        if (accept := self.filter) is not None:
+            while not _accepts(accept, env.raw):
+                env = await self._sub.__anext__()
+        return env
+
+
+class BufferedPolicy(BackpressurePolicy):
+    """
+    带私有缓冲的策略基类：生产者通过 offer() 推送，子类决定缓冲满时的行为。
+    offer() 返回 awaitable 时生产者会等待它完成（即阻塞生产者）。
+    """
+
+    def __init__(self, maxsize: int = 500):
+        super().__init__()
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._buf: deque[Envelope] = deque()
+        self._hub: EventHub | None = None
+        self._waiter: Future[None] | None = None
+        self._space: Future[None] | None = None
+        self._closed = False
+
+    @abstractmethod
+    def offer(self, env: Envelope) -> Awaitable[None] | None: ...
+
+    def attach(self, hub: "EventHub") -> None:
+        self._hub = hub
+        hub._buffered.append(self)
+
+    def detach(self) -> None:
+        if self._hub and self in self._hub._buffered:
+            self._hub._buffered.remove(self)
+        self.close()
+
+    def close(self) -> None:
+        self._closed = True
+        self._waiter = _wake(self._waiter)
+        self._space = _wake(self._space)
+
+    def full(self) -> bool:
+        return len(self._buf) >= self.maxsize
+
+    def _push(self, env: Envelope) -> None:
+        self._buf.append(env)
+        self._record_depth()
+        self._waiter = _wake(self._waiter)
+
+    def _record_depth(self) -> None:
+        stats = self.stats
+        stats.depth = len(self._buf)
+        if stats.depth > stats.high_water:
+            stats.high_water = stats.depth
+
+    def _take(self) -> Envelope:
+        env = self._buf.popleft()
+        self.stats.depth = len(self._buf)
+        self._space = _wake(self._space)
+        return env
+
+    async def _wait_for_space(self) -> None:
+        while self.full() and not self._closed:
+            if self._space is None:
+                self._space = asyncio.get_running_loop().create_future()
+            await self._space
+
+    async def get(self) -> Envelope:
+        while not self._buf:
+            if self._closed:
+                raise StopAsyncIteration
+            if self._waiter is None:
+                self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+        return self._take()
+
+
+class DropNewest(BufferedPolicy):
+    """缓冲满时丢弃新到达的事件，保留已缓冲的旧事件"""
+
+    def offer(self, env: Envelope) -> Awaitable[None] | None:
+        if self.full():
+            self.stats.dropped += 1
+            return None
+        self._push(env)
+        return None
+
+
+class Block(BufferedPolicy):
+    """
+    缓冲满时新事件在该订阅者自己的等待队列中按顺序等待空位，最多等待 timeout 秒，超时的事件被丢弃并计入 dropped。
+    等待队列最多 max_pending 条，再满时新事件直接丢弃并计入 dropped，因此卡住的消费者占用的内存有上限。
+    只有该订阅者受影响：读循环与其他订阅者照常收到事件，消费者在处理事件时调用 action 也不会死锁。
+    """
+
+    def __init__(self, maxsize: int = 500, timeout: float = 5.0, max_pending: int = 1000):
+        super().__init__(maxsize)
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        if max_pending < 0:
+            raise ValueError("max_pending must not be negative")
+        self.timeout = timeout
+        self.max_pending = max_pending
+        # (事件, 截止时间)，按到达顺序排列
+        self._pending: deque[tuple[Envelope, float]] = deque()
+
+    def offer(self, env: Envelope) -> Awaitable[None] | None:
+        if not self.full():
+            self._push(env)
+            return None
+        now = asyncio.get_running_loop().time()
+        self._expire(now)
+        if len(self._pending) >= self.max_pending:
+            self.stats.dropped += 1
+            logger.debug("Blocked subscriber's pending queue is full, event dropped")
+        else:
+            self._pending.append((env, now + self.timeout))
+            self._record_depth()
+        return None
+
+    def _expire(self, now: float) -> None:
+        """丢弃已超时的等待事件；截止时间随到达顺序递增，只需检查队首"""
+        expired = 0
+        while self._pending and self._pending[0][1] < now:
+            self._pending.popleft()
+            expired += 1
+        if expired:
+            self.stats.dropped += expired
+            logger.warning(f"Blocked subscriber timed out after {self.timeout}s, {expired} event(s) dropped")
+
+    def _record_depth(self) -> None:
+        stats = self.stats
+        stats.depth = len(self._buf) + len(self._pending)
+        if stats.depth > stats.high_water:
+            stats.high_water = stats.depth
+
+    def _take(self) -> Envelope:
+        env = self._buf.popleft()
+        if self._pending:
+            self._expire(asyncio.get_running_loop().time())
+            if self._pending:
+                self._buf.append(self._pending.popleft()[0])
+        self.stats.depth = len(self._buf) + len(self._pending)
+        return env
+
+    @property
+    def pending(self) -> int:
+        """因缓冲已满而等待空位的事件数"""
+        return len(self._pending)
+
+
+class SpillToDisk(BufferedPolicy):
+    """
+    内存缓冲满后把后续事件的原始 JSON 追加写入临时文件，
+    消费者取空内存缓冲后再按顺序从文件读回，不丢事件也不阻塞生产者。
+    读回的事件会重新解码。
+    """
+
+    def __init__(self, maxsize: int = 500, directory: str | None = None):
+        super().__init__(maxsize)
+        self.directory = directory
+        self._file: IO[bytes] | None = None
+        self._read_pos = 0
+        self._spilled = 0
+
+    def offer(self, env: Envelope) -> Awaitable[None] | None:
+        # 一旦开始落盘，后续事件必须继续落盘以保证顺序
+        if self._spilled or self.full():
+            self._spill(env)
+        else:
+            self._push(env)
+        return None
+
+    def _spill(self, env: Envelope) -> None:
+        try:
+            line = orjson.dumps(env.raw) + b"\n"
+        except TypeError:
+            self.stats.dropped += 1
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self.directory)
+        self._file.seek(0, 2)
+        self._file.write(line)
+        self._spilled += 1
+        self.stats.spilled += 1
+        self.stats.depth = len(self._buf) + self._spilled
+        if self.stats.depth > self.stats.high_water:
+            self.stats.high_water = self.stats.depth
+        self._waiter = _wake(self._waiter)
+
+    def _unspill(self) -> None:
+        assert self._file is not None
+        decoder = self._hub.decoder if self._hub else None
+        self._file.seek(self._read_pos)
+        while self._spilled and len(self._buf) < self.maxsize:
+            line = self._file.readline()
+            self._spilled -= 1
+            self._buf.append(Envelope(orjson.loads(line), decoder))
+        self._read_pos = self._file.tell()
+        if not self._spilled:
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_pos = 0
+
+    def _record_depth(self) -> None:
+        super()._record_depth()
+        self.stats.depth += self._spilled
+
+    def _take(self) -> Envelope:
+        if not self._buf and self._spilled:
+            self._unspill()
+        env = super()._take()
+        self.stats.depth += self._spilled
+        return env
+
+    async def get(self) -> Envelope:
+        while not self._buf and not self._spilled:
+            if self._closed:
+                raise StopAsyncIteration
+            if self._waiter is None:
+                self._waiter = asyncio.get_running_loop().create_future()
+            await self._waiter
+        return self._take()
+
+    def detach(self) -> None:
+        super().detach()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._spilled = 0
+
+
+class EventHub:
+    """
+    事件分发中心：共享环形缓冲服务默认的 DropOldest 订阅者，
+    其余策略的订阅者各自持有私有缓冲，由 publish() 逐个推送。
+    """
+
+    def __init__(self, capacity: int = 500, decoder: Decoder | None = None, max_backlog: int = 10_000):
+        self.ring: EventRing[Envelope] = EventRing(capacity)
+        self.decoder = decoder
+        self.policies: list[BackpressurePolicy] = []
+        self._buffered: list[BufferedPolicy] = []
+        self.taps: list[RawTap] = []
+        # 自定义策略的 offer() 返回 awaitable 时，其后的事件在此排队，由 _drain 任务按顺序继续分发；
+        # 内置策略从不阻塞分发。超过 max_backlog 的事件被丢弃并计入 dropped_total
+        self.max_backlog = max_backlog
+        self._backlog: deque[dict[str, Any]] = deque()
+        self._drainer: Task[None] | None = None
+        # 按 post_type 统计收到的事件帧，由 Connection 的读循环维护
+        self.event_counts: Counter[str] = Counter()
+        # 已退订的订阅者累计丢弃的事件数 (在订阅者的 stats.dropped 基础上累加)
+        self.dropped_total = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self.policies)
+
+    @property
+    def closed(self) -> bool:
+        return self.ring.closed
+
+    @property
+    def backlog(self) -> int:
+        """因自定义策略阻塞分发而等待分发的事件数"""
+        return len(self._backlog)
+
+    def dispatch(self, raw: dict[str, Any]) -> None:
+        """
+        发布一条原始事件，从不阻塞调用方 (Connection 的读循环)。
+        有订阅者阻塞分发时，事件排队，由后台任务在其腾出空位后按到达顺序继续发布
+        """
+        # tap (缓存、去重等) 立即执行，不随分发积压而滞后
+        if not self._tap(raw):
+            return
+        if self._drainer is not None:
+            if len(self._backlog) >= self.max_backlog:
+                self.dropped_total += 1
+                logger.warning("Event backlog is full, event dropped")
+            else:
+                self._backlog.append(raw)
+        elif (blocked := self._deliver(raw)) is not None:
+            self._drainer = asyncio.create_task(self._drain(blocked))
+
+    async def _drain(self, blocked: Awaitable[None]) -> None:
+        try:
+            await blocked
+            while self._backlog:
+                if (pending := self._deliver(self._backlog.popleft())) is not None:
+                    await pending
+        finally:
+            self._drainer = None
+
+    def publish(self, raw: dict[str, Any]) -> Awaitable[None] | None:
+        """发布一条原始事件；返回非 None 时调用方需要 await（有订阅者在阻塞生产者）"""
+        if not self._tap(raw):
+            return None
+        return self._deliver(raw)
+
+    def _tap(self, raw: dict[str, Any]) -> bool:
+        """依次执行 taps；返回 False 表示该帧被丢弃。tap 抛出的异常只记录日志"""
+        for tap in self.taps:
+            try:
+                if tap(raw) is False:
+                    return False
+            except Exception:
+                logger.exception(f"Event tap {tap!r} raised")
+        return True
+
+    def _deliver(self, raw: dict[str, Any]) -> Awaitable[None] | None:
+        env = Envelope(raw, self.decoder)
+        if self.ring.subscribers:
+            self.ring.publish(env)
+        blocked: list[Awaitable[None]] | None = None
+        for policy in self._buffered:
+            if (accept := policy.filter) is not None and not _accepts(accept, raw):
+                continue
+            if (w := policy.offer(env)) is not None:
+                if blocked is None:
+                    blocked = []
+                blocked.append(w)
+        if blocked:
+            return _wait_all(blocked)
+        return None
+
+    async def subscribe(
+        self, policy: BackpressurePolicy | None = None, filter: RawFilter | None = None
+    ) -> AsyncGenerator[Any, None]:
+        policy = policy or DropOldest()
+        if self.closed:
+            return
+        policy.filter = filter
+        policy.attach(self)
+        self.policies.append(policy)
+        try:
+            while True:
+                try:
+                    env = await policy.get()
+                except StopAsyncIteration:
+                    break
+                if (event := env.event) is not None:
+                    yield event
+        finally:
+            self.policies.remove(policy)
+            self.dropped_total += policy.stats.dropped
+            policy.detach()
+
+    def close(self) -> None:
+        self.ring.close()
+        for policy in self._buffered:
+            policy.close()
+        # 关闭后不再接收事件，积压的事件随之丢弃
+        self._backlog.clear()
+        if self._drainer is not None:
+            self._drainer.cancel()
+
+
+async def _wait_all(blocked: list[Awaitable[None]]) -> None:
+    await asyncio.gather(*blocked)
+
+
+def _wake(fut: Future[None] | None) -> None:
+    if fut is not None and not fut.done():
+        fut.set_result(None)
+    return None
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol, cast
+
+if TYPE_CHECKING:
+    from .client import NapCatClient
+
+# lookup 未命中时的返回值 (None 可能是合法的响应 data)
+MISS: Any = object()
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ActionCache(Protocol):
+    """
+    挂在 NapCatClient.call_action 前的本地缓存。
+
+    actions 中的 action 先经 lookup 查询，命中即直接返回；未命中时照常发出请求，
+    成功的响应交给 store。observe 作为 EventHub 的 tap 接收原始事件，用于增量更新。
+    """
+
+    name: ClassVar[str]
+    actions: ClassVar[tuple[str, ...]]
+    stats: CacheStats
+
+    def bind(self, client: "NapCatClient") -> None: ...
+
+    def lookup(self, action: str, params: Mapping[str, Any]) -> Any: ...
+
+    def store(self, action: str, params: Mapping[str, Any], data: Any) -> None: ...
+
+    def observe(self, raw: dict[str, Any]) -> bool: ...
+
+    def close(self) -> None:
+        """客户端关闭时调用，取消后台任务"""
+        ...
+
+    def __len__(self) -> int: ...
+
+
+def copy_result(data: Any) -> Any:
+    """
+    同一份响应 data 交给多个调用方 (缓存命中、合并的请求) 时使用的副本：
+    dict 浅拷贝，列表连同其中的 dict 各拷贝一层，调用方修改顶层字段互不影响
+    """
+    if isinstance(data, dict):
+        return dict(cast(dict[str, Any], data))
+    if isinstance(data, list):
+        return [dict(cast(dict[str, Any], item)) if isinstance(item, dict) else item for item in cast(list[Any], data)]
+    return data
+
+
+def as_int(value: Any) -> int | None:
+    """参数中的 QQ 号 / 群号可能是 int 或数字字符串"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def as_flag(value: Any) -> bool:
+    """NapCat 的布尔参数也接受字符串 "true" / "false" """
+    if isinstance(value, str):
+        return value.lower() in ("true", "1", "yes")
+    return bool(value)
+
@@ -1,12 +1,41 @@
+import asyncio
+import copy
+import logging
+from asyncio import Future, Task
 from types import TracebackType
-from typing import Any
-from collections.abc import AsyncGenerator, Mapping
+from typing import Any, Literal, cast, overload
+from collections.abc import AsyncGenerator, Iterable, Mapping, Sequence
 
+import orjson
 from websockets.asyncio.client import connect as ws_connect
+from websockets.exceptions import ConnectionClosed
 
-from .connection import Connection
-from .types import NapCatEvent, MessageSegmentType, MessageText
-from .client_api import NapCatAPI
+from .backfill import Backfill
+from .broadcast import BackpressurePolicy, EventHub
+from .cache import MISS, ActionCache, copy_result
+from .connection import MAX_FRAME_SIZE, Connection
+from .filters import EventFilter
+from .jsonscan import iter_array
+from .friend_cache import FriendCache
+from .group_cache import GroupCache
+from .message_store import MessageStore
+from .member_cache import MemberCache
+from .metrics import ActionMetrics, ActionSnapshot
+from .outbox import Priority, action_priority
+from .pool import ConnectionPool
+from .prometheus import MetricsExporter
+from .reconnect import ReconnectPolicy, is_idempotent
+from .records import Fields, projector
+from .types import NapCatEvent, MessageEvent, MessageSegmentType, MessageText, ValidationMode, validation_mode
+from .client_api import READ_ONLY_ACTIONS, NapCatAPI
+
+logger = logging.getLogger("napcat.client")
+
+# 合并的只读调用中，发起请求的调用方被取消时交给等待方的结果
+_ABANDONED: Any = object()
+
+# 合并在途调用用的键 (action, 规范化的参数, 优先级, use_cache)，见 _flight_key
+type FlightKey = tuple[str, bytes, Priority | None, bool]
 
 
 class NapCatClient:
@@ -14,29 +43,127 @@ class NapCatClient:
         self,
         ws_url: str | None = None,
         token: str | None = None,
+        validation: ValidationMode | Literal["strict", "sampled", "off"] | None = None,
+        lazy_messages: bool = False,
+        reconnect: ReconnectPolicy | bool = False,
+        backfill: Backfill | bool = False,
+        action_connections: int = 0,
+        action_url: str | None = None,
+        metrics_port: int | None = None,
+        heartbeat_misses: int | None = 3,
+        offload_threshold: int | None = None,
+        member_cache: MemberCache | bool = False,
+        friend_cache: FriendCache | bool = False,
+        group_cache: GroupCache | bool = False,
+        message_store: MessageStore | bool = False,
+        coalesce: bool = True,
         _existing_conn: Connection | None = None,
     ):
+        """
+        :param validation: 该客户端解码事件时使用的字段类型校验模式，None 表示沿用全局模式
+        :param lazy_messages: 消息事件的 message 推迟到首次访问时才解码；格式错误的消息段届时才抛出 TypeError / ValueError，
+            而不是像普通解码那样得到 UnknownEvent
+        :param reconnect: 正向连接 (ws_url) 断开后自动重连，True 使用默认的 ReconnectPolicy。
+            重连期间 events() 迭代器保持存活，新发起的调用等待重连完成
+        :param backfill: 重连后通过历史消息接口补发断线期间的消息 (需开启 reconnect)，
+            True 使用默认的 Backfill 配置
+        :param action_connections: 额外为 action 打开的连接数 K，调用路由到在途请求最少的连接，
+            ws_url 上的主连接只负责接收事件；0 表示所有调用共用主连接
+        :param action_url: action 连接使用的地址，默认与 ws_url 相同
+        :param metrics_port: 在该端口开启 Prometheus 格式的 /metrics 端点
+        :param heartbeat_misses: 连续错过多少次心跳后判定连接失活并关闭 (开启 reconnect 时随后重连)，
+            None 表示不检测
+        :param offload_threshold: (实验性) 不小于该长度 (字符数) 的帧在线程池中解码，None (默认) 表示不启用；
+            开启后总耗时约为 3 倍，见 jsonscan.loads_chunked
+        :param member_cache: 群成员缓存，get_group_member_info 在本地应答并由事件增量维护；
+            True 使用默认配置
+        :param friend_cache: 好友列表缓存，提供 O(1) 的 is_friend 并由通知增量维护；True 使用默认配置
+        :param group_cache: 群资料缓存，get_group_info 等由群列表填充并在本地应答；True 使用默认配置
+        :param message_store: 最近消息的本地存储，get_msg (如解析回复的目标) 先在本地查找；True 使用默认配置
+        :param coalesce: 合并 action 与参数都相同的在途只读调用 (READ_ONLY_ACTIONS)，只发出一次请求，
+            各调用方得到同一个响应对象
+        """
         self.ws_url = ws_url
         self.token = token
+        self.validation = ValidationMode(validation) if isinstance(validation, str) else validation
+        self.lazy_messages = lazy_messages
         self._conn = _existing_conn
+        # 按 action 汇总的调用统计，本客户端的所有连接共享
+        self.metrics = ActionMetrics()
+        if self._conn:
+            self._conn.decoder = self._decode_event
+            self.metrics = self._conn.metrics
         self._ws_ctx: ws_connect | None = None
 
+        self.reconnect: ReconnectPolicy | None = (
+            ReconnectPolicy() if reconnect is True else reconnect or None
+        )
+        self.reconnects = 0
+        self.backfill: Backfill | None = Backfill() if backfill is True else backfill or None
+        if self.backfill and not self.reconnect:
+            raise ValueError("backfill requires reconnect")
+        self._backfill_task: Task[int] | None = None
+        # 重连模式下事件中心由客户端持有，跨越多个 Connection
+        self._hub: EventHub | None = None
+        self._supervisor: Task[None] | None = None
+        self._connected = asyncio.Event()
+        self._closing = False
+        self.action_connections = action_connections
+        self.action_url = action_url
+        self.heartbeat_misses = heartbeat_misses
+        self.offload_threshold = offload_threshold
+        self.coalesce = coalesce
+        # (action, 规范化参数) -> 在途只读调用的结果，由发起请求的调用方完成
+        self._flights: dict[FlightKey, Future[Any]] = {}
+        self.pool: ConnectionPool | None = None
+        self.exporter: MetricsExporter | None = None
+        if metrics_port is not None:
+            self.exporter = MetricsExporter(port=metrics_port)
+            self.exporter.register(self)
+
+        # 本地缓存：名称 -> 缓存，以及 action -> 负责应答它的缓存
+        self.caches: dict[str, ActionCache] = {}
+        self._action_caches: dict[str, ActionCache] = {}
+        # 缓存对象定义了 __len__，空缓存为假值，不能直接做真值判断
+        if member_cache is not False:
+            self.add_cache(MemberCache() if member_cache is True else member_cache)
+        if friend_cache is not False:
+            self.add_cache(FriendCache() if friend_cache is True else friend_cache)
+        if group_cache is not False:
+            self.add_cache(GroupCache() if group_cache is True else group_cache)
+        if message_store is not False:
+            self.add_cache(MessageStore() if message_store is True else message_store)
+
         self.api = NapCatAPI(self)
         self.self_id: int = -1
 
     async def __aenter__(self):
         # 如果是 Server 模式（_existing_conn 存在），直接启动该连接的循环
         if self._conn:
+            self._install_taps(self._conn.hub)
             await self._conn.__aenter__()
         # 如果是 Client 模式（主动连接），建立连接并包装
         elif self.ws_url:
-            headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
-            self._ws_ctx = ws_connect(self.ws_url, additional_headers=headers)
-            ws = await self._ws_ctx.__aenter__()
-            self._conn = Connection(ws)
-            await self._conn.__aenter__()
+            if self.reconnect:
+                self._hub = EventHub(capacity=500, decoder=self._decode_event)
+                if self.backfill:
+                    self._hub.taps.append(self.backfill.observe)
+            await self._connect()
+            if self.action_connections:
+                self.pool = ConnectionPool(
+                    self.action_url or self.ws_url,
+                    self.action_connections,
+                    self._headers(),
+                    self.metrics,
+                    self.offload_threshold,
+                )
+                await self.pool.__aenter__()
+            if self.reconnect:
+                self._supervisor = asyncio.create_task(self._supervise())
         else:
             raise ValueError("Invalid Client: No URL and no existing connection")
+        if self.exporter:
+            await self.exporter.start()
         # 2. 获取自身 ID (增加容错处理)
         try:
             resp = await self.api.get_login_info() 
@@ -54,45 +181,393 @@ class NapCatClient:
         exc_tb: TracebackType | None,
     ):
         # 级联关闭：Client -> Connection -> WebSocket
+        if self.exporter:
+            await self.exporter.close()
+        self._closing = True
+        self._connected.set()  # 唤醒等待重连的调用，由其抛出 ConnectionError
+        for cache in self.caches.values():
+            cache.close()
+        for task in (self._supervisor, self._backfill_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        if self.pool:
+            await self.pool.close()
         if self._conn:
             await self._conn.__aexit__(exc_type, exc_val, exc_tb)
         if self._ws_ctx:
             await self._ws_ctx.__aexit__(exc_type, exc_val, exc_tb)
+        if self._hub:
+            self._hub.close()
+
+    def add_cache(self, cache: ActionCache) -> None:
+        """注册本地缓存：其 actions 先在本地查询，其 observe 接收所有原始事件"""
+        cache.bind(self)
+        self.caches[cache.name] = cache
+        for action in cache.actions:
+            self._action_caches[action] = cache
+        for conn in self.connections[:1]:
+            self._install_taps(conn.hub)
+
+    def is_friend(self, user_id: int) -> bool | None:
+        """由好友缓存在本地回答 (需开启 friend_cache)；缓存尚未加载时返回 None (未知) 并在后台加载"""
+        cache = self.caches.get(FriendCache.name)
+        if not isinstance(cache, FriendCache):
+            raise RuntimeError("friend_cache is not enabled")
+        return cache.is_friend(user_id)
+
+    def _install_taps(self, hub: EventHub) -> None:
+        for cache in self.caches.values():
+            if cache.observe not in hub.taps:
+                hub.taps.append(cache.observe)
+
+    def _headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+    async def _connect(self) -> None:
+        ws_ctx = ws_connect(
+            cast(str, self.ws_url), additional_headers=self._headers(), max_size=MAX_FRAME_SIZE
+        )
+        ws = await ws_ctx.__aenter__()
+        self._ws_ctx = ws_ctx
+        self._conn = Connection(
+            ws,
+            hub=self._hub,
+            metrics=self.metrics,
+            heartbeat_misses=self.heartbeat_misses,
+            offload_threshold=self.offload_threshold,
+        )
+        self._conn.decoder = self._decode_event
+        self._install_taps(self._conn.hub)
+        await self._conn.__aenter__()
+        self._connected.set()
+
+    async def _supervise(self) -> None:
+        """等待当前连接断开，按 ReconnectPolicy 退避重连；重试耗尽后结束事件流"""
+        policy = cast(ReconnectPolicy, self.reconnect)
+        try:
+            while True:
+                await cast(Connection, self._conn).wait_closed()
+                self._connected.clear()
+                logger.warning("Connection lost, reconnecting")
+                if self._ws_ctx:
+                    try:
+                        await self._ws_ctx.__aexit__(None, None, None)
+                    except Exception:
+                        pass
+                    self._ws_ctx = None
+                for delay in policy.delays():
+                    await asyncio.sleep(delay)
+                    try:
+                        await self._connect()
+                        break
+                    except Exception as e:
+                        logger.warning(f"Reconnect failed: {e!r}")
+                else:
+                    logger.error("Reconnect attempts exhausted, giving up")
+                    return
+                self.reconnects += 1
+                logger.info(f"Reconnected (#{self.reconnects})")
+                if self.pool:
+                    await self.pool.refill()
+                if self.backfill and not (self._backfill_task and not self._backfill_task.done()):
+                    self._backfill_task = asyncio.create_task(
+                        self.backfill.run(self, cast(EventHub, self._hub))
+                    )
+        finally:
+            if not self._connected.is_set():
+                self._closing = True
+                self._connected.set()
+                if self._hub:
+                    self._hub.close()
+
+    async def events(
+        self,
+        policy: BackpressurePolicy | None = None,
+        filter: EventFilter | None = None,
+    ) -> AsyncGenerator[NapCatEvent, None]:
+        """
+        订阅事件。
 
-    async def events(self) -> AsyncGenerator[NapCatEvent, None]:
+        :param policy: 消费过慢时的背压策略 (DropOldest / DropNewest / Block / SpillToDisk)，
+            每次订阅需传入新的实例，可通过 policy.stats 查看积压与丢弃计数。默认 DropOldest。
+        :param filter: 声明式过滤器，在解码之前作用于原始事件，被拒绝的事件几乎零开销。
+        """
         if not self._conn:
             raise RuntimeError("Client not connected")
-        async for event in self._conn.events():
-            event = NapCatEvent.from_dict(event)
-            object.__setattr__(event, "_client", self)
+        async for event in self._conn.events(policy, filter):
             yield event
 
-    async def send(self, data: dict[str, Any], timeout: float = 10.0) -> dict[str, Any]:
+    def _decode_event(self, data: dict[str, Any]) -> NapCatEvent:
+        # 由 Connection 在分发前调用一次，所有订阅者共享同一个事件对象
+        if self.validation is None:
+            event = self._from_dict(data)
+        else:
+            with validation_mode(self.validation):
+                event = self._from_dict(data)
+        object.__setattr__(event, "_client", self)
+        return event
+
+    def _from_dict(self, data: dict[str, Any]) -> NapCatEvent:
+        if self.lazy_messages and data.get("post_type") in MessageEvent._post_type:
+            try:
+                return MessageEvent.from_dict(data, lazy=True)
+            except (ValueError, TypeError, KeyError):
+                pass  # 交给通用路径处理兜底
+        return NapCatEvent.from_dict(data)
+
+    async def send(
+        self,
+        data: dict[str, Any],
+        timeout: float = 10.0,
+        priority: Priority | None = None,
+    ) -> dict[str, Any]:
+        """
+        :param priority: 出站帧的优先级，None 时按 action 名称推断 (发消息优先，批量拉取靠后)
+        """
+        return cast(dict[str, Any], await self._send(data, timeout, priority, False))
+
+    async def _send(
+        self, data: dict[str, Any], timeout: float, priority: Priority | None, raw: bool
+    ) -> dict[str, Any] | str | bytes:
         if not self._conn:
             raise RuntimeError("Client not connected")
-        return await self._conn.send(data, timeout)
+        if priority is None:
+            priority = action_priority(str(data.get("action", "")))
+        if self.reconnect is None:
+            conn = self._action_conn()
+            if raw:
+                return await conn.send_raw(data, timeout, priority)
+            return await conn.send(data, timeout, priority)
+        return await self._send_reconnecting(data, timeout, priority, raw)
+
+    @property
+    def connections(self) -> list[Connection]:
+        """主连接 (接收事件) 在前，其后是连接池中的 action 连接"""
+        conns = [self._conn] if self._conn else []
+        if self.pool:
+            conns += self.pool.connections
+        return conns
+
+    def stats(self) -> dict[str, ActionSnapshot]:
+        """各 action 的调用次数、错误、超时、收发字节数与耗时分位数的快照"""
+        return self.metrics.snapshot()
+
+    def _action_conn(self) -> Connection:
+        """action 走连接池中最空闲的连接，没有可用的池连接时走主连接"""
+        if self.pool is not None and (conn := self.pool.pick()) is not None:
+            return conn
+        return cast(Connection, self._conn)
+
+    async def _send_reconnecting(
+        self, data: dict[str, Any], timeout: float, priority: Priority, raw: bool
+    ) -> dict[str, Any] | str | bytes:
+        # timeout 覆盖等待重连与重放的全部时间
+        replay = cast(ReconnectPolicy, self.reconnect).replay_idempotent and is_idempotent(
+            str(data.get("action", ""))
+        )
+        async with asyncio.timeout(timeout):
+            while True:
+                await self._connected.wait()
+                if self._closing:
+                    raise ConnectionError("Client closed")
+                conn = self._action_conn()
+                if conn.closed:
+                    # 主连接断线尚未被重连任务处理，等待新连接
+                    self._connected.clear()
+                    continue
+                try:
+                    if raw:
+                        return await conn.send_raw(data, timeout, priority)
+                    return await conn.send(data, timeout, priority)
+                except (ConnectionError, ConnectionClosed):
+                    # 请求可能已经送达，只有只读 action 可以安全重放
+                    if not replay:
+                        raise
+                    logger.debug(f"Replaying {data.get('action')} after reconnect")
+                    await conn.wait_closed()
 
     async def call_action(
         self,
         action: str,
         params: Mapping[str, Any] | None = None,
+        *,
+        priority: Priority | None = None,
+        use_cache: bool = True,
     ) -> Mapping[str, Any] | None:
         """
-        统一调用入口
+        统一调用入口。开启 coalesce 时，与在途调用 action、参数均相同的只读调用不再单独发出请求
+
+        :param priority: 出站优先级，None 时按 action 名称推断
+        :param use_cache: 为 False 时不从本地缓存应答，响应仍会写回缓存
         """
         if params is None:
             params = {}
-        resp = await self.send({"action": action, "params": params})
+        if (cache := self._action_caches.get(action)) is not None and use_cache:
+            if (hit := cache.lookup(action, params)) is not MISS:
+                return hit
+        if self.coalesce and action in READ_ONLY_ACTIONS and (
+            key := _flight_key(action, params, priority, use_cache)
+        ) is not None:
+            return await self._call_coalesced(key, params, priority, cache)
+        return await self._call_remote(action, params, priority, cache)
+
+    async def _call_coalesced(
+        self,
+        key: FlightKey,
+        params: Mapping[str, Any],
+        priority: Priority | None,
+        cache: ActionCache | None,
+    ) -> Mapping[str, Any] | None:
+        action = key[0]
+        while (flight := self._flights.get(key)) is not None:
+            # 只等待完成而不 await flight 本身：等待方被取消时不影响共享的结果
+            await asyncio.wait((flight,))
+            if (e := flight.exception()) is not None:
+                self.metrics[action].coalesced += 1
+                # 各等待方抛出各自的异常实例，避免多个调用栈的 traceback 叠加在同一个对象上
+                raise _fresh_exception(e) from e
+            if flight.result() is not _ABANDONED:
+                # 每个合并的调用方只计一次 (发起方被取消后重新等待的不重复计)
+                self.metrics[action].coalesced += 1
+                # 各等待方拿到各自的副本，修改返回值不影响发起方与其他等待方
+                return copy_result(flight.result())
+            # 发起请求的调用方被取消，请求作废，由等待方之一重新发起
+        # 第一个调用方直接发出请求 (不额外创建 Task)，完成后把结果交给等待方
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            data = await self._call_remote(action, params, priority, cache)
+        except asyncio.CancelledError:
+            del self._flights[key]
+            flight.set_result(_ABANDONED)
+            raise
+        except BaseException as e:
+            del self._flights[key]
+            flight.set_exception(e)
+            # 没有等待方时避免 "exception was never retrieved"
+            flight.exception()
+            raise
+        del self._flights[key]
+        flight.set_result(data)
+        return data
+
+    async def _call_remote(
+        self,
+        action: str,
+        params: Mapping[str, Any],
+        priority: Priority | None,
+        cache: ActionCache | None,
+    ) -> Mapping[str, Any] | None:
+        resp = await self.send({"action": action, "params": params}, priority=priority)
         if resp.get("status") != "ok" and resp.get("retcode") != 0:
             raise RuntimeError(f"API call failed: {resp}")
-        return resp.get("data", None)
+        data = resp.get("data", None)
+        if cache is not None:
+            cache.store(action, params, data)
+        return data
+
+    async def stream_action(
+        self,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        timeout: float = 10.0,
+        maxsize: int = 64,
+        priority: Priority = Priority.BULK,
+    ) -> AsyncGenerator[Mapping[str, Any], None]:
+        """
+        流式调用入口 (download_file_stream 等)，逐个产出每一帧的 data，最后一帧为完成信息
+
+        :param timeout: 相邻两帧之间的最长等待时间
+        :param maxsize: 未消费帧的缓冲上限
+        """
+        if not self._conn:
+            raise RuntimeError("Client not connected")
+        if params is None:
+            params = {}
+        async for resp in self._action_conn().stream(
+            {"action": action, "params": params}, timeout, maxsize, priority
+        ):
+            if resp.get("status") != "ok" and resp.get("retcode") != 0:
+                raise RuntimeError(f"API call failed: {resp}")
+            data = resp.get("data") or {}
+            if data.get("type") == "error":
+                raise RuntimeError(f"Stream failed: {resp}")
+            yield data
     
+    @overload
+    def iter_list[R: tuple[Any, ...]](
+        self,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        fields: type[R],
+        path: Sequence[str] = ("data",),
+        timeout: float = 30.0,
+        priority: Priority = Priority.BULK,
+    ) -> AsyncGenerator[R, None]: ...
+
+    @overload
+    def iter_list(
+        self,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        fields: Sequence[str] | None = None,
+        path: Sequence[str] = ("data",),
+        timeout: float = 30.0,
+        priority: Priority = Priority.BULK,
+    ) -> AsyncGenerator[Any, None]: ...
+
+    async def iter_list(
+        self,
+        action: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        fields: Fields | None = None,
+        path: Sequence[str] = ("data",),
+        timeout: float = 30.0,
+        priority: Priority = Priority.BULK,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        逐个产出列表类响应 (get_group_member_list、get_group_root_files 等) 中的元素，
+        不在内存中构建整个响应：原始帧按元素增量解析，每个元素投影后即丢弃原 dict。
+
+        async for m in client.iter_list("get_group_member_list", {"group_id": 1}, fields=("user_id", "role")):
+            print(m.user_id, m.role)
+
+        :param fields: 字段名序列 (产出 namedtuple，缺失字段为 None) 或 typing.NamedTuple 子类；
+            None 时产出原始 dict
+        :param path: 列表在响应中的位置，如 get_group_root_files 的 ("data", "files")
+        :param timeout: 等待响应的超时
+        """
+        if params is None:
+            params = {}
+        resp = await self._send({"action": action, "params": params}, timeout, priority, True)
+        if isinstance(resp, dict):
+            # 未能识别原始帧时 send_raw 退回解码后的响应
+            envelope = resp
+            items: Iterable[Any] = _lookup(resp, path)
+        else:
+            envelope = {}
+            items = iter_array(resp, path, envelope)
+        del resp
+        project = projector(fields) if fields is not None else None
+        for n, item in enumerate(items, 1):
+            yield project(item) if project else item
+            if n % 256 == 0:
+                # 解析在事件循环上进行，定期让出
+                await asyncio.sleep(0)
+        if envelope.get("status") != "ok" and envelope.get("retcode") != 0:
+            self.metrics[action].errors += 1
+            raise RuntimeError(f"API call failed: {envelope}")
+
     async def send_private_msg(self, user_id: int, message: str | list[MessageSegmentType]) -> int:
         """
         发送私聊消息，返回消息 ID
         """
         if isinstance(message, str):
-            message = [MessageText(text=message)]
+            message = [MessageText.unchecked(text=message)]
         resp = await self.api.send_private_msg(
             user_id=user_id,
             message=message
@@ -104,7 +579,7 @@ class NapCatClient:
         发送群消息，返回消息 ID
         """
         if isinstance(message, str):
-            message = [MessageText(text=message)]
+            message = [MessageText.unchecked(text=message)]
         resp = await self.api.send_group_msg(
             group_id=group_id,
             message=message
@@ -122,3 +597,36 @@ class NapCatClient:
             return await self.call_action(item, kwargs)
 
         return dynamic_api_call
+
+
+def _flight_key(
+    action: str, params: Mapping[str, Any], priority: Priority | None, use_cache: bool
+) -> FlightKey | None:
+    """
+    合并在途调用用的键：键排序后的参数 (*_id 的数字字符串统一为 int) 加上优先级与 use_cache，
+    调用选项不同的调用不合并；无法序列化时返回 None
+    """
+    canonical = {
+        k: int(v) if isinstance(v, str) and k.endswith("_id") and v.isdigit() else v for k, v in params.items()
+    }
+    try:
+        return action, orjson.dumps(canonical, option=orjson.OPT_SORT_KEYS), priority, use_cache
+    except TypeError:
+        return None
+
+
+def _fresh_exception(e: BaseException) -> BaseException:
+    """同类型的新异常实例 (不带 traceback)；无法复制时退回 RuntimeError"""
+    try:
+        fresh = copy.copy(e)
+    except Exception:
+        return RuntimeError(f"Coalesced call failed: {e!r}")
+    fresh.__traceback__ = None
+    return fresh
+
+
+def _lookup(resp: Mapping[str, Any], path: Sequence[str]) -> list[Any]:
+    node: Any = resp
+    for key in path:
+        node = node.get(key) if isinstance(node, Mapping) else None
+    return cast(list[Any], node) if isinstance(node, list) else []
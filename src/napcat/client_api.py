@@ -292,6 +292,71 @@ from .types.schemas import (
    CancelOnlineFilePostRequest,
    CancelOnlineFilePostResponse,
 )
+
+# 只读 action (无副作用)：参数相同的在途调用会被合并，断线时在途的调用可在新连接上重放
+READ_ONLY_ACTIONS: frozenset[str] = frozenset({
+    "get_group_album_media_list",
+    "get_qun_album_list",
+    "get_doubt_friends_add_request",
+    "get_private_file_url",
+    "get_unidirectional_friend_list",
+    "get_msg",
+    "get_forward_msg",
+    "get_login_info",
+    "get_stranger_info",
+    "get_friend_list",
+    "get_group_info",
+    "get_group_list",
+    "get_group_member_info",
+    "get_group_member_list",
+    "get_group_honor_info",
+    "get_record",
+    "get_image",
+    "can_send_image",
+    "can_send_record",
+    "get_status",
+    "get_version_info",
+    "_get_model_show",
+    "get_online_clients",
+    "get_group_msg_history",
+    "ocr_image",
+    ".ocr_image",
+    "get_group_system_msg",
+    "get_essence_msg_list",
+    "get_group_at_all_remain",
+    "_get_group_notice",
+    "get_group_file_system_info",
+    "get_group_root_files",
+    "get_group_files_by_folder",
+    "get_group_file_url",
+    "check_url_safely",
+    "get_robot_uin_range",
+    "get_friends_with_category",
+    "get_file",
+    "translate_en2zh",
+    "get_friend_msg_history",
+    "get_collection_list",
+    "get_recent_contact",
+    "get_profile_like",
+    "fetch_custom_face",
+    "fetch_emoji_like",
+    "get_group_info_ex",
+    "get_group_detail_info",
+    "get_group_ignore_add_request",
+    "nc_get_packet_status",
+    "nc_get_user_status",
+    "get_group_shut_list",
+    "get_guild_list",
+    "get_guild_service_profile",
+    "get_group_ignored_notifies",
+    "get_ai_characters",
+    "get_fileset_info",
+    "get_flash_file_list",
+    "get_flash_file_url",
+    "get_fileset_id",
+    "get_online_file_msg",
+})
+
 # 定义一个 Protocol，避免循环导入 Client 类，同时保证类型提示
 class CallActionProtocol(Protocol):
     async def call_action(self, action: str, params: Mapping[str, Any] | None = None) -> Any: ...
@@ -1,30 +1,133 @@
 import asyncio
 import itertools
 import logging
-from asyncio import Future, Queue, Task
+import time
+from asyncio import Future, PriorityQueue, Queue, Task
+from collections import deque
 from types import TracebackType
 from typing import Any, cast
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 
 import orjson
 from websockets.asyncio.client import ClientConnection
 from websockets.asyncio.server import ServerConnection
 
+from .broadcast import BackpressurePolicy, EventHub, RawFilter
+from .jsonscan import loads_chunked
+from .metrics import ActionMetrics, ActionStats
+from .outbox import Priority, WriteStats
+
 logger = logging.getLogger("napcat.connection")
 _STOP = object()
+_OVERFLOW = object()
+
+# 单帧大小上限。websockets 默认只接受 1 MiB，数千人的群成员列表、历史消息等响应会超出而被断开
+MAX_FRAME_SIZE = 64 << 20
+
+# (priority, 入队序号, payload, echo, 入队时间)；序号保证同优先级先进先出
+type _Outbound = tuple[int, int, bytes, str, float]
+
+
+def _is_stream_chunk(frame: dict[str, Any]) -> bool:
+    """流式 action 的中间帧：data.type == "stream"，其余（response/error）均视为结束帧"""
+    payload = frame.get("data")
+    return isinstance(payload, dict) and cast(dict[str, Any], payload).get("type") == "stream"
+
+
+def _force_put(q: Queue[dict[str, Any] | object], item: object) -> None:
+    """清空队列后写入哨兵，保证消费者一定能收到"""
+    while not q.empty():
+        q.get_nowait()
+    q.put_nowait(item)
 
 
 class Connection:
-    def __init__(self, ws: ClientConnection | ServerConnection):
+    def __init__(
+        self,
+        ws: ClientConnection | ServerConnection,
+        hub: EventHub | None = None,
+        max_outbound: int = 1000,
+        metrics: ActionMetrics | None = None,
+        heartbeat_misses: int | None = 3,
+        offload_threshold: int | None = None,
+        handle_events: bool = True,
+    ):
+        """
+        :param hub: 外部持有的事件中心。传入时连接关闭不会结束其订阅者，
+            可在重连后交给新的 Connection 继续使用
+        :param max_outbound: 待写出帧的队列上限，队列满时 send() 等待 (计入其 timeout)；
+            空出的位置按优先级分配，Priority.INTERACTIVE 的帧不受此限制，不会排在批量调用之后
+        :param metrics: 按 action 汇总的调用统计，多个连接可共享同一份
+        :param heartbeat_misses: 按心跳事件声明的 interval 计，连续错过这么多次心跳即判定连接失活：
+            立即以 ConnectionError 结束所有等待中的调用并关闭连接 (触发重连或被服务端移除)。
+            None 表示不检测；收到第一个心跳之前也不检测
+        :param offload_threshold: (实验性) 不小于该长度 (字符数) 的帧 (大群成员列表、历史消息等) 在线程池中解码，
+            避免单帧长时间阻塞事件循环；帧仍按到达顺序逐个处理。None (默认) 表示全部在事件循环上解码。
+            开启后总耗时约为 3 倍，只适合最长停顿比吞吐量更重要的场景，见 jsonscan.loads_chunked
+        :param handle_events: 为 False 时只收发 action (如连接池中的连接)：不含 "echo" 键的帧不解码直接丢弃，
+            也不处理心跳，heartbeat_misses 不起作用
+        """
         self.ws = ws
-        self._futures: dict[str, Future[dict[str, Any]]] = {}
-        self._queues: set[Queue[dict[str, Any] | object]] = set()
+        # echo -> (响应 future, 该 action 的统计)
+        self._futures: dict[str, tuple[Future[dict[str, Any] | str | bytes], ActionStats]] = {}
+        # send_raw 等待中的 echo -> 用于在原始帧中识别它的子串 (str, bytes)
+        self._raw_echoes: dict[str, tuple[str, bytes]] = {}
+        self._owns_hub = hub is None
+        self._hub = hub if hub is not None else EventHub(capacity=500)
+        self._streams: dict[str, Queue[dict[str, Any] | object]] = {}
         self._task: Task[None] | None = None
         self._counter = itertools.count()
         self._closed = asyncio.Event()
+        # 所有出站帧经由单一写出任务按优先级写入 socket
+        # 队列本身不设上限，max_outbound 由 _enqueue 按优先级执行
+        self._outbox: PriorityQueue[_Outbound] = PriorityQueue()
+        self.max_outbound = max_outbound
+        # 因队列满而等待的调用方，按优先级分开排队
+        self._space_waiters: dict[Priority, deque[Future[None]]] = {p: deque() for p in Priority}
+        self._writer: Task[None] | None = None
+        self._outbox_seq = itertools.count()
+        self.write_stats = WriteStats()
+        self.metrics = metrics if metrics is not None else ActionMetrics()
+        # 最近一次心跳事件的到达时间 (time.monotonic)
+        self.last_heartbeat: float | None = None
+        self.heartbeat_misses = heartbeat_misses
+        self.offload_threshold = offload_threshold
+        self.handle_events = handle_events
+        # 心跳超时后为 False；bot_good 为最近一次心跳中 NapCat 自报的 status.good
+        self.healthy = True
+        self.bot_good: bool | None = None
+        self._watchdog: asyncio.TimerHandle | None = None
+        self._close_reason = "Conn closed"
+        self._evictor: Task[None] | None = None
+
+    @property
+    def decoder(self) -> Callable[[dict[str, Any]], Any] | None:
+        """事件解码器：每帧最多解码一次（首个订阅者读取时），结果由所有订阅者共享"""
+        return self._hub.decoder
+
+    @decoder.setter
+    def decoder(self, value: Callable[[dict[str, Any]], Any] | None) -> None:
+        self._hub.decoder = value
+
+    @property
+    def hub(self) -> EventHub:
+        return self._hub
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    @property
+    def in_flight(self) -> int:
+        """已发送、尚未收到响应的请求数 (含流式请求)"""
+        return len(self._futures) + len(self._streams)
+
+    async def wait_closed(self) -> None:
+        await self._closed.wait()
 
     async def __aenter__(self):
         self._task = asyncio.create_task(self._loop())
+        self._writer = asyncio.create_task(self._write_loop())
         return self
 
     async def __aexit__(
@@ -44,76 +147,292 @@ class Connection:
             pass
         await self._closed.wait()
 
-    async def send(self, data: dict[str, Any], timeout: float = 10.0) -> dict[str, Any]:
+    async def send(
+        self,
+        data: dict[str, Any],
+        timeout: float = 10.0,
+        priority: Priority = Priority.NORMAL,
+    ) -> dict[str, Any]:
+        return cast(dict[str, Any], await self._request(data, timeout, priority, False))
+
+    async def send_raw(
+        self,
+        data: dict[str, Any],
+        timeout: float = 10.0,
+        priority: Priority = Priority.BULK,
+    ) -> dict[str, Any] | str | bytes:
+        """
+        与 send 相同，但响应以未解码的原始帧返回，交给调用方增量解析 (见 jsonscan.iter_array)。
+        原始帧按 '"echo":"<echo>"' 识别；对端输出不是紧凑 JSON 而未能识别时，返回解码后的 dict
+        """
+        return await self._request(data, timeout, priority, True)
+
+    async def _request(
+        self, data: dict[str, Any], timeout: float, priority: Priority, raw: bool
+    ) -> dict[str, Any] | str | bytes:
         if not self._task or self._task.done():
             raise ConnectionError("Connection closed")
         echo = f"seq-{next(self._counter)}"
         data = data | {"echo": echo}
-        fut: Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
-        self._futures[echo] = fut
+        fut: Future[dict[str, Any] | str | bytes] = asyncio.get_running_loop().create_future()
+        # 统计只做计数器累加与一次直方图记录，响应字节数由读循环直接累加
+        stats = self.metrics[data.get("action", "")]
+        self._futures[echo] = (fut, stats)
+        if raw:
+            needle = f'"echo":"{echo}"'
+            self._raw_echoes[echo] = (needle, needle.encode())
+        stats.calls += 1
+        start = time.perf_counter_ns()
         try:
-            await self.ws.send(orjson.dumps(data))
+            payload = orjson.dumps(data)
+            stats.request_bytes += len(payload)
             async with asyncio.timeout(timeout):
-                return await fut
+                await self._enqueue(payload, echo, priority)
+                resp = await fut
+        except TimeoutError:
+            stats.timeouts += 1
+            raise
+        except BaseException as e:
+            stats.unanswered += 1
+            if isinstance(e, Exception):
+                stats.errors += 1
+            raise
         finally:
             self._futures.pop(echo, None)
+            if raw:
+                self._raw_echoes.pop(echo, None)
+        stats.latency.record(time.perf_counter_ns() - start)
+        # 原始帧的状态由调用方解析后自行判断
+        if isinstance(resp, dict) and resp.get("status") != "ok" and resp.get("retcode") != 0:
+            stats.errors += 1
+        return resp
+
+    async def stream(
+        self,
+        data: dict[str, Any],
+        timeout: float = 10.0,
+        maxsize: int = 64,
+        priority: Priority = Priority.BULK,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        发送流式 action，逐帧产出同一 echo 的所有响应帧，直到结束帧为止。
 
-    async def events(self) -> AsyncGenerator[dict[str, Any], None]:
-        q: Queue[dict[str, Any] | object] = Queue(maxsize=500)
-        self._queues.add(q)
+        :param timeout: 相邻两帧之间的最长等待时间
+        :param maxsize: 未消费帧的缓冲上限，消费过慢导致溢出时抛出 BufferError
+        """
+        if not self._task or self._task.done():
+            raise ConnectionError("Connection closed")
+        echo = f"seq-{next(self._counter)}"
+        data = data | {"echo": echo}
+        q: Queue[dict[str, Any] | object] = Queue(maxsize=maxsize)
+        self._streams[echo] = q
         try:
+            async with asyncio.timeout(timeout):
+                await self._enqueue(orjson.dumps(data), echo, priority)
             while True:
-                data = await q.get()
-                if data is _STOP:
+                async with asyncio.timeout(timeout):
+                    frame = await q.get()
+                if frame is _STOP:
+                    raise ConnectionError(self._close_reason)
+                if frame is _OVERFLOW:
+                    raise BufferError(f"Stream buffer overflow (maxsize={maxsize})")
+                frame = cast(dict[str, Any], frame)
+                yield frame
+                if not _is_stream_chunk(frame):
                     break
-                if isinstance(data, dict):
-                    yield data
         finally:
-            self._queues.discard(q)
+            self._streams.pop(echo, None)
+
+    async def events(
+        self,
+        policy: BackpressurePolicy | None = None,
+        filter: RawFilter | None = None,
+    ) -> AsyncGenerator[Any, None]:
+        """
+        订阅事件流。policy 决定消费过慢时的行为，默认为 DropOldest：
+        所有订阅者共享同一个环形缓冲，落后超过容量时跳过最旧的事件。
+        filter 在解码前作用于原始 dict，被拒绝的事件不会被解码。
+        """
+        async for item in self._hub.subscribe(policy, filter):
+            yield item
+
+    @property
+    def outbound_depth(self) -> int:
+        return self._outbox.qsize()
+
+    async def _enqueue(self, payload: bytes, echo: str, priority: Priority) -> None:
+        # 队列满时在此等待，把背压传递给调用方
+        woken = False
+        while priority != Priority.INTERACTIVE and self._outbox.qsize() >= self.max_outbound:
+            waiter: Future[None] = asyncio.get_running_loop().create_future()
+            # 被唤醒后位置又被抢占时回到队首，同优先级仍按先来后到
+            waiters = self._space_waiters[priority]
+            if woken:
+                waiters.appendleft(waiter)
+            else:
+                waiters.append(waiter)
+            try:
+                await waiter
+                woken = True
+            except asyncio.CancelledError:
+                # 已被唤醒却不再入队，把空位让给下一个等待者
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_one()
+                raise
+        self._outbox.put_nowait(
+            (priority, next(self._outbox_seq), payload, echo, time.perf_counter())
+        )
+        if (depth := self._outbox.qsize()) > self.write_stats.depth_high_water:
+            self.write_stats.depth_high_water = depth
+
+    async def _write_loop(self) -> None:
+        stats = self.write_stats
+        outbox = self._outbox
+        while True:
+            _, _, payload, echo, queued_at = await outbox.get()
+            self._wake_one()
+            if echo not in self._futures and echo not in self._streams:
+                # 调用方已超时或取消，不再写出
+                stats.abandoned += 1
+                continue
+            started = time.perf_counter()
+            try:
+                await self.ws.send(payload)
+            except Exception as e:
+                self._fail(echo, e)
+                continue
+            stats.record(len(payload), started - queued_at, time.perf_counter() - started)
+
+    def _wake_one(self) -> None:
+        """队列空出一个位置：唤醒优先级最高的等待者中最早开始等待的一个"""
+        for waiters in self._space_waiters.values():
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+
+    def _fail(self, echo: str, exc: Exception) -> None:
+        if (entry := self._futures.get(echo)) is not None and not (fut := entry[0]).done():
+            fut.set_exception(ConnectionError(f"Send failed: {exc!r}"))
+        if (q := self._streams.pop(echo, None)) is not None:
+            _force_put(q, _STOP)
 
     async def _loop(self) -> None:
         try:
             async for msg in self.ws:
+                if self._raw_echoes and (echo := self._match_raw(msg)) is not None:
+                    # send_raw 的响应不在此解码，整帧交给调用方
+                    if (entry := self._futures.get(echo)) and not (fut := entry[0]).done():
+                        entry[1].response_bytes += len(msg)
+                        fut.set_result(msg)
+                    continue
+                if not self.handle_events and not (
+                    b'"echo"' in msg if isinstance(msg, bytes) else '"echo"' in msg
+                ):
+                    # 事件帧不解码，也就不会为它占用解码线程
+                    continue
                 try:
-                    data = orjson.loads(msg)
+                    if self.offload_threshold is not None and len(msg) >= self.offload_threshold:
+                        # 在此处等待解码完成再读下一帧，事件顺序不变
+                        data = await asyncio.to_thread(loads_chunked, msg)
+                    else:
+                        data = orjson.loads(msg)
                     if not isinstance(data, dict) or not data:
                         logger.warning(f"Invalid message: {data}")
                         continue
                     data = cast(dict[str, Any], data)
-                except orjson.JSONDecodeError:
+                except ValueError:  # orjson.JSONDecodeError 及 loads_chunked 的解析错误
                     continue
                 if echo := data.get("echo"):
-                    if fut := self._futures.get(echo):
+                    if (q := self._streams.get(echo)) is not None:
+                        self._feed_stream(echo, q, data)
+                        continue
+                    if entry := self._futures.get(echo):
+                        fut, stats = entry
                         if not fut.done():
+                            stats.response_bytes += len(msg)
                             fut.set_result(data)
                             continue
                     logger.warning(f"Unknown echo: {echo}")
                     continue
-                else:
-                    self._broadcast(data)
+                elif self.handle_events:
+                    post_type = data.get("post_type")
+                    if not isinstance(post_type, str):
+                        post_type = "unknown"
+                    self._hub.event_counts[post_type] += 1
+                    if post_type == "meta_event" and data.get("meta_event_type") == "heartbeat":
+                        self._on_heartbeat(data)
+                    if self._hub.subscribers or self._hub.taps:
+                        # 不在此等待阻塞的订阅者：读循环还要继续路由 action 响应与心跳
+                        self._hub.dispatch(data)
         except (asyncio.CancelledError, Exception):
             pass
         finally:
             await self._cleanup()
 
+    def _match_raw(self, msg: str | bytes) -> str | None:
+        if isinstance(msg, str):
+            for echo, (needle, _) in self._raw_echoes.items():
+                if needle in msg:
+                    return echo
+        else:
+            for echo, (_, needle_bytes) in self._raw_echoes.items():
+                if needle_bytes in msg:
+                    return echo
+        return None
+
+    def _on_heartbeat(self, data: dict[str, Any]) -> None:
+        self.last_heartbeat = time.monotonic()
+        if isinstance(status := data.get("status"), dict):
+            self.bot_good = bool(cast(dict[str, Any], status).get("good", True))
+        interval = data.get("interval")
+        if not self.heartbeat_misses or not isinstance(interval, int) or interval <= 0:
+            return
+        # 每次心跳把截止时间顺延 interval * misses
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+        self._watchdog = asyncio.get_running_loop().call_later(
+            interval / 1000 * self.heartbeat_misses, self._heartbeat_lost
+        )
+
+    def _heartbeat_lost(self) -> None:
+        self._watchdog = None
+        if self._task is None or self._task.done():
+            return
+        logger.warning(f"Missed {self.heartbeat_misses} heartbeats, closing connection")
+        self.healthy = False
+        self._close_reason = "Heartbeat lost"
+        # 半开的 TCP 连接上读循环可能永远等不到数据：close() 先取消读循环，
+        # 由 _cleanup 让等待中的调用立即失败，再关闭 socket
+        self._evictor = asyncio.create_task(self.close())
+
     async def _cleanup(self):
-        for f in self._futures.values():
+        if self._watchdog is not None:
+            self._watchdog.cancel()
+            self._watchdog = None
+        if self._writer and not self._writer.done():
+            self._writer.cancel()
+        for f, _ in self._futures.values():
             if not f.done():
-                f.set_exception(ConnectionError("Conn closed"))
+                f.set_exception(ConnectionError(self._close_reason))
         self._futures.clear()
-        self._broadcast(_STOP)
-        self._queues.clear()
+        for q in self._streams.values():
+            _force_put(q, _STOP)
+        self._streams.clear()
+        if self._owns_hub:
+            self._hub.close()
         self._closed.set()
 
-    def _broadcast(self, item: dict[str, Any] | object):
-        for q in list(self._queues):
-            if q.full():
-                try:
-                    q.get_nowait()
-                    logger.debug("Warning: Event queue dropped oldest message")
-                except asyncio.QueueEmpty:
-                    pass
-            try:
-                q.put_nowait(item)
-            except Exception:
-                pass
+    def _feed_stream(
+        self, echo: str, q: Queue[dict[str, Any] | object], frame: dict[str, Any]
+    ) -> None:
+        if q.full():
+            # 消费者跟不上：终止该流而不是无限堆积内存
+            logger.warning(f"Stream {echo} overflowed, aborting")
+            self._streams.pop(echo, None)
+            _force_put(q, _OVERFLOW)
+            return
+        q.put_nowait(frame)
+        if not _is_stream_chunk(frame):
+            self._streams.pop(echo, None)
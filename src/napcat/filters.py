@@ -0,0 +1,64 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+type FilterValue[T] = T | Iterable[T] | None
+
+# 参与过滤的字段，全部是原始事件 dict 的顶层键
+_FILTER_KEYS = ("post_type", "message_type", "notice_type", "group_id", "user_id", "self_id")
+
+
+def _normalize(value: Any) -> frozenset[Any] | None:
+    if value is None:
+        return None
+    values: Iterable[Any] = (value,) if isinstance(value, (str, int)) else value
+    out: set[Any] = set()
+    for v in values:
+        out.add(v)
+        # NapCat 的 id 字段可能是 int 也可能是数字字符串，两种形式都接受
+        if isinstance(v, int) and not isinstance(v, bool):
+            out.add(str(v))
+        elif isinstance(v, str) and v.isdigit():
+            out.add(int(v))
+    return frozenset(out)
+
+
+@dataclass(slots=True, frozen=True)
+class EventFilter:
+    """
+    声明式事件过滤器，直接作用于原始事件 dict，在解码为 NapCatEvent 之前执行，
+    被拒绝的事件不会产生任何解码开销。
+
+    每个字段可以是单个值或值的集合，None 表示不限制；各字段之间为"与"关系。
+
+    EventFilter(post_type="message", message_type="group", group_id={1001, 1002})
+    """
+
+    post_type: FilterValue[str] = None
+    message_type: FilterValue[str] = None
+    notice_type: FilterValue[str] = None
+    group_id: FilterValue[int | str] = None
+    user_id: FilterValue[int | str] = None
+    self_id: FilterValue[int | str] = None
+
+    _checks: tuple[tuple[str, frozenset[Any]], ...] = field(
+        init=False, repr=False, compare=False, default=()
+    )
+
+    def __post_init__(self) -> None:
+        checks: list[tuple[str, frozenset[Any]]] = []
+        for key in _FILTER_KEYS:
+            allowed = _normalize(getattr(self, key))
+            if allowed is not None:
+                checks.append((key, allowed))
+        object.__setattr__(self, "_checks", tuple(checks))
+
+    def __call__(self, raw: dict[str, Any]) -> bool:
+        try:
+            for key, allowed in self._checks:
+                if raw.get(key) not in allowed:
+                    return False
+        except TypeError:
+            # 不可哈希的值（非法帧）一律拒绝
+            return False
+        return True
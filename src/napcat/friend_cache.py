@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import time
+from asyncio import Task
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, ClassVar, cast
+
+from .cache import MISS, CacheStats, as_flag, as_int, copy_result
+
+if TYPE_CHECKING:
+    from .client import NapCatClient
+
+logger = logging.getLogger("napcat.friend_cache")
+
+
+class FriendCache:
+    """
+    好友列表缓存：首次使用时在后台加载 get_friend_list，之后由事件与本客户端的调用维护。
+
+    - friend_add 通知、同意好友请求 (set_friend_add_request)、来自好友的私聊: 加入好友
+    - delete_friend 成功: 移除好友
+
+    增量加入的好友只有 user_id 等少量字段，此时列表被标记为待刷新：
+    get_friend_list / get_friends_with_category 改走网络，并安排一次带 no_cache 的后台刷新。
+    NapCat 自身的缓存可能还不含这些变更，因此不带 no_cache 的 get_friend_list 结果写回时
+    会保留尚未出现的新好友、剔除已删除的好友，直到一次 no_cache 的结果确认为止。
+    所有刷新都经由同一个后台任务，相邻两次至少间隔 min_refresh_interval 秒，
+    无论多少事件或查询触发，都不会产生成串的重复拉取。
+
+    :param refresh_interval: 列表超过该时长 (秒) 后在下次使用时于后台刷新，期间仍使用旧数据
+    :param min_refresh_interval: 两次刷新之间的最小间隔 (秒)
+    :param max_pending_requests: 记录 好友请求 flag -> user_id 的数量上限
+    """
+
+    name: ClassVar[str] = "friend"
+    actions: ClassVar[tuple[str, ...]] = ("get_friend_list", "get_friends_with_category", "set_friend_add_request", "delete_friend")
+
+    def __init__(
+        self,
+        *,
+        refresh_interval: float = 1800.0,
+        min_refresh_interval: float = 60.0,
+        max_pending_requests: int = 1000,
+    ):
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self.max_pending_requests = max_pending_requests
+        self.stats = CacheStats()
+        self.refreshes = 0
+        # user_id -> get_friend_list 中的条目
+        self._friends: dict[int, dict[str, Any]] = {}
+        self._categories: list[Any] | None = None
+        self._loaded_at: float | None = None
+        # 有增量变更而缺少完整资料，列表类查询暂不从本地应答
+        self._dirty = False
+        # 尚未经 no_cache 的结果确认的增量变更：user_id -> 加入的条目，删除时为 None
+        self._pending: dict[int, dict[str, Any] | None] = {}
+        self._requests: OrderedDict[str, int] = OrderedDict()
+        self._refresh_task: Task[None] | None = None
+        self._last_refresh = float("-inf")
+        self._client: "NapCatClient | None" = None
+
+    def __len__(self) -> int:
+        return len(self._friends)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def bind(self, client: "NapCatClient") -> None:
+        self._client = client
+
+    def is_friend(self, user_id: int) -> bool | None:
+        """O(1) 本地查询；尚未加载时返回 None (未知) 并在后台开始加载"""
+        if self._loaded_at is None:
+            self.stats.misses += 1
+            self.schedule_refresh()
+            return None
+        self.stats.hits += 1
+        self._refresh_if_stale()
+        return user_id in self._friends
+
+    def friend(self, user_id: int) -> dict[str, Any] | None:
+        friend = self._friends.get(user_id)
+        return None if friend is None else dict(friend)
+
+    async def load(self) -> None:
+        """立即拉取好友列表 (不受 min_refresh_interval 限制)"""
+        if self._client is None:
+            raise RuntimeError("FriendCache is not bound to a client")
+        self._last_refresh = time.monotonic()
+        await self._client.call_action("get_friend_list", use_cache=False)
+
+    def schedule_refresh(self) -> None:
+        """安排一次后台刷新；已有刷新在进行或等待时不重复安排"""
+        if self._client is None or (self._refresh_task is not None and not self._refresh_task.done()):
+            return
+        delay = max(0.0, self._last_refresh + self.min_refresh_interval - time.monotonic())
+        self._refresh_task = asyncio.create_task(self._refresh(delay))
+
+    def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+    # --- ActionCache ---
+
+    def lookup(self, action: str, params: Mapping[str, Any]) -> Any:
+        if action not in ("get_friend_list", "get_friends_with_category"):
+            return MISS
+        if self._dirty or as_flag(params.get("no_cache")):
+            self.stats.misses += 1
+            return MISS
+        if action == "get_friend_list" and self._loaded_at is not None:
+            result: Any = [dict(f) for f in self._friends.values()]
+        elif action == "get_friends_with_category" and self._categories is not None:
+            result = copy_result(self._categories)
+        else:
+            self.stats.misses += 1
+            return MISS
+        self.stats.hits += 1
+        self._refresh_if_stale()
+        return result
+
+    def store(self, action: str, params: Mapping[str, Any], data: Any) -> None:
+        match action:
+            case "get_friend_list" if isinstance(data, list):
+                friends = cast(list[Any], data)
+                self._friends = {
+                    uid: dict(f)
+                    for f in friends
+                    if isinstance(f, dict) and (uid := as_int(cast(dict[str, Any], f).get("user_id")))
+                }
+                self._loaded_at = time.monotonic()
+                if as_flag(params.get("no_cache")):
+                    self._pending.clear()
+                else:
+                    self._apply_pending()
+                self._dirty = any(entry is not None for entry in self._pending.values())
+            case "get_friends_with_category" if isinstance(data, list):
+                self._categories = copy_result(data)
+            case "set_friend_add_request":
+                user_id = self._requests.pop(str(params.get("flag")), None)
+                if user_id is not None and as_flag(params.get("approve", True)):
+                    self._add(user_id, {"user_id": user_id, "remark": params.get("remark", "")})
+            case "delete_friend":
+                user_id = as_int(params.get("user_id", params.get("friend_id")))
+                if user_id is not None:
+                    self._pending[user_id] = None
+                    if self._friends.pop(user_id, None) is not None:
+                        # 分组列表中的成员数等随之变化，下次从网络获取
+                        self._categories = None
+            case _:
+                pass
+
+    def observe(self, raw: dict[str, Any]) -> bool:
+        post_type = raw.get("post_type")
+        if post_type == "request":
+            if raw.get("request_type") == "friend" and (flag := raw.get("flag")) is not None:
+                user_id = as_int(raw.get("user_id"))
+                if user_id is not None:
+                    self._requests[str(flag)] = user_id
+                    if len(self._requests) > self.max_pending_requests:
+                        self._requests.popitem(last=False)
+        elif post_type == "notice":
+            if raw.get("notice_type") == "friend_add" and (user_id := as_int(raw.get("user_id"))):
+                self._add(user_id, {"user_id": user_id})
+        elif post_type == "message":
+            # 来自好友的私聊说明对方一定是好友，借机补上缺失的条目
+            if raw.get("message_type") == "private" and raw.get("sub_type") == "friend":
+                user_id = as_int(raw.get("user_id"))
+                if user_id is not None and self._loaded_at is not None and user_id not in self._friends:
+                    sender = raw.get("sender")
+                    nickname = cast(dict[str, Any], sender).get("nickname", "") if isinstance(sender, dict) else ""
+                    self._add(user_id, {"user_id": user_id, "nickname": nickname})
+        return True
+
+    # --- 内部 ---
+
+    def _add(self, user_id: int, entry: dict[str, Any]) -> None:
+        if user_id in self._friends:
+            return
+        self._friends[user_id] = entry
+        self._pending[user_id] = entry
+        self._categories = None
+        self._dirty = True
+        self.schedule_refresh()
+
+    def _apply_pending(self) -> None:
+        """把尚未确认的增量变更叠加到刚写回的 (可能来自 NapCat 缓存的) 列表上"""
+        for user_id, entry in list(self._pending.items()):
+            if entry is None:
+                self._friends.pop(user_id, None)
+            elif user_id in self._friends:
+                # 列表中已有完整条目，这项变更已被确认
+                del self._pending[user_id]
+            else:
+                self._friends[user_id] = entry
+
+    def _refresh_if_stale(self) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at > self.refresh_interval:
+            self.schedule_refresh()
+
+    async def _refresh(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        self._last_refresh = time.monotonic()
+        self.refreshes += 1
+        # 有增量变更时要求 NapCat 绕过它自己的缓存，确保新好友出现在结果中
+        params = {"no_cache": True} if self._pending else {}
+        try:
+            await cast("NapCatClient", self._client).call_action("get_friend_list", params, use_cache=False)
+        except Exception as e:
+            logger.debug(f"Refreshing friend list failed: {e!r}")
@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import time
+from asyncio import Task
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, ClassVar, cast
+
+from .cache import MISS, CacheStats, as_flag, as_int
+
+if TYPE_CHECKING:
+    from .client import NapCatClient
+
+logger = logging.getLogger("napcat.group_cache")
+
+# 各字段的默认最长缓存时间 (秒)。"detail" 对应 get_group_info_ex / get_group_detail_info 的完整响应
+DEFAULT_MAX_AGE: dict[str, float] = {
+    "group_name": 3600.0,  # 改名有 notify.group_name 通知
+    "group_remark": 3600.0,
+    "group_all_shut": 3600.0,  # 全员禁言有 group_ban 通知
+    "member_count": 300.0,  # 进 / 退群通知只做增量，需定期以权威值校正
+    "max_member_count": 86400.0,
+    "detail": 600.0,
+}
+
+# get_group_info / get_group_list 条目中按字段计时的部分
+_INFO_FIELDS = tuple(k for k in DEFAULT_MAX_AGE if k != "detail")
+_DETAIL_ACTIONS = ("get_group_info_ex", "get_group_detail_info")
+
+
+class _Group:
+    __slots__ = ("info", "fetched", "details", "listed")
+
+    def __init__(self, group_id: int):
+        # get_group_info 格式的资料
+        self.info: dict[str, Any] = {"group_id": group_id}
+        # 字段 -> 取得权威值的时间 (time.monotonic)
+        self.fetched: dict[str, float] = {}
+        # action -> (完整响应, 取得时间)
+        self.details: dict[str, tuple[dict[str, Any], float]] = {}
+        # 出现在 get_group_list 中 (机器人在群内)
+        self.listed = False
+
+    def set(self, field: str, value: Any, now: float | None) -> None:
+        """now 为 None 表示增量修正，不刷新该字段的计时"""
+        self.info[field] = value
+        if now is not None:
+            self.fetched[field] = now
+        for doc, _ in self.details.values():
+            if field in doc:
+                doc[field] = value
+
+
+class GroupCache:
+    """
+    群资料缓存：由 get_group_list 整体填充，get_group_info / get_group_info_ex /
+    get_group_detail_info 在本地应答，并由事件原地修正。
+
+    - notify.group_name (GroupNameEvent): 更新群名
+    - group_increase / group_decrease: 成员数 +1 / -1；机器人自己退群 / 被踢 / 群解散时移除该群
+    - group_ban (user_id 为 0，即全员禁言): 更新 group_all_shut
+    - 本客户端成功调用 set_group_name / set_group_leave: 同步修改
+
+    每个字段单独计时，max_age 给出各字段的最长缓存时间 (键见 DEFAULT_MAX_AGE)：
+    任一字段超时即不再从本地应答，并在后台刷新一次 get_group_list。
+    通知给出的新群名、全员禁言状态视为权威值并重新计时；成员数的增量修正不重新计时，
+    其误差 (丢失的通知) 最多保留 max_age["member_count"] 秒。
+    get_group_info_ex / get_group_detail_info 的响应整体缓存 max_age["detail"] 秒，
+    其中与上述字段同名的键同样被原地修正。
+
+    :param max_age: 覆盖部分字段的最长缓存时间 (秒)
+    :param min_refresh_interval: 两次后台刷新 get_group_list 之间的最小间隔 (秒)
+    :param warm: 未命中时是否在后台拉取群列表
+    """
+
+    name: ClassVar[str] = "group"
+    actions: ClassVar[tuple[str, ...]] = (
+        "get_group_list",
+        "get_group_info",
+        *_DETAIL_ACTIONS,
+        "set_group_name",
+        "set_group_leave",
+    )
+
+    def __init__(
+        self,
+        *,
+        max_age: Mapping[str, float] | None = None,
+        min_refresh_interval: float = 30.0,
+        warm: bool = True,
+    ):
+        unknown = set(max_age or ()) - DEFAULT_MAX_AGE.keys()
+        if unknown:
+            raise ValueError(f"Unknown max_age fields: {', '.join(sorted(unknown))}")
+        self.max_age = DEFAULT_MAX_AGE | dict(max_age or {})
+        self.min_refresh_interval = min_refresh_interval
+        self.warm_on_miss = warm
+        self.stats = CacheStats()
+        self.refreshes = 0
+        self._groups: dict[int, _Group] = {}
+        # 已有完整的 get_group_list 结果，且之后没有加入新群
+        self._complete = False
+        self._refresh_task: Task[None] | None = None
+        self._last_refresh = float("-inf")
+        self._client: "NapCatClient | None" = None
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def bind(self, client: "NapCatClient") -> None:
+        self._client = client
+
+    def get(self, group_id: int) -> dict[str, Any] | None:
+        """只查本地，不论是否超时，不计入命中统计"""
+        group = self._groups.get(group_id)
+        return None if group is None else dict(group.info)
+
+    def schedule_refresh(self) -> None:
+        """安排一次后台刷新；已有刷新在进行或等待时不重复安排"""
+        if self._client is None or (self._refresh_task is not None and not self._refresh_task.done()):
+            return
+        delay = max(0.0, self._last_refresh + self.min_refresh_interval - time.monotonic())
+        self._refresh_task = asyncio.create_task(self._refresh(delay))
+
+    def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+
+    # --- ActionCache ---
+
+    def lookup(self, action: str, params: Mapping[str, Any]) -> Any:
+        if action.startswith("set_"):
+            return MISS
+        if as_flag(params.get("no_cache")):
+            self.stats.misses += 1
+            return MISS
+        now = time.monotonic()
+        result: Any = MISS
+        if action == "get_group_list":
+            # 也可能缓存了机器人不在其中的群 (get_group_info 查询)，不计入列表
+            listed = [g for g in self._groups.values() if g.listed]
+            if self._complete and all(self._fresh(g, now) for g in listed):
+                result = [dict(g.info) for g in listed]
+        elif (group_id := as_int(params.get("group_id"))) is not None and (
+            group := self._groups.get(group_id)
+        ) is not None:
+            if action == "get_group_info":
+                if self._fresh(group, now):
+                    result = dict(group.info)
+            elif (detail := group.details.get(action)) is not None:
+                if now - detail[1] <= self.max_age["detail"]:
+                    result = dict(detail[0])
+        if result is MISS:
+            self.stats.misses += 1
+            # 详细资料不由群列表提供，刷新列表也无济于事
+            if self.warm_on_miss and action not in _DETAIL_ACTIONS:
+                self.schedule_refresh()
+        else:
+            self.stats.hits += 1
+        return result
+
+    def store(self, action: str, params: Mapping[str, Any], data: Any) -> None:
+        now = time.monotonic()
+        match action:
+            case "get_group_list" if isinstance(data, list):
+                groups: dict[int, _Group] = {}
+                for item in cast(list[Any], data):
+                    if isinstance(item, dict) and (group_id := as_int(item.get("group_id"))) is not None:
+                        group = groups[group_id] = self._merge(group_id, cast(dict[str, Any], item), now)
+                        group.listed = True
+                # 不在列表中的群说明机器人已不在群内
+                self._groups = groups
+                self._complete = True
+            case "get_group_info" | "get_group_info_ex" | "get_group_detail_info" if isinstance(data, dict):
+                data = cast(dict[str, Any], data)
+                group_id = as_int(data.get("group_id", params.get("group_id")))
+                if group_id is None:
+                    return
+                group = self._merge(group_id, data, now)
+                if action != "get_group_info":
+                    group.details[action] = (dict(data), now)
+                self._groups[group_id] = group
+            case "set_group_name":
+                group = self._groups.get(as_int(params.get("group_id")) or 0)
+                if group is not None and isinstance(name := params.get("group_name"), str):
+                    group.set("group_name", name, now)
+            case "set_group_leave":
+                if (group_id := as_int(params.get("group_id"))) is not None:
+                    self._groups.pop(group_id, None)
+            case _:
+                pass
+
+    def observe(self, raw: dict[str, Any]) -> bool:
+        if raw.get("post_type") != "notice" or (group_id := as_int(raw.get("group_id"))) is None:
+            return True
+        notice_type = raw.get("notice_type")
+        user_id = as_int(raw.get("user_id"))
+        is_self = user_id is not None and user_id == as_int(raw.get("self_id"))
+        if notice_type == "group_increase" and is_self:
+            # 加入了新群：列表不再完整，后台补齐
+            self._complete = False
+            self.schedule_refresh()
+            return True
+        if notice_type == "group_decrease" and (is_self or raw.get("sub_type") in ("kick_me", "disband")):
+            self._groups.pop(group_id, None)
+            return True
+        group = self._groups.get(group_id)
+        if group is None:
+            return True
+        match notice_type, raw.get("sub_type"):
+            case "notify", "group_name":
+                if isinstance(name := raw.get("name_new"), str):
+                    group.set("group_name", name, time.monotonic())
+            case "group_increase", _:
+                if isinstance(count := group.info.get("member_count"), int):
+                    group.set("member_count", count + 1, None)
+            case "group_decrease", _:
+                if isinstance(count := group.info.get("member_count"), int) and count > 0:
+                    group.set("member_count", count - 1, None)
+            case "group_ban", sub_type if user_id == 0:
+                # NapCat 以 -1 表示全员禁言中
+                group.set("group_all_shut", -1 if sub_type == "ban" else 0, time.monotonic())
+            case _:
+                pass
+        return True
+
+    # --- 内部 ---
+
+    def _fresh(self, group: _Group, now: float) -> bool:
+        if not group.fetched:
+            return False
+        max_age = self.max_age
+        return all(now - at <= max_age[field] for field, at in group.fetched.items())
+
+    def _merge(self, group_id: int, data: Mapping[str, Any], now: float) -> _Group:
+        group = self._groups.get(group_id) or _Group(group_id)
+        # 详细资料中 get_group_info 格式之外的大量字段不进入 info
+        for field in _INFO_FIELDS:
+            if field in data:
+                group.set(field, data[field], now)
+        return group
+
+    async def _refresh(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        self._last_refresh = time.monotonic()
+        self.refreshes += 1
+        # 刷新的目的正是校正超时字段，要求 NapCat 绕过它自己的缓存
+        try:
+            await cast("NapCatClient", self._client).call_action(
+                "get_group_list", {"no_cache": True}, use_cache=False
+            )
+        except Exception as e:
+            logger.debug(f"Refreshing group list failed: {e!r}")
@@ -0,0 +1,196 @@
+import json
+import re
+from collections.abc import Callable, Generator, Iterator, Sequence
+from json.scanner import make_scanner
+from typing import Any, cast
+
+
+def _reject_constant(name: str) -> Any:
+    # 与 orjson 一致，不接受 NaN / Infinity / -Infinity
+    raise ValueError(f"Invalid JSON constant {name}")
+
+
+# 标准库 json 的 C 扫描器：scan(s, idx) 从 idx 处解析一个完整的 JSON 值，返回 (值, 结束位置)；
+# 无法解析时抛出 StopIteration(位置)
+# typeshed 对 make_scanner 的参数类型标注有误 (应为 JSONDecoder)
+_scan_once = cast(
+    Callable[[str, int], tuple[Any, int]],
+    make_scanner(cast(Any, json.JSONDecoder(parse_constant=_reject_constant))),
+)
+_WS = re.compile(r"[ \t\n\r]*")
+_WS_CHARS = frozenset(" \t\n\r")
+
+# 对象最多展开的层数；更深的值整体交给 C 扫描器
+_MAX_DEPTH = 4
+
+
+def loads_chunked(msg: str | bytes) -> Any:
+    """
+    与 orjson.loads 等价的解析，供线程池中解码大帧使用。
+
+    orjson 与标准库的 C 解码器在整个解析期间都持有 GIL，放进线程也会让事件循环停顿同样久。
+    这里按 JSON 结构把文档拆开：对象逐个字段、数组逐个元素交给 C 扫描器，
+    每解析完一小块就回到 Python 字节码，解释器得以按 sys.getswitchinterval() 切换线程，
+    事件循环的停顿因此被限制在毫秒级。
+
+    实验性功能，offload_threshold 默认关闭。代价是整体明显更慢：
+    tests/bench_loop_lag.py 的一次测量中总耗时由 338 ms 升至 1010 ms (约 3 倍)，
+    换来的只是 p50 停顿由 12 ms 降至 5.3 ms、最长停顿不再随帧大小增长；
+    解码线程与事件循环持续争抢 GIL，帧较小时典型停顿反而上升。
+    NaN / Infinity 与 orjson 一样视为非法 JSON。
+    """
+    s = msg.decode() if isinstance(msg, (bytes, bytearray, memoryview)) else msg
+    value, end = _value(s, _skip(s, 0), _MAX_DEPTH)
+    if _skip(s, end) != len(s):
+        raise ValueError(f"Extra data at position {end}")
+    return value
+
+
+def _skip(s: str, idx: int) -> int:
+    return _WS.match(s, idx).end()  # type: ignore[union-attr]
+
+
+def _scan(s: str, idx: int) -> tuple[Any, int]:
+    try:
+        return _scan_once(s, idx)
+    except StopIteration as e:
+        raise ValueError(f"Invalid JSON at position {e.value}") from None
+
+
+def _expect(s: str, idx: int, chars: str) -> str:
+    c = s[idx : idx + 1]
+    if not c or c not in chars:
+        raise ValueError(f"Expected one of {chars!r} at position {idx}")
+    return c
+
+
+def _value(s: str, idx: int, depth: int) -> tuple[Any, int]:
+    c = s[idx : idx + 1]
+    if c == "{" and depth:
+        return _object(s, idx, depth)
+    if c == "[":
+        return _array(s, idx)
+    return _scan(s, idx)
+
+
+def _object(s: str, idx: int, depth: int) -> tuple[dict[str, Any], int]:
+    obj: dict[str, Any] = {}
+    idx = _skip(s, idx + 1)
+    if s[idx : idx + 1] == "}":
+        return obj, idx + 1
+    while True:
+        _expect(s, idx, '"')
+        key, idx = _scan(s, idx)
+        idx = _skip(s, idx)
+        _expect(s, idx, ":")
+        obj[key], idx = _value(s, _skip(s, idx + 1), depth - 1)
+        idx = _skip(s, idx)
+        if _expect(s, idx, ",}") == "}":
+            return obj, idx + 1
+        idx = _skip(s, idx + 1)
+
+
+def _array(s: str, idx: int) -> tuple[list[Any], int]:
+    # 元素 (成员、消息等记录) 本身较小，整体交给 C 扫描器
+    arr: list[Any] = []
+    append = arr.append
+    scan = _scan_once
+    idx = _skip(s, idx + 1)
+    if s[idx : idx + 1] == "]":
+        return arr, idx + 1
+    try:
+        while True:
+            item, idx = scan(s, idx)
+            append(item)
+            # 紧凑输出 (NapCat / orjson) 的元素之间没有空白，先走快速路径
+            c = s[idx : idx + 1]
+            if c == ",":
+                idx += 1
+                if s[idx : idx + 1] in _WS_CHARS:
+                    idx = _skip(s, idx)
+                continue
+            if c == "]":
+                return arr, idx + 1
+            idx = _skip(s, idx)
+            if _expect(s, idx, ",]") == "]":
+                return arr, idx + 1
+            idx = _skip(s, idx + 1)
+    except StopIteration as e:
+        raise ValueError(f"Invalid JSON at position {e.value}") from None
+
+
+
+def iter_array(
+    msg: str | bytes, path: Sequence[str], envelope: dict[str, Any] | None = None
+) -> Iterator[Any]:
+    """
+    增量遍历 msg 中 path 指向的数组 (如 ("data",)、("data", "files"))，逐个产出元素。
+
+    不构建整棵对象树：每次只解析一个元素，是否保留 (或投影) 由调用方决定；
+    path 之外的容器逐元素跳过而不整体物化。顶层的标量字段 (status、retcode、message 等)
+    写入 envelope。path 不存在或不是数组时不产出任何元素。
+    """
+    s = msg.decode() if isinstance(msg, (bytes, bytearray, memoryview)) else msg
+    idx = _skip(s, 0)
+    _expect(s, idx, "{")
+    end = yield from _walk(s, idx, tuple(path), envelope)
+    if _skip(s, end) != len(s):
+        raise ValueError(f"Extra data at position {end}")
+
+
+def _walk(
+    s: str, idx: int, path: tuple[str, ...], envelope: dict[str, Any] | None
+) -> Generator[Any, None, int]:
+    # s[idx] 为 "{"；命中 path 的字段继续深入，其余容器跳过，返回对象结束后的位置
+    idx = _skip(s, idx + 1)
+    if s[idx : idx + 1] == "}":
+        return idx + 1
+    while True:
+        _expect(s, idx, '"')
+        key, idx = _scan(s, idx)
+        idx = _skip(s, idx)
+        _expect(s, idx, ":")
+        idx = _skip(s, idx + 1)
+        c = s[idx : idx + 1]
+        target = bool(path) and key == path[0]
+        if target and len(path) == 1 and c == "[":
+            idx = yield from _items(s, idx)
+        elif target and c == "{":
+            idx = yield from _walk(s, idx, path[1:], None)
+        elif c in ("[", "{"):
+            idx = _discard(s, idx)
+        else:
+            value, idx = _scan(s, idx)
+            if envelope is not None:
+                envelope[key] = value
+        idx = _skip(s, idx)
+        if _expect(s, idx, ",}") == "}":
+            return idx + 1
+        idx = _skip(s, idx + 1)
+
+
+def _items(s: str, idx: int) -> Generator[Any, None, int]:
+    # s[idx] 为 "["，逐个产出元素，返回数组结束后的位置
+    idx = _skip(s, idx + 1)
+    if s[idx : idx + 1] == "]":
+        return idx + 1
+    while True:
+        item, idx = _scan(s, idx)
+        yield item
+        idx = _skip(s, idx)
+        if _expect(s, idx, ",]") == "]":
+            return idx + 1
+        idx = _skip(s, idx + 1)
+
+
+def _discard(s: str, idx: int) -> int:
+    # 跳过一个容器：对象逐字段、数组逐元素解析后丢弃，不持有整个容器
+    return _drain(_walk(s, idx, (), None) if s[idx] == "{" else _items(s, idx))
+
+
+def _drain(gen: Generator[Any, None, int]) -> int:
+    while True:
+        try:
+            next(gen)
+        except StopIteration as e:
+            return e.value
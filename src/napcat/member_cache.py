@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import time
+from asyncio import Task
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, ClassVar, cast
+
+from .cache import MISS, CacheStats, as_flag, as_int
+from .roster import Roster, RosterMember
+
+if TYPE_CHECKING:
+    from .client import NapCatClient
+
+logger = logging.getLogger("napcat.member_cache")
+
+
+class MemberCache:
+    """
+    群成员缓存：每个群一份 Roster，由 get_group_member_list 预热，
+    之后依靠事件增量维护，get_group_member_info 在本地应答。
+
+    成员列表只投影了 ROSTER_FIELDS，因此本地应答分两种：
+    取得过该成员完整响应 (get_group_member_info) 时返回该响应的副本，
+    其中昵称、群名片、角色、头衔与最后发言时间取自事件维护的 Roster；
+    否则只返回 Roster 持有的字段 (性别、禁言时间等字段缺省)，需要这些字段时传 no_cache=True。
+    完整响应独立于 Roster 保存，群成员列表过期重新预热后仍然可用。
+
+    - group_increase: 插入新成员 (只有入群时间与角色)，在取得昵称前其查询走网络并写回
+    - group_decrease: 移除成员；机器人自己退群 / 被踢 / 群解散时丢弃整个群
+    - group_card / group_admin / 头衔变更 (notify.title): 原地修改对应列
+    - 群消息的 sender: 刷新昵称、群名片、角色与最后发言时间
+
+    事件可能丢失 (断线等)，因此每个群在 ttl 秒后整体过期重新预热；
+    最多保留 max_groups 个群，超出时淘汰最久未被查询的群。
+
+    :param ttl: 群成员列表的有效期 (秒)
+    :param max_groups: 缓存的群数量上限
+    :param warm: 查询未缓存的群时，是否在后台拉取整个成员列表
+    """
+
+    name: ClassVar[str] = "member"
+    actions: ClassVar[tuple[str, ...]] = ("get_group_member_info", "get_group_member_list")
+
+    def __init__(self, *, ttl: float = 600.0, max_groups: int = 1000, warm: bool = True):
+        self.ttl = ttl
+        self.max_groups = max_groups
+        self.warm_on_miss = warm
+        self.stats = CacheStats()
+        # group_id -> (Roster, 加载时间 time.monotonic)，按最近使用排序
+        self._groups: OrderedDict[int, tuple[Roster, float]] = OrderedDict()
+        # group_id -> user_id -> 最近一次完整的 get_group_member_info 响应，同样最多保留 max_groups 个群
+        self._records: OrderedDict[int, dict[int, dict[str, Any]]] = OrderedDict()
+        self._warming: dict[int, Task[Roster]] = {}
+        self._client: "NapCatClient | None" = None
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def bind(self, client: "NapCatClient") -> None:
+        self._client = client
+
+    def roster(self, group_id: int) -> Roster | None:
+        """未过期的 Roster，不计入命中统计"""
+        entry = self._groups.get(group_id)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[1] > self.ttl:
+            del self._groups[group_id]
+            return None
+        return entry[0]
+
+    def get(self, group_id: int, user_id: int) -> RosterMember | None:
+        """只查本地；未命中不发起请求 (但会按 warm 在后台预热该群)"""
+        member = self._member(group_id, user_id)
+        if member is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return member
+
+    async def warm(self, group_id: int) -> Roster:
+        """拉取整个成员列表；同一个群的并发预热只发一次请求"""
+        task = self._start_warm(group_id)
+        if task is None:
+            raise RuntimeError("MemberCache is not bound to a client")
+        return await asyncio.shield(task)
+
+    def close(self) -> None:
+        for task in list(self._warming.values()):
+            task.cancel()
+
+    def invalidate(self, group_id: int | None = None) -> None:
+        if group_id is None:
+            self._groups.clear()
+            self._records.clear()
+        else:
+            self._groups.pop(group_id, None)
+            self._records.pop(group_id, None)
+
+    # --- ActionCache ---
+
+    def lookup(self, action: str, params: Mapping[str, Any]) -> Any:
+        if action != "get_group_member_info" or as_flag(params.get("no_cache")):
+            return MISS
+        group_id, user_id = as_int(params.get("group_id")), as_int(params.get("user_id"))
+        if group_id is None or user_id is None:
+            return MISS
+        member = self._member(group_id, user_id)
+        record = None if member is None else self._records.get(group_id, {}).get(user_id)
+        # 只有 group_increase 插入的成员还没有昵称
+        if member is None or (record is None and not member.nickname):
+            self.stats.misses += 1
+            return MISS
+        self.stats.hits += 1
+        if record is None:
+            return _roster_info(group_id, member)
+        self._records.move_to_end(group_id)
+        return _member_info(record, member)
+
+    def store(self, action: str, params: Mapping[str, Any], data: Any) -> None:
+        group_id = as_int(params.get("group_id"))
+        if group_id is None:
+            return
+        if action == "get_group_member_list" and isinstance(data, list):
+            self._put(Roster(group_id, cast(list[dict[str, Any]], data)))
+        elif action == "get_group_member_info" and isinstance(data, dict):
+            data = cast(dict[str, Any], data)
+            if (user_id := as_int(data.get("user_id"))) is None:
+                return
+            if (roster := self.roster(group_id)) is not None:
+                roster.upsert(data)
+            # 群尚未预热 (或正在预热) 时也保留，预热完成后即可命中
+            self._records.setdefault(group_id, {})[user_id] = dict(data)
+            self._records.move_to_end(group_id)
+            while len(self._records) > self.max_groups:
+                self._records.popitem(last=False)
+
+    def observe(self, raw: dict[str, Any]) -> bool:
+        post_type = raw.get("post_type")
+        if post_type == "message":
+            if raw.get("message_type") == "group":
+                self._on_sender(raw)
+        elif post_type == "notice":
+            self._on_notice(raw)
+        return True
+
+    # --- 内部 ---
+
+    def _on_sender(self, raw: dict[str, Any]) -> None:
+        group_id = as_int(raw.get("group_id"))
+        sender = raw.get("sender")
+        # 补发的旧消息不覆盖较新的资料
+        if group_id is None or not isinstance(sender, dict) or raw.get("backfilled"):
+            return
+        entry = self._groups.get(group_id)
+        if entry is None:
+            return
+        sender = cast(dict[str, Any], sender)
+        user_id = as_int(sender.get("user_id", raw.get("user_id")))
+        if user_id is None:
+            return
+        fields = {k: sender[k] for k in ("nickname", "card", "role", "title") if k in sender}
+        if isinstance(ts := raw.get("time"), int):
+            fields["last_sent_time"] = ts
+        entry[0].update(user_id, **fields)
+
+    def _on_notice(self, raw: dict[str, Any]) -> None:
+        group_id = as_int(raw.get("group_id"))
+        user_id = as_int(raw.get("user_id"))
+        if group_id is None or user_id is None or (entry := self._groups.get(group_id)) is None:
+            return
+        roster = entry[0]
+        records = self._records.get(group_id, {})
+        match raw.get("notice_type"), raw.get("sub_type"):
+            case "group_increase", _:
+                # 可能残留的旧记录属于上次入群，一并丢弃
+                records.pop(user_id, None)
+                roster.upsert({"user_id": user_id, "join_time": raw.get("time"), "role": "member"})
+            case "group_decrease", sub_type:
+                if sub_type in ("kick_me", "disband") or user_id == raw.get("self_id"):
+                    del self._groups[group_id]
+                    self._records.pop(group_id, None)
+                else:
+                    roster.remove(user_id)
+                    records.pop(user_id, None)
+            case "group_card", _:
+                roster.update(user_id, card=raw.get("card_new", ""))
+            case "group_admin", sub_type:
+                if roster.role_of(user_id) != "owner":
+                    roster.update(user_id, role="admin" if sub_type == "set" else "member")
+            case "notify", "title":
+                roster.update(user_id, title=raw.get("title", ""))
+            case _:
+                pass
+
+    def _member(self, group_id: int, user_id: int) -> RosterMember | None:
+        roster = self.roster(group_id)
+        if roster is None:
+            if self.warm_on_miss:
+                self._start_warm(group_id)
+            return None
+        self._groups.move_to_end(group_id)
+        return roster.get(user_id)
+
+    def _put(self, roster: Roster) -> None:
+        # 已有的完整响应保留，只丢弃已不在新列表中的成员
+        if (records := self._records.get(roster.group_id)) is not None:
+            for user_id in [u for u in records if u not in roster]:
+                del records[user_id]
+        self._groups[roster.group_id] = (roster, time.monotonic())
+        self._groups.move_to_end(roster.group_id)
+        while len(self._groups) > self.max_groups:
+            group_id, _ = self._groups.popitem(last=False)
+            self._records.pop(group_id, None)
+            self.stats.evictions += 1
+
+    def _start_warm(self, group_id: int) -> Task[Roster] | None:
+        if (task := self._warming.get(group_id)) is not None:
+            return task
+        if self._client is None:
+            return None
+        task = self._warming[group_id] = asyncio.create_task(self._fetch(self._client, group_id))
+
+        def done(t: Task[Roster]) -> None:
+            self._warming.pop(group_id, None)
+            if not t.cancelled() and (e := t.exception()) is not None:
+                logger.debug(f"Warming members of group {group_id} failed: {e!r}")
+
+        task.add_done_callback(done)
+        return task
+
+    async def _fetch(self, client: "NapCatClient", group_id: int) -> Roster:
+        roster = await Roster.fetch(client, group_id)
+        self._put(roster)
+        return roster
+
+
+def _roster_info(group_id: int, member: RosterMember) -> dict[str, Any]:
+    """只含 Roster 持有字段的 get_group_member_info 响应"""
+    return {
+        "group_id": group_id,
+        "user_id": member.user_id,
+        "nickname": member.nickname,
+        "card": member.card,
+        "role": member.role,
+        "title": member.title,
+        # 与 NapCat 一致，群等级以字符串返回
+        "level": str(member.level),
+        "join_time": member.join_time,
+        "last_sent_time": member.last_sent_time,
+    }
+
+
+def _member_info(record: dict[str, Any], member: RosterMember) -> dict[str, Any]:
+    """完整响应的副本，事件会修改的字段以 Roster 中的当前值为准"""
+    return record | {
+        "nickname": member.nickname,
+        "card": member.card,
+        "role": member.role,
+        "title": member.title,
+        "last_sent_time": member.last_sent_time,
+    }
@@ -0,0 +1,163 @@
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, ClassVar, cast
+
+import orjson
+
+from .cache import MISS, CacheStats, as_int
+
+if TYPE_CHECKING:
+    from .client import NapCatClient
+
+_SEND_ACTIONS = ("send_msg", "send_group_msg", "send_private_msg")
+
+
+class MessageStore:
+    """
+    最近消息的本地存储，以 message_id 为键，get_msg 先在本地查找。
+
+    - 收到的消息事件 (message，以及开启上报自身消息时的 message_sent) 原样保存
+    - 本客户端成功发出的消息 (send_msg / send_group_msg / send_private_msg) 按响应中的 message_id 保存；
+      这类记录缺少 message_seq / real_id / raw_message 等只有 NapCat 知道的字段，只能经 get() 读取，
+      get_msg 不从它应答，直到对应的 message_sent 事件或 get_msg 的网络响应给出完整记录
+    - group_recall / friend_recall 通知以及成功的 delete_msg: 移除该消息
+    - get_msg 的网络响应写回存储
+
+    按存入顺序淘汰：超过 max_messages 条时淘汰最早的，存入超过 max_age 秒的不再应答。
+
+    :param max_messages: 保存的消息数上限
+    :param max_age: 消息的最长保存时间 (秒)
+    """
+
+    name: ClassVar[str] = "message"
+    actions: ClassVar[tuple[str, ...]] = ("get_msg", "delete_msg", *_SEND_ACTIONS)
+
+    def __init__(self, *, max_messages: int = 10_000, max_age: float = 3600.0):
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.stats = CacheStats()
+        # message_id -> (消息, 存入时间 time.monotonic, 是否为完整记录)，按存入顺序排列
+        self._messages: OrderedDict[int, tuple[dict[str, Any], float, bool]] = OrderedDict()
+        self._client: "NapCatClient | None" = None
+
+    def __len__(self) -> int:
+        self._expire(time.monotonic())
+        return len(self._messages)
+
+    def __contains__(self, message_id: object) -> bool:
+        return message_id in self._messages
+
+    def bind(self, client: "NapCatClient") -> None:
+        self._client = client
+
+    def get(self, message_id: int) -> dict[str, Any] | None:
+        """只查本地，不计入命中统计；自己发出、尚未补全的消息也会返回。返回副本，修改它不影响存储"""
+        self._expire(time.monotonic())
+        entry = self._messages.get(message_id)
+        return None if entry is None else _copy_message(entry[0])
+
+    def close(self) -> None:
+        pass
+
+    # --- ActionCache ---
+
+    def lookup(self, action: str, params: Mapping[str, Any]) -> Any:
+        if action != "get_msg":
+            return MISS
+        message_id = as_int(params.get("message_id"))
+        self._expire(time.monotonic())
+        entry = None if message_id is None else self._messages.get(message_id)
+        if entry is None or not entry[2]:
+            self.stats.misses += 1
+            return MISS
+        self.stats.hits += 1
+        return _copy_message(entry[0])
+
+    def store(self, action: str, params: Mapping[str, Any], data: Any) -> None:
+        if action == "get_msg":
+            if isinstance(data, dict):
+                # 响应 dict 同时交给了调用方，保存副本
+                self._put(dict(cast(dict[str, Any], data)), complete=True)
+        elif action == "delete_msg":
+            if (message_id := as_int(params.get("message_id"))) is not None:
+                self._messages.pop(message_id, None)
+        elif isinstance(data, dict):
+            message_id = as_int(cast(dict[str, Any], data).get("message_id"))
+            # message_sent 事件可能先于响应到达，已有完整记录时不覆盖
+            if message_id is not None and message_id not in self._messages:
+                if (message := self._sent_message(action, params, message_id)) is not None:
+                    self._put(message, complete=False)
+
+    def observe(self, raw: dict[str, Any]) -> bool:
+        post_type = raw.get("post_type")
+        if post_type == "message" or post_type == "message_sent":
+            # raw 同时交给了订阅者，顶层字段保存副本；消息段在应答时再复制
+            self._put(dict(raw), complete=True)
+        elif post_type == "notice" and raw.get("notice_type") in ("group_recall", "friend_recall"):
+            if (message_id := as_int(raw.get("message_id"))) is not None:
+                self._messages.pop(message_id, None)
+        return True
+
+    # --- 内部 ---
+
+    def _put(self, message: dict[str, Any], complete: bool) -> None:
+        message_id = as_int(message.get("message_id"))
+        if message_id is None:
+            return
+        now = time.monotonic()
+        self._messages[message_id] = (message, now, complete)
+        self._messages.move_to_end(message_id)
+        while len(self._messages) > self.max_messages:
+            self._messages.popitem(last=False)
+            self.stats.evictions += 1
+        self._expire(now)
+
+    def _expire(self, now: float) -> None:
+        messages = self._messages
+        deadline = now - self.max_age
+        while messages and next(iter(messages.values()))[1] < deadline:
+            messages.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _sent_message(self, action: str, params: Mapping[str, Any], message_id: int) -> dict[str, Any] | None:
+        """按 get_msg 的格式构造自己发出的消息"""
+        content = params.get("message")
+        if isinstance(content, str):
+            # CQ 码需要 NapCat 解析，无法在本地还原为消息段
+            if "[CQ:" in content:
+                return None
+            segments: Any = [{"type": "text", "data": {"text": content}}]
+        else:
+            # MessageSegment 对象与 dict 混用时统一转为 dict
+            segments = orjson.loads(orjson.dumps(content))
+        group_id = as_int(params.get("group_id"))
+        if action == "send_msg":
+            message_type = params.get("message_type") or ("group" if group_id is not None else "private")
+        else:
+            message_type = "group" if action == "send_group_msg" else "private"
+        self_id = self._client.self_id if self._client is not None else -1
+        message: dict[str, Any] = {
+            "self_id": self_id,
+            "time": int(time.time()),
+            "message_id": message_id,
+            "message_type": message_type,
+            "user_id": self_id,
+            "sender": {"user_id": self_id, "nickname": ""},
+            "message": segments,
+            "message_format": "array",
+            "post_type": "message_sent",
+        }
+        if message_type == "group":
+            message["group_id"] = group_id
+        else:
+            message["target_id"] = as_int(params.get("user_id"))
+        return message
+
+
+def _copy_message(message: dict[str, Any]) -> dict[str, Any]:
+    """返回给调用方的副本：顶层浅拷贝，消息段数组整体深拷贝"""
+    copy = dict(message)
+    if isinstance(segments := copy.get("message"), list):
+        copy["message"] = orjson.loads(orjson.dumps(segments))
+    return copy
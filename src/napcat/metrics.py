@@ -0,0 +1,138 @@
+from dataclasses import dataclass, field
+
+# HDR 风格的对数-线性分桶：每个 2 的幂区间再等分为 2**_SUB_BITS 个子桶，
+# 相对误差约 1 / 2**_SUB_BITS (≈6%)，覆盖 0 ~ 2**_MAX_BITS ns (约 18 分钟)，内存恒定
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+_LINEAR = _SUB_COUNT * 2
+_MAX_BITS = 40
+_BUCKETS = ((_MAX_BITS - _SUB_BITS - 1) << _SUB_BITS) + _LINEAR
+
+
+def _bucket_upper(idx: int) -> int:
+    """桶 idx 所覆盖区间的上界 (ns，不含)"""
+    if idx < _LINEAR:
+        return idx + 1
+    shift = (idx >> _SUB_BITS) - 1
+    return ((idx - (shift << _SUB_BITS)) + 1) << shift
+
+
+class LatencyHistogram:
+    """
+    记录纳秒级耗时的定长直方图。record() 只做几次整数运算，
+    最大值与分位数均取所在桶的上界 (HDR 的 "highest equivalent value")。
+    """
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self) -> None:
+        self.counts = [0] * _BUCKETS
+        self.total = 0
+
+    def record(self, ns: int) -> None:
+        shift = ns.bit_length() - _SUB_BITS - 1
+        idx = (shift << _SUB_BITS) + (ns >> shift) if shift > 0 else ns
+        self.counts[idx if idx < _BUCKETS else _BUCKETS - 1] += 1
+        self.total += ns
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def max(self) -> float:
+        """最大耗时 (秒)"""
+        for idx in range(_BUCKETS - 1, -1, -1):
+            if self.counts[idx]:
+                return _bucket_upper(idx) / 1e9
+        return 0.0
+
+    @property
+    def mean(self) -> float:
+        """平均耗时 (秒)，由精确的总和计算"""
+        count = self.count
+        return self.total / count / 1e9 if count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """第 q 百分位 (0~100) 的耗时，单位秒"""
+        count = self.count
+        if not count:
+            return 0.0
+        rank = max(1, round(count * q / 100))
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return _bucket_upper(idx) / 1e9
+        return self.max
+
+
+@dataclass(slots=True)
+class ActionStats:
+    """单个 action 的累计统计，由 Connection.send 在热路径上直接维护"""
+
+    calls: int = 0
+    # 失败的响应 (status 非 ok) 与抛出异常的调用，不含超时
+    errors: int = 0
+    timeouts: int = 0
+    # 合并到相同的在途只读调用、没有单独发出请求的调用 (不计入 calls)
+    coalesced: int = 0
+    # 没有收到响应就结束的调用 (连接断开、取消等)，不含超时
+    unanswered: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    # 所有收到响应的调用的耗时，其计数即已完成的调用数
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def in_flight(self) -> int:
+        # 由计数推导，热路径上不必额外维护
+        return self.calls - self.latency.count - self.timeouts - self.unanswered
+
+    def snapshot(self, action: str) -> "ActionSnapshot":
+        h = self.latency
+        return ActionSnapshot(
+            action=action,
+            calls=self.calls,
+            errors=self.errors,
+            timeouts=self.timeouts,
+            coalesced=self.coalesced,
+            in_flight=self.in_flight,
+            request_bytes=self.request_bytes,
+            response_bytes=self.response_bytes,
+            mean=h.mean,
+            p50=h.percentile(50),
+            p90=h.percentile(90),
+            p99=h.percentile(99),
+            max=h.max,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ActionSnapshot:
+    """某一时刻的 action 统计快照，耗时单位为秒"""
+
+    action: str
+    calls: int
+    errors: int
+    timeouts: int
+    coalesced: int
+    in_flight: int
+    request_bytes: int
+    response_bytes: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+class ActionMetrics(dict[str, ActionStats]):
+    """action 名称 -> ActionStats；同一客户端的所有连接 (连接池、重连) 共享一份"""
+
+    def __missing__(self, action: str) -> ActionStats:
+        stats = self[action] = ActionStats()
+        return stats
+
+    def snapshot(self) -> dict[str, ActionSnapshot]:
+        return {action: stats.snapshot(action) for action, stats in self.items()}
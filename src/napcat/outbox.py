@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """出站帧的优先级，数值越小越先写出"""
+
+    INTERACTIVE = 0  # 发消息、撤回等需要立即可见的操作
+    NORMAL = 1
+    BULK = 2  # 成员列表、历史消息、文件上传下载等批量操作
+
+
+_INTERACTIVE_PREFIXES = ("send_", "delete_msg", "set_msg_emoji_like")
+_BULK_PREFIXES = ("upload_", "download_", "clean_cache")
+_BULK_SUFFIXES = ("_list", "_history")
+
+
+def action_priority(action: str) -> Priority:
+    """未显式指定优先级时，根据 action 名称推断"""
+    if action.startswith(_INTERACTIVE_PREFIXES):
+        return Priority.INTERACTIVE
+    if action.startswith(_BULK_PREFIXES) or action.endswith(_BULK_SUFFIXES):
+        return Priority.BULK
+    return Priority.NORMAL
+
+
+@dataclass(slots=True)
+class WriteStats:
+    """写出任务的统计，时间单位为秒"""
+
+    frames: int = 0
+    bytes: int = 0
+    # 调用方已超时或取消、因而未写出的帧
+    abandoned: int = 0
+    depth_high_water: int = 0
+    # 入队到开始写出的等待时间
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    # ws.send 本身的耗时
+    write_total: float = 0.0
+    write_max: float = 0.0
+
+    def record(self, size: int, queue_wait: float, write: float) -> None:
+        self.frames += 1
+        self.bytes += size
+        self.queue_wait_total += queue_wait
+        self.write_total += write
+        if queue_wait > self.queue_wait_max:
+            self.queue_wait_max = queue_wait
+        if write > self.write_max:
+            self.write_max = write
+
+    @property
+    def queue_wait_avg(self) -> float:
+        return self.queue_wait_total / self.frames if self.frames else 0.0
+
+    @property
+    def write_avg(self) -> float:
+        return self.write_total / self.frames if self.frames else 0.0
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from types import TracebackType
+
+from websockets.asyncio.client import connect as ws_connect
+
+from .connection import MAX_FRAME_SIZE, Connection
+from .metrics import ActionMetrics
+
+logger = logging.getLogger("napcat.pool")
+
+
+class ConnectionPool:
+    """
+    同一 NapCat 端点上的 K 条 action 连接。
+    调用按在途请求数路由到最空闲的连接，避免所有请求在单个 socket 上排队 (队头阻塞)。
+
+    池中连接只用于收发 action (Connection(handle_events=False))：事件帧在解码前按原始内容识别并丢弃，
+    也不检测心跳，失活的连接由 websockets 的 ping 发现。
+    如果 NapCat 提供了仅 API 的路径 (如 ws://host:port/api)，可以通过 url 指定以省去接收事件帧的开销。
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int,
+        headers: dict[str, str] | None = None,
+        metrics: ActionMetrics | None = None,
+        offload_threshold: int | None = None,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.url = url
+        self.size = size
+        self.headers = headers or {}
+        self.metrics = metrics
+        self.offload_threshold = offload_threshold
+        self._members: list[tuple[ws_connect, Connection]] = []
+
+    @property
+    def connections(self) -> list[Connection]:
+        return [conn for _, conn in self._members]
+
+    @property
+    def in_flight(self) -> list[int]:
+        """每条连接当前的在途请求数，已断开的连接为 -1"""
+        return [-1 if conn.closed else conn.in_flight for _, conn in self._members]
+
+    def pick(self) -> Connection | None:
+        """最空闲的可用连接，全部断开时返回 None"""
+        best: Connection | None = None
+        for _, conn in self._members:
+            if conn.closed:
+                continue
+            if best is None or conn.in_flight < best.in_flight:
+                best = conn
+        return best
+
+    async def __aenter__(self):
+        await self.refill()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ):
+        await self.close()
+
+    async def refill(self) -> None:
+        """替换已断开的连接并补足到 size 条，单条连接失败不影响其余连接"""
+        alive: list[tuple[ws_connect, Connection]] = []
+        for ctx, conn in self._members:
+            if conn.closed:
+                await _close(ctx, conn)
+            else:
+                alive.append((ctx, conn))
+        results = await asyncio.gather(
+            *(self._open() for _ in range(self.size - len(alive))), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to open pooled connection: {result!r}")
+            else:
+                alive.append(result)
+        self._members = alive
+
+    async def close(self) -> None:
+        members, self._members = self._members, []
+        await asyncio.gather(*(_close(ctx, conn) for ctx, conn in members))
+
+    async def _open(self) -> tuple[ws_connect, Connection]:
+        ctx = ws_connect(self.url, additional_headers=self.headers, max_size=MAX_FRAME_SIZE)
+        ws = await ctx.__aenter__()
+        conn = Connection(
+            ws,
+            metrics=self.metrics,
+            heartbeat_misses=None,
+            offload_threshold=self.offload_threshold,
+            handle_events=False,
+        )
+        await conn.__aenter__()
+        return ctx, conn
+
+
+async def _close(ctx: ws_connect, conn: Connection) -> None:
+    try:
+        await conn.close()
+        await ctx.__aexit__(None, None, None)
+    except Exception:
+        pass
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from types import TracebackType
+from typing import TYPE_CHECKING
+
+from .metrics import ActionStats
+
+if TYPE_CHECKING:
+    from .client import NapCatClient
+    from .server import ReverseWebSocketServer
+
+logger = logging.getLogger("napcat.prometheus")
+
+type MetricSource = "NapCatClient | ReverseWebSocketServer"
+type Labels = tuple[tuple[str, str], ...]
+
+_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class _Families:
+    """
+    按指标名归并样本，保证每个指标的 HELP / TYPE 只输出一次；
+    标签完全相同的样本 (如同一 self_id 的两条连接) 合并求和
+    """
+
+    def __init__(self) -> None:
+        self._meta: dict[str, tuple[str, str]] = {}
+        self._samples: dict[str, dict[tuple[str, Labels], float]] = {}
+
+    def add(
+        self, name: str, kind: str, help: str, labels: Labels, value: float, suffix: str = ""
+    ) -> None:
+        if name not in self._meta:
+            self._meta[name] = (kind, help)
+            self._samples[name] = {}
+        samples = self._samples[name]
+        key = (suffix, labels)
+        samples[key] = samples.get(key, 0) + value
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for name, (kind, help) in self._meta.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (suffix, labels), value in self._samples[name].items():
+                label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{name}{suffix}{{{label_str}}} {_format(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+class MetricsExporter:
+    """
+    Prometheus 文本格式的指标端点 (GET /metrics)，基于 asyncio.start_server，不引入额外依赖。
+
+    所有数值都来自热路径上维护的计数器 (事件计数、action 统计、队列深度等)，
+    抓取时只做读取与格式化，不会遍历事件或请求。
+
+    exporter = MetricsExporter(port=9464)
+    exporter.register(server)  # ReverseWebSocketServer 或 NapCatClient
+    async with exporter: ...
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 9464):
+        self.host = host
+        self.port = port
+        self._sources: list[MetricSource] = []
+        self._server: asyncio.Server | None = None
+
+    def register(self, source: MetricSource) -> None:
+        if source not in self._sources:
+            self._sources.append(source)
+
+    def unregister(self, source: MetricSource) -> None:
+        if source in self._sources:
+            self._sources.remove(source)
+
+    def _clients(self) -> Iterator["NapCatClient"]:
+        from .client import NapCatClient  # 避免循环导入
+
+        for source in self._sources:
+            # NapCatClient 的 __getattr__ 会把任意属性当作 action，不能用 getattr 探测；
+            # ReverseWebSocketServer 通过 clients 暴露当前所有连接的客户端
+            if isinstance(source, NapCatClient):
+                yield source
+            else:
+                yield from source.clients
+
+    def render(self) -> str:
+        f = _Families()
+        now = time.monotonic()
+        for client in self._clients():
+            _collect_client(f, client, now)
+        return f.render()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ):
+        await self.close()
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Metrics endpoint listening on {self.host}:{self.port}/metrics")
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            async with asyncio.timeout(5):
+                request_line = await reader.readline()
+                # 丢弃请求头
+                while await reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.render().encode()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                status, body, content_type = "404 Not Found", b"Not Found\n", "text/plain"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (TimeoutError, ConnectionError) as e:
+            logger.debug(f"Metrics request failed: {e!r}")
+        finally:
+            writer.close()
+
+
+def _collect_client(f: _Families, client: "NapCatClient", now: float) -> None:
+    bot: Labels = (("self_id", str(client.self_id)),)
+    conns = client.connections
+    main = conns[0] if conns else None
+
+    f.add("napcat_bots_connected", "gauge", "Connected bots (1 per live event connection)",
+          bot, 1 if main is not None and not main.closed else 0)
+    f.add("napcat_reconnects_total", "counter", "Successful automatic reconnects", bot, client.reconnects)
+
+    if main is not None:
+        hub = main.hub
+        for post_type, count in hub.event_counts.items():
+            f.add("napcat_events_total", "counter", "Event frames received by post_type",
+                  bot + (("post_type", post_type),), count)
+        stats = [p.stats for p in hub.policies]
+        f.add("napcat_event_subscribers", "gauge", "Active events() subscribers", bot, hub.subscribers)
+        f.add("napcat_subscriber_queue_depth", "gauge", "Events buffered across all subscribers",
+              bot, sum(s.depth for s in stats))
+        f.add("napcat_subscriber_dropped_total", "counter", "Events dropped by backpressure policies",
+              bot, hub.dropped_total + sum(s.dropped for s in stats))
+        f.add("napcat_connection_healthy", "gauge", "0 after the connection missed too many heartbeats",
+              bot, 1 if main.healthy else 0)
+        if main.last_heartbeat is not None:
+            f.add("napcat_heartbeat_age_seconds", "gauge", "Seconds since the last heartbeat event",
+                  bot, now - main.last_heartbeat)
+
+    f.add("napcat_outbound_queue_depth", "gauge", "Frames waiting for the writer task",
+          bot, sum(c.outbound_depth for c in conns))
+    f.add("napcat_outbound_frames_total", "counter", "Frames written to the socket",
+          bot, sum(c.write_stats.frames for c in conns))
+    f.add("napcat_outbound_abandoned_total", "counter", "Queued frames skipped because the caller gave up",
+          bot, sum(c.write_stats.abandoned for c in conns))
+
+    for name, cache in client.caches.items():
+        labels = bot + (("cache", name),)
+        stats = cache.stats
+        f.add("napcat_cache_hits_total", "counter", "Actions answered from a local cache", labels, stats.hits)
+        f.add("napcat_cache_misses_total", "counter", "Cache lookups that went to NapCat", labels, stats.misses)
+        f.add("napcat_cache_evictions_total", "counter", "Entries evicted by size limits", labels, stats.evictions)
+        f.add("napcat_cache_entries", "gauge", "Entries currently cached", labels, len(cache))
+
+    _collect_actions(f, bot, client.metrics.items())
+
+
+def _collect_actions(f: _Families, bot: Labels, actions: Iterable[tuple[str, ActionStats]]) -> None:
+    for action, stats in actions:
+        labels = bot + (("action", action),)
+        f.add("napcat_action_calls_total", "counter", "Action calls", labels, stats.calls)
+        f.add("napcat_action_errors_total", "counter", "Failed actions (error status or exception)",
+              labels, stats.errors)
+        f.add("napcat_action_timeouts_total", "counter", "Timed out actions", labels, stats.timeouts)
+        f.add("napcat_action_coalesced_total", "counter", "Calls merged into an identical in-flight request",
+              labels, stats.coalesced)
+        f.add("napcat_action_in_flight", "gauge", "Actions awaiting a response", labels, stats.in_flight)
+        f.add("napcat_action_request_bytes_total", "counter", "Request payload bytes",
+              labels, stats.request_bytes)
+        f.add("napcat_action_response_bytes_total", "counter", "Response payload bytes",
+              labels, stats.response_bytes)
+        h = stats.latency
+        for q in _QUANTILES:
+            f.add("napcat_action_latency_seconds", "summary", "Action round-trip latency",
+                  labels + (("quantile", f"{q:g}"),), h.percentile(q * 100))
+        f.add("napcat_action_latency_seconds", "summary", "Action round-trip latency",
+              labels, h.total / 1e9, "_sum")
+        f.add("napcat_action_latency_seconds", "summary", "Action round-trip latency",
+              labels, h.count, "_count")
@@ -0,0 +1,41 @@
+import itertools
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from .client_api import READ_ONLY_ACTIONS
+
+
+def is_idempotent(action: str) -> bool:
+    """只读 action (由 scripts/api-codegen.py 逐个声明)：断线时仍在途的此类调用可以安全地在新连接上重放"""
+    return action in READ_ONLY_ACTIONS
+
+
+@dataclass(slots=True, frozen=True)
+class ReconnectPolicy:
+    """
+    正向 WebSocket 断线重连策略：带抖动的指数退避。
+
+    :param initial_delay: 第一次重连前的等待 (秒)，之后每次乘以 multiplier
+    :param max_delay: 单次等待的上限 (秒)
+    :param multiplier: 退避倍数
+    :param jitter: 抖动比例，实际等待在 [delay * (1 - jitter), delay] 之间均匀分布，
+        避免多个客户端同时重连
+    :param max_attempts: 最大连续重连次数，None 表示无限重试；耗尽后事件流结束
+    :param replay_idempotent: 断线时仍在等待响应的只读 action (get_* 等) 是否在新连接上重放，
+        其余 action 一律抛出 ConnectionError，避免重复发送消息等副作用
+    """
+
+    initial_delay: float = 0.05
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: float = 0.5
+    max_attempts: int | None = None
+    replay_idempotent: bool = True
+
+    def delays(self) -> Iterator[float]:
+        attempts = itertools.count() if self.max_attempts is None else range(self.max_attempts)
+        delay = self.initial_delay
+        for _ in attempts:
+            yield delay * (1 - self.jitter * random.random())
+            delay = min(delay * self.multiplier, self.max_delay)
@@ -0,0 +1,34 @@
+from collections import namedtuple
+from collections.abc import Callable, Sequence
+from functools import cache
+from typing import Any
+
+# 投影规格：字段名序列，或 typing.NamedTuple 子类 (字段即其 _fields，缺省值取其默认值)
+type Fields = Sequence[str] | type[tuple[Any, ...]]
+
+
+@cache
+def record_type(fields: tuple[str, ...]) -> type[tuple[Any, ...]]:
+    """按字段名生成 (并缓存) 轻量记录类型：namedtuple，缺失的字段为 None"""
+    return namedtuple("Record", fields, defaults=(None,) * len(fields), rename=True)
+
+
+def projector(fields: Fields) -> Callable[[dict[str, Any]], tuple[Any, ...]]:
+    """
+    返回把原始 dict 投影为记录的函数。只保留需要的字段，
+    记录为 tuple 子类，不带 __dict__，远小于原始 dict。
+    """
+    if isinstance(fields, type):
+        cls = fields
+        defaults: dict[str, Any] = getattr(cls, "_field_defaults", {})
+        spec = [(name, defaults.get(name)) for name in getattr(cls, "_fields")]
+    else:
+        cls = record_type(tuple(fields))
+        spec = [(name, None) for name in fields]
+    new = tuple.__new__
+
+    def project(item: dict[str, Any]) -> tuple[Any, ...]:
+        get = item.get
+        return new(cls, [get(name, default) for name, default in spec])
+
+    return project
@@ -0,0 +1,233 @@
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from .client import NapCatClient
+
+_ROLES = ("member", "admin", "owner")
+_ROLE_CODES = {role: code for code, role in enumerate(_ROLES)}
+_U32_MAX = 0xFFFFFFFF
+_U16_MAX = 0xFFFF
+
+# 投影到 Roster 的字段；iter_list 只解析这些
+ROSTER_FIELDS = ("user_id", "nickname", "card", "role", "title", "level", "join_time", "last_sent_time")
+
+
+class RosterMember(NamedTuple):
+    """Roster 中一行的只读视图"""
+
+    user_id: int
+    nickname: str
+    card: str
+    role: str
+    title: str
+    level: int
+    join_time: int
+    last_sent_time: int
+
+    @property
+    def display_name(self) -> str:
+        return self.card or self.nickname
+
+
+_new_tuple = tuple.__new__
+
+
+def _u32(value: Any) -> int:
+    return value if isinstance(value, int) and 0 <= value <= _U32_MAX else 0
+
+
+def _level(value: Any) -> int:
+    # NapCat 以字符串返回群等级
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    return value if isinstance(value, int) and 0 <= value <= _U16_MAX else 0
+
+
+def _text(value: Any) -> str:
+    return sys.intern(value) if isinstance(value, str) else ""
+
+
+class Roster:
+    """
+    单个群成员列表的列式存储。
+
+    数值列 (user_id、入群时间、最后发言时间、等级、角色) 存放在 array 中，
+    昵称 / 群名片 / 头衔经 sys.intern 去重 (大量成员的群名片、头衔为空或重复)，
+    另有 user_id -> 行号 的索引保证 O(1) 查找。删除时用末行填补空位，行号不保持稳定。
+
+    roster = await Roster.fetch(client, group_id)
+    if (m := roster.get(user_id)) is not None:
+        print(m.display_name, m.role)
+    """
+
+    __slots__ = (
+        "group_id",
+        "_index",
+        "_user_ids",
+        "_join_times",
+        "_last_sent_times",
+        "_levels",
+        "_roles",
+        "_nicknames",
+        "_cards",
+        "_titles",
+    )
+
+    def __init__(self, group_id: int, members: Iterable[Mapping[str, Any] | tuple[Any, ...]] = ()):
+        self.group_id = group_id
+        self._index: dict[int, int] = {}
+        self._user_ids = array("q")
+        self._join_times = array("I")
+        self._last_sent_times = array("I")
+        self._levels = array("H")
+        self._roles = array("B")
+        self._nicknames: list[str] = []
+        self._cards: list[str] = []
+        self._titles: list[str] = []
+        for member in members:
+            self.upsert(member)
+
+    @classmethod
+    async def fetch(cls, client: "NapCatClient", group_id: int) -> "Roster":
+        """通过 get_group_member_list 构建；响应按成员增量解析，不物化整个响应"""
+        roster = cls(group_id)
+        async for member in client.iter_list(
+            "get_group_member_list", {"group_id": group_id}, fields=ROSTER_FIELDS
+        ):
+            roster.upsert(member)
+        return roster
+
+    def __len__(self) -> int:
+        return len(self._user_ids)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._index
+
+    def __iter__(self) -> Iterator[RosterMember]:
+        for row in range(len(self._user_ids)):
+            yield self._row(row)
+
+    def get(self, user_id: int) -> RosterMember | None:
+        row = self._index.get(user_id)
+        return None if row is None else self._row(row)
+
+    def role_of(self, user_id: int) -> str | None:
+        row = self._index.get(user_id)
+        return None if row is None else _ROLES[self._roles[row]]
+
+    def upsert(self, member: Mapping[str, Any] | tuple[Any, ...]) -> None:
+        """
+        插入或整行覆盖一个成员。member 可以是 get_group_member_list / get_group_member_info
+        返回的 dict，也可以是按 ROSTER_FIELDS 投影的记录
+        """
+        if isinstance(member, tuple):
+            member = dict(zip(ROSTER_FIELDS, member))
+        user_id = member.get("user_id")
+        if not isinstance(user_id, int):
+            return
+        values = (
+            _u32(member.get("join_time")),
+            _u32(member.get("last_sent_time")),
+            _level(member.get("level")),
+            _ROLE_CODES.get(member.get("role") or "member", 0),
+            _text(member.get("nickname")),
+            _text(member.get("card")),
+            _text(member.get("title")),
+        )
+        row = self._index.get(user_id)
+        if row is None:
+            self._index[user_id] = len(self._user_ids)
+            self._user_ids.append(user_id)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+
+    def update(self, user_id: int, **fields: Any) -> bool:
+        """
+        原地修改已有成员的部分字段 (card、role、title、nickname、level、last_sent_time)，
+        成员不存在时返回 False
+        """
+        row = self._index.get(user_id)
+        if row is None:
+            return False
+        for key, value in fields.items():
+            match key:
+                case "card":
+                    self._cards[row] = _text(value)
+                case "nickname":
+                    self._nicknames[row] = _text(value)
+                case "title":
+                    self._titles[row] = _text(value)
+                case "role":
+                    self._roles[row] = _ROLE_CODES.get(value, 0)
+                case "level":
+                    self._levels[row] = _level(value)
+                case "join_time":
+                    self._join_times[row] = _u32(value)
+                case "last_sent_time":
+                    self._last_sent_times[row] = _u32(value)
+                case _:
+                    raise KeyError(key)
+        return True
+
+    def remove(self, user_id: int) -> bool:
+        row = self._index.pop(user_id, None)
+        if row is None:
+            return False
+        last = len(self._user_ids) - 1
+        if row != last:
+            # 末行移到空位，保持各列紧凑
+            moved = self._user_ids[last]
+            self._user_ids[row] = moved
+            self._index[moved] = row
+            for column in self._columns():
+                column[row] = column[last]
+        self._user_ids.pop()
+        for column in self._columns():
+            column.pop()
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        """列与索引的近似内存占用 (字节)，不含被多个群共享的驻留字符串"""
+        arrays = (self._user_ids, self._join_times, self._last_sent_times, self._levels, self._roles)
+        lists = (self._nicknames, self._cards, self._titles)
+        return (
+            sum(sys.getsizeof(a) for a in arrays)
+            + sum(sys.getsizeof(lst) for lst in lists)
+            + sys.getsizeof(self._index)
+        )
+
+    def _columns(self) -> tuple[Any, ...]:
+        # 与 upsert 中 values 的顺序一致
+        return (
+            self._join_times,
+            self._last_sent_times,
+            self._levels,
+            self._roles,
+            self._nicknames,
+            self._cards,
+            self._titles,
+        )
+
+    def _row(self, row: int) -> RosterMember:
+        # 绕过 NamedTuple 生成的 __new__，直接构造 tuple
+        values = (
+            self._user_ids[row],
+            self._nicknames[row],
+            self._cards[row],
+            _ROLES[self._roles[row]],
+            self._titles[row],
+            self._levels[row],
+            self._join_times[row],
+            self._last_sent_times[row],
+        )
+        return _new_tuple(RosterMember, values)
+
+    def __repr__(self) -> str:
+        return f"Roster(group_id={self.group_id}, members={len(self)})"
@@ -1,12 +1,15 @@
 import asyncio
 import logging
 from types import TracebackType
+from typing import Literal
 from collections.abc import Awaitable, Callable
 
 from websockets.asyncio.server import ServerConnection, serve
 
 from .client import NapCatClient
-from .connection import Connection
+from .connection import MAX_FRAME_SIZE, Connection
+from .prometheus import MetricsExporter
+from .types import ValidationMode
 
 logger = logging.getLogger("napcat.server")
 
@@ -21,18 +24,51 @@ class ReverseWebSocketServer:
         host: str = "0.0.0.0",
         port: int = 8080,
         token: str | None = None,
+        validation: ValidationMode | Literal["strict", "sampled", "off"] | None = None,
+        lazy_messages: bool = False,
+        metrics_port: int | None = None,
+        heartbeat_misses: int | None = 3,
+        offload_threshold: int | None = None,
+        member_cache: bool = False,
+        friend_cache: bool = False,
+        group_cache: bool = False,
+        message_store: bool = False,
     ):
         """
         :param handler: 一个异步函数，形式为 async def my_handler(client: NapCatClient): ...
         :param host: 监听地址
         :param port: 监听端口
         :param token: 鉴权 Token
+        :param validation: 每个连接的客户端使用的校验模式，None 表示沿用全局模式
+        :param lazy_messages: 每个连接的客户端是否惰性解码消息段
+        :param metrics_port: 在该端口开启 Prometheus 格式的 /metrics 端点，汇总所有连接的客户端
+        :param heartbeat_misses: 连续错过多少次心跳后判定连接失活并将其断开移除，None 表示不检测
+        :param offload_threshold: (实验性) 不小于该长度 (字符数) 的帧在线程池中解码，None (默认) 表示不启用；
+            开启后总耗时约为 3 倍，见 jsonscan.loads_chunked
+        :param member_cache: 为每个连接的客户端开启群成员缓存 (各自独立)
+        :param friend_cache: 为每个连接的客户端开启好友缓存 (各自独立)
+        :param group_cache: 为每个连接的客户端开启群资料缓存 (各自独立)
+        :param message_store: 为每个连接的客户端开启最近消息存储 (各自独立)
         """
         self.handler = handler
         self.host = host
         self.port = port
         self.token = token
+        self.validation: ValidationMode | Literal["strict", "sampled", "off"] | None = validation
+        self.lazy_messages = lazy_messages
+        self.heartbeat_misses = heartbeat_misses
+        self.offload_threshold = offload_threshold
+        self.member_cache = member_cache
+        self.friend_cache = friend_cache
+        self.group_cache = group_cache
+        self.message_store = message_store
         self._server = None
+        # 当前在线的客户端
+        self.clients: set[NapCatClient] = set()
+        self.exporter: MetricsExporter | None = None
+        if metrics_port is not None:
+            self.exporter = MetricsExporter(port=metrics_port)
+            self.exporter.register(self)
 
     async def _handle_connection(self, ws: ServerConnection):
         # 1. 鉴权逻辑
@@ -49,20 +85,36 @@ class ReverseWebSocketServer:
             return
 
         # 2. 创建连接对象
-        conn = Connection(ws)
-        client = NapCatClient(_existing_conn=conn)
+        conn = Connection(
+            ws, heartbeat_misses=self.heartbeat_misses, offload_threshold=self.offload_threshold
+        )
+        client = NapCatClient(
+            validation=self.validation,
+            lazy_messages=self.lazy_messages,
+            member_cache=self.member_cache,
+            friend_cache=self.friend_cache,
+            group_cache=self.group_cache,
+            message_store=self.message_store,
+            _existing_conn=conn,
+        )
 
         try:
             async with client:
+                self.clients.add(client)
                 await self.handler(client)
         except Exception as e:
             logger.error(f"Error in handler for {ws.remote_address}: {e}")
         finally:
+            self.clients.discard(client)
             logger.info(f"Connection disconnected: {ws.remote_address}")
 
     async def __aenter__(self):
         logger.info(f"NapCat Server listening on {self.host}:{self.port}")
-        self._server = await serve(self._handle_connection, self.host, self.port)
+        self._server = await serve(
+            self._handle_connection, self.host, self.port, max_size=MAX_FRAME_SIZE
+        )
+        if self.exporter:
+            await self.exporter.start()
         return self
 
     async def __aexit__(
@@ -74,6 +126,8 @@ class ReverseWebSocketServer:
         await self.close()
 
     async def close(self):
+        if self.exporter:
+            await self.exporter.close()
         if self._server:
             self._server.close()
             await self._server.wait_closed()
@@ -68,6 +68,8 @@ from .messages import (
 
 from .messages import MessageSegment, UnknownMessageSegment
 
+from .utils import ValidationMode, get_validation_mode, set_validation_mode, validation_mode
+
 __all__ = [
     # events (most used)
     # Base
@@ -138,4 +140,9 @@ __all__ = [
     "MessageText",
     "MessageVideo",
     "MessageSegmentType",
+    # validation
+    "ValidationMode",
+    "get_validation_mode",
+    "set_validation_mode",
+    "validation_mode",
 ]
@@ -1,11 +1,11 @@
 # src/napcat/types/events/message.py
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Any, Literal, cast
+from dataclasses import dataclass, field, fields
+from typing import Any, ClassVar, Literal, cast
 
 from ..messages import MessageSegment, MessageText, MessageReply, MessageAt, Model as MessageSegmentType
-from ..utils import IgnoreExtraArgsMixin, TypeValidatorMixin
+from ..utils import IgnoreExtraArgsMixin, TypeValidatorMixin, get_validation_mode, validation_mode
 from .base import NapCatEvent
 
 
@@ -40,12 +40,30 @@ class MessageEvent(NapCatEvent):
     
     # 子类型，对应文档：friend, group (临时), normal (群普通)
     sub_type: Literal["friend", "group", "normal"] | str | None = None
+
+    # SDK 扩展字段：断线重连后通过历史消息接口补发的事件为 True
+    backfilled: bool = False
     
     post_type: Literal["message", "message_sent"]
     _post_type = ("message", "message_sent")
 
+    # 收到的原始 message 数组 (relay 原样转发、惰性解码使用)
+    _message_data: list[dict[str, Any]] | None = field(
+        init=False, repr=False, hash=False, compare=False, default=None
+    )
+
+    _lazy_classes: ClassVar[dict[str, type[PrivateMessageEvent] | type[GroupMessageEvent]]] = {}
+
     @classmethod
-    def from_dict(cls, data: dict[str, Any]) -> PrivateMessageEvent | GroupMessageEvent:
+    def from_dict(
+        cls, data: dict[str, Any], lazy: bool = False
+    ) -> PrivateMessageEvent | GroupMessageEvent:
+        """
+        :param lazy: 为 True 时 message 推迟到首次访问才解码 (之后缓存)，
+            只读取 raw_message / group_id / user_id / sender 等字段的处理器可省去消息段的解码开销。
+            sender 与其余字段照常解码校验，格式错误时与普通解码一样抛出异常；
+            但格式错误的消息段要到首次访问 message 时才抛出 TypeError / ValueError
+        """
         msg_type = data.get("message_type")
         raw_segments = data.get("message", [])
         
@@ -53,18 +71,31 @@ class MessageEvent(NapCatEvent):
             # 容错处理：如果 format 是 string，可能这里还是 string，虽然 OneBot11 推荐 array
             raw_segments = [] 
 
+        if lazy:
+            lazy_cls = cls._lazy_classes.get(cast(str, msg_type))
+            if lazy_cls is None:
+                raise ValueError(f"Unknown message type: {msg_type}")
+            event = lazy_cls._from_dict(data | {"sender": MessageSender.from_dict(data.get("sender", {}))})
+            object.__setattr__(event, "_message_data", raw_segments)
+            # 推迟的解码沿用此刻 (客户端) 的校验模式，而不是首次访问时所处上下文的模式
+            object.__setattr__(event, "_mode", get_validation_mode())
+            return event
+
         # 构建基础数据
         new_data = data | {
             "message": tuple(MessageSegment.from_dict(seg) for seg in cast(list[dict[str, Any]], raw_segments)),
             "sender": MessageSender.from_dict(data.get("sender", {})),
         }
 
+        event: PrivateMessageEvent | GroupMessageEvent
         if msg_type == "group":
-            return GroupMessageEvent._from_dict(new_data)
+            event = GroupMessageEvent._from_dict(new_data)
         elif msg_type == "private":
-            return PrivateMessageEvent._from_dict(new_data)
-
-        raise ValueError(f"Unknown message type: {msg_type}")
+            event = PrivateMessageEvent._from_dict(new_data)
+        else:
+            raise ValueError(f"Unknown message type: {msg_type}")
+        object.__setattr__(event, "_message_data", raw_segments)
+        return event
     
     async def send_msg(self, message: str | list[MessageSegmentType]) -> int:
         raise NotImplementedError("send_msg must be implemented in subclasses")
@@ -74,14 +105,52 @@ class MessageEvent(NapCatEvent):
             raise RuntimeError("Event not bound to a client")
         
         if isinstance(message, str):
-            message = [MessageText(text=message)]
+            message = [MessageText.unchecked(text=message)]
 
-        segments: list[MessageSegmentType] = [MessageReply(id=str(self.message_id))]
+        segments: list[MessageSegmentType] = [MessageReply.unchecked(id=str(self.message_id))]
         if at:
-            segments.append(MessageAt(qq=str(self.user_id)))
+            segments.append(MessageAt.unchecked(qq=str(self.user_id)))
         
         return await self.send_msg(segments + message)
 
+    async def relay(
+        self,
+        *,
+        group_id: int | None = None,
+        user_id: int | None = None,
+        prepend: str | list[MessageSegmentType] | None = None,
+        append: str | list[MessageSegmentType] | None = None,
+    ) -> int:
+        """
+        将本条消息原样转发到指定群或私聊，返回新消息 ID。
+
+        直接复用收到的原始 message 数组，不经过消息段的解码与重新编码；
+        prepend / append 会拼接在原消息的前后。
+        注意 reply 等引用类消息段中的 ID 只在原会话内有效。
+        """
+        if self._client is None:
+            raise RuntimeError("Event not bound to a client")
+        if (group_id is None) == (user_id is None):
+            raise ValueError("Exactly one of group_id or user_id is required")
+
+        raw: list[Any] = self._message_data if self._message_data is not None else list(self.message)
+        if prepend or append:
+            raw = [*_as_segments(prepend), *raw, *_as_segments(append)]
+
+        if group_id is not None:
+            resp = await self._client.call_action("send_group_msg", {"group_id": group_id, "message": raw})
+        else:
+            resp = await self._client.call_action("send_private_msg", {"user_id": user_id, "message": raw})
+        return cast(dict[str, Any], resp)["message_id"]
+
+
+def _as_segments(message: str | list[MessageSegmentType] | None) -> list[MessageSegmentType]:
+    if not message:
+        return []
+    if isinstance(message, str):
+        return [MessageText.unchecked(text=message)]
+    return message
+
 
 @dataclass(slots=True, frozen=True, kw_only=True)
 class PrivateMessageEvent(MessageEvent):
@@ -116,3 +185,73 @@ class GroupMessageEvent(MessageEvent):
             group_id=int(self.group_id),
             message=message
         )
+
+
+# --- 惰性解码 ---
+# 惰性子类不覆盖 message 字段，解码时只把这个 slot 留空 (见 _deferred_fields)；
+# 首次读取时落到 __getattr__，按构造时记录的校验模式解码并写回 slot。
+# 字段本身仍可照常读写，replace / copy / pickle 与 isinstance / match GroupMessageEvent() 等不受影响。
+
+_MESSAGE_SLOT = MessageEvent.__dict__["message"]
+_DEFERRED_FIELDS = frozenset({"message"})
+
+
+def _lazy_getattr(self: MessageEvent, name: str) -> Any:
+    # 只在 slot 尚未填充时才会被调用
+    if name != "message":
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+    with validation_mode(getattr(self, "_mode", None)):
+        value = tuple(MessageSegment.from_dict(seg) for seg in self._message_data or ())
+    _MESSAGE_SLOT.__set__(self, value)
+    return value
+
+
+def _eager_class(self: MessageEvent) -> type[MessageEvent]:
+    # 惰性子类直接继承对应的普通事件类
+    return cast(type[MessageEvent], type(self).__base__)
+
+
+def _compare_key(event: MessageEvent) -> tuple[Any, ...]:
+    return tuple(getattr(event, f.name) for f in fields(event) if f.compare)
+
+
+def _lazy_eq(self: MessageEvent, other: object) -> bool:
+    # dataclass 生成的 __eq__ 要求类型完全相同；惰性事件与对应的普通事件按字段比较
+    if type(other) is not type(self) and type(other) is not _eager_class(self):
+        return NotImplemented
+    return _compare_key(self) == _compare_key(cast(MessageEvent, other))
+
+
+def _lazy_reduce(self: MessageEvent) -> tuple[Any, ...]:
+    # 按对应的普通事件类序列化 (state 中 message 已解码)，反序列化得到普通事件
+    return _rebuild_event, (_eager_class(self), self.__getstate__())
+
+
+def _rebuild_event(cls: type[MessageEvent], state: Any) -> MessageEvent:
+    event = object.__new__(cls)
+    cast(Any, event).__setstate__(state)
+    return event
+
+
+class LazyPrivateMessageEvent(PrivateMessageEvent):
+    __slots__ = ("_mode",)
+    _deferred_fields = _DEFERRED_FIELDS
+    __getattr__ = _lazy_getattr
+    __eq__ = _lazy_eq
+    __hash__ = PrivateMessageEvent.__hash__
+    __reduce__ = _lazy_reduce
+
+
+class LazyGroupMessageEvent(GroupMessageEvent):
+    __slots__ = ("_mode",)
+    _deferred_fields = _DEFERRED_FIELDS
+    __getattr__ = _lazy_getattr
+    __eq__ = _lazy_eq
+    __hash__ = GroupMessageEvent.__hash__
+    __reduce__ = _lazy_reduce
+
+
+MessageEvent._lazy_classes.update(
+    private=LazyPrivateMessageEvent,
+    group=LazyGroupMessageEvent,
+)
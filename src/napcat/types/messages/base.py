@@ -8,6 +8,7 @@ from typing import (
     ClassVar,
     Literal,
     LiteralString,
+    Self,
     TypedDict,
     cast,
     get_type_hints,
@@ -15,7 +16,7 @@ from typing import (
     get_origin,   # <--- 新增
 )
 
-from ..utils import IgnoreExtraArgsMixin, TypeValidatorMixin
+from ..utils import IgnoreExtraArgsMixin, TypeValidatorMixin, _trusted_decoder_for
 
 
 @lru_cache(maxsize=256)
@@ -51,6 +52,8 @@ class MessageSegment(ABC):
     data: SegmentDataBase
 
     _data_class: ClassVar[builtins.type[SegmentDataBase]]
+    # 类创建时从 Literal 注解解析出的 type 值，构造实例时不再反射
+    _type_tag: ClassVar[str | None] = None
     _registry: ClassVar[dict[str, builtins.type[MessageSegment]]] = {}
 
     def __init_subclass__(cls, **kwargs: Any):
@@ -93,6 +96,8 @@ class MessageSegment(ABC):
         if type_val is _MISSING or not isinstance(type_val, str):
             return
 
+        cls._type_tag = type_val
+
         # 3. 注册逻辑 (带 slots 兼容)
         if type_val in MessageSegment._registry:
             existing_cls = MessageSegment._registry[type_val]
@@ -108,39 +113,37 @@ class MessageSegment(ABC):
         MessageSegment._registry[type_val] = cls
 
     def __init__(self, **kwargs: Any):
-        # 从类型注解的 Literal 中提取 type 值
-        hints = _cached_get_type_hints(self.__class__)
-        type_hint = hints.get("type")
-        type_val = None
-        
-        if type_hint and get_origin(type_hint) is Literal:
-            args = get_args(type_hint)
-            if args and isinstance(args[0], str):
-                type_val = args[0]
-        
-        # 如果无法从 Literal 提取，尝试从字段默认值获取
+        cls = self.__class__
+        type_val = cls._type_tag
         if type_val is None:
-            type_field = self.__class__.__dataclass_fields__["type"]
-            if type_field.default is not MISSING:
-                type_val = type_field.default
-            elif type_field.default_factory is not MISSING:
-                type_val = type_field.default_factory()
-        
-        if type_val is None:
-            raise ValueError(
-                f"Class {self.__class__.__name__} has no default type value"
-            )
-        
+            type_val = cls._resolve_type_default()
+
         object.__setattr__(self, "type", type_val)
+        object.__setattr__(self, "data", cls._data_class.from_dict(kwargs))
 
-        data_cls = self.__class__._data_class
-        if not data_cls:
-            raise ValueError(
-                f"Class {self.__class__.__name__} missing type hint for 'data'"
-            )
+    @classmethod
+    def unchecked(cls, **kwargs: Any) -> Self:
+        """
+        发送路径的快速构造：跳过 data 字段的类型校验，
+        适用于参数由代码自身生成、类型已知正确的消息段 (如 MessageText.unchecked(text=s))
+        """
+        type_val = cls._type_tag
+        if type_val is None:
+            type_val = cls._resolve_type_default()
+        seg = object.__new__(cls)
+        object.__setattr__(seg, "type", type_val)
+        object.__setattr__(seg, "data", _trusted_decoder_for(cls._data_class)(kwargs))
+        return seg
 
-        data_inst = data_cls.from_dict(kwargs)
-        object.__setattr__(self, "data", data_inst)
+    @classmethod
+    def _resolve_type_default(cls) -> str:
+        # 没有 Literal 注解的子类，尝试从字段默认值获取
+        type_field = cls.__dataclass_fields__["type"]
+        if type_field.default is not MISSING:
+            return cast(str, type_field.default)
+        if type_field.default_factory is not MISSING:
+            return cast(str, type_field.default_factory())
+        raise ValueError(f"Class {cls.__name__} has no default type value")
 
     @classmethod
     def from_dict(cls, raw: dict[str, Any]) -> MessageSegment:
@@ -159,7 +162,11 @@ class MessageSegment(ABC):
                 type=seg_type, data=UnknownData(raw=data_payload)
             )
 
-        return target_cls(**data_payload)
+        # 注册表的键就是该类的 type 值，直接构造，跳过 __init__ 中的类型注解反射
+        seg = object.__new__(target_cls)
+        object.__setattr__(seg, "type", seg_type)
+        object.__setattr__(seg, "data", target_cls._data_class.from_dict(data_payload))
+        return seg
 
 
 @dataclass(slots=True, frozen=True, kw_only=True)
@@ -1,11 +1,16 @@
+import logging
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import MISSING, Field, fields
 from enum import Enum
 from functools import lru_cache
-from types import UnionType
+from types import MemberDescriptorType, UnionType
 from typing import (
     Annotated,
     Any,
     ClassVar,
+    cast,
     Final,
     Literal,
     LiteralString,
@@ -17,6 +22,9 @@ from typing import (
 )
 
 
+logger = logging.getLogger("napcat.types")
+
+
 @runtime_checkable
 class DataclassProtocol(Protocol):
     __dataclass_fields__: ClassVar[dict[str, Any]]
@@ -27,27 +35,32 @@ def _cache_cls_fields(cls: type[DataclassProtocol]) -> tuple[Field[Any], ...]:
     return fields(cls)
 
 
+def _reflective_from_dict[T: DataclassProtocol](cls: type[T], data: dict[str, Any]) -> T:
+    """通用的反射式解码，也用于生成缺失字段的错误信息"""
+    cls_fields = {f.name: f for f in _cache_cls_fields(cls) if f.init}
+    valid_args = {k: v for k, v in data.items() if k in cls_fields}
+
+    missing_fields: list[str] = []
+    for name, field in cls_fields.items():
+        if name not in valid_args:
+            if field.default is MISSING and field.default_factory is MISSING:
+                missing_fields.append(name)
+
+    if missing_fields:
+        raise ValueError(
+            f"Failed to parse {cls.__name__}: Missing required fields {missing_fields}. "
+            f"Input data: {data}"
+        )
+
+    return cls(**valid_args)
+
+
 class IgnoreExtraArgsMixin:
     __slots__ = ()
 
     @classmethod
     def from_dict[T: DataclassProtocol](cls: type[T], data: dict[str, Any]) -> T:
-        cls_fields = {f.name: f for f in _cache_cls_fields(cls) if f.init}
-        valid_args = {k: v for k, v in data.items() if k in cls_fields}
-
-        missing_fields: list[str] = []
-        for name, field in cls_fields.items():
-            if name not in valid_args:
-                if field.default is MISSING and field.default_factory is MISSING:
-                    missing_fields.append(name)
-
-        if missing_fields:
-            raise ValueError(
-                f"Failed to parse {cls.__name__}: Missing required fields {missing_fields}. "
-                f"Input data: {data}"
-            )
-
-        return cls(**valid_args)
+        return _decoder_for(cls)(data)
 
     @classmethod
     def _from_dict[T: DataclassProtocol](cls: type[T], data: dict[str, Any]) -> T:
@@ -153,16 +166,19 @@ class TypeValidatorMixin:
         if callable(super_post):
             super_post()
 
-        self.validate_types()
+        _validator_for(self.__class__)(self)
 
     def validate_types(self) -> None:
+        """反射式的完整校验，失败时给出所有字段的错误信息"""
         cls = self.__class__
         hints = _cached_type_hints(cls)
 
+        deferred = _deferred_fields(cls)
         errors: list[str] = []
         for f in _cache_cls_fields(cls):
             name = f.name
-            if name not in hints:
+            if name not in hints or name in deferred:
+                # 推迟填充的字段 (如惰性解码) 不在此处触发
                 continue
 
             expected = hints[name]
@@ -178,3 +194,311 @@ class TypeValidatorMixin:
             raise TypeError(
                 f"{cls.__name__} type validation failed:\n- " + "\n- ".join(errors)
             )
+
+
+# ---------------------------------------------------------------------------
+# 校验模式
+# ---------------------------------------------------------------------------
+
+type ValidationFailureHook = Callable[[Any, TypeError], None]
+
+_OFF, _SAMPLED, _STRICT = 0, 1, 2
+_LEVELS = {"off": _OFF, "sampled": _SAMPLED, "strict": _STRICT}
+
+
+def _log_validation_failure(obj: Any, error: TypeError) -> None:
+    logger.warning(f"Sampled validation failed: {error}")
+
+
+class ValidationMode:
+    """
+    字段类型校验模式：
+    - "strict": 每个对象都校验，失败抛出 TypeError (默认，与原行为一致)
+    - "sampled": 每 sample_rate 个对象校验一个，失败不抛出，而是交给 on_failure
+    - "off": 完全跳过校验
+    """
+
+    __slots__ = ("mode", "sample_rate", "on_failure", "level", "countdown")
+
+    def __init__(
+        self,
+        mode: Literal["strict", "sampled", "off"] = "strict",
+        sample_rate: int = 100,
+        on_failure: ValidationFailureHook | None = None,
+    ):
+        if mode not in _LEVELS:
+            raise ValueError(f"Unknown validation mode: {mode!r}")
+        if sample_rate <= 0:
+            raise ValueError("sample_rate must be positive")
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.on_failure = on_failure or _log_validation_failure
+        self.level = _LEVELS[mode]
+        # 采样倒计时，归零时校验一次；由生成的校验代码内联递减
+        self.countdown = 1
+
+    def __repr__(self) -> str:
+        return f"ValidationMode({self.mode!r}, sample_rate={self.sample_rate})"
+
+    def sample(self) -> bool:
+        self.countdown -= 1
+        if self.countdown:
+            return False
+        self.countdown = self.sample_rate
+        return True
+
+
+_global_mode = ValidationMode()
+_mode_var: ContextVar[ValidationMode | None] = ContextVar("napcat_validation_mode", default=None)
+
+
+def _current_mode() -> ValidationMode:
+    return _mode_var.get() or _global_mode
+
+
+def get_validation_mode() -> ValidationMode:
+    return _current_mode()
+
+
+def set_validation_mode(mode: ValidationMode | Literal["strict", "sampled", "off"]) -> None:
+    """设置全局校验模式；NapCatClient(validation=...) 可为单个客户端覆盖"""
+    global _global_mode
+    _global_mode = ValidationMode(mode) if isinstance(mode, str) else mode
+
+
+@contextmanager
+def validation_mode(mode: ValidationMode | None) -> Iterator[None]:
+    """在当前上下文内临时使用指定的校验模式，None 表示沿用全局模式"""
+    token = _mode_var.set(mode)
+    try:
+        yield
+    finally:
+        _mode_var.reset(token)
+
+
+def _validation_failed(obj: Any, mode: ValidationMode) -> None:
+    if mode.level == _STRICT:
+        obj.validate_types()
+        return
+    try:
+        obj.validate_types()
+    except TypeError as e:
+        mode.on_failure(obj, e)
+
+
+# ---------------------------------------------------------------------------
+# 编译式解码 / 校验
+#
+# 反射式的 from_dict + validate_types 在每个对象上都要遍历字段、调用
+# get_origin/get_args。这里为每个 dataclass 生成一次专用的直线代码
+# (首次使用时编译并缓存)，语义与反射版本保持一致：
+# - 缺字段 / 类型不符时回落到反射版本，以得到完全相同的异常信息
+# - 是否执行校验由当前的 ValidationMode 决定
+# - 无法静态展开的类型构造 (type[T]、Enum 等) 仍调用 _shallow_isinstance
+# ---------------------------------------------------------------------------
+
+type Decoder[T] = Callable[[dict[str, Any]], T]
+type Validator = Callable[[Any], None]
+
+_DECODERS: dict[type, Decoder[Any]] = {}
+_TRUSTED_DECODERS: dict[type, Decoder[Any]] = {}
+_VALIDATORS: dict[type, Validator] = {}
+
+
+def _check_expr(var: str, expected: Any, ns: dict[str, Any]) -> str | None:
+    """生成与 _shallow_isinstance(var, expected) 等价的表达式；None 表示恒为真"""
+    expected = _strip_wrappers(expected)
+
+    if expected is Any or expected is object:
+        return None
+    if expected is LiteralString:
+        return f"isinstance({var}, str)"
+
+    origin = get_origin(expected)
+
+    if origin is Literal:
+        # (值, 类型) 成对比较，等价于 _literal_matches 的严格匹配
+        name = _bind(ns, frozenset((v, type(v)) for v in get_args(expected)))
+        return f"({var}, type({var})) in {name}"
+
+    if origin is UnionType:
+        parts = [_check_expr(var, opt, ns) for opt in get_args(expected)]
+        if any(p is None for p in parts):
+            return None
+        return "(" + " or ".join(cast(list[str], parts)) + ")"
+
+    if origin is type or (isinstance(expected, type) and issubclass(expected, Enum)):
+        return f"_shallow_isinstance({var}, {_bind(ns, expected)})"
+
+    if origin is not None:
+        if isinstance(origin, type):
+            return f"isinstance({var}, {_bind(ns, origin)})"
+        return None
+
+    if isinstance(expected, type):
+        return f"isinstance({var}, {_bind(ns, expected)})"
+
+    return None
+
+
+def _bind(ns: dict[str, Any], value: Any) -> str:
+    name = f"_c{len(ns)}"
+    ns[name] = value
+    return name
+
+
+def _checks_for(
+    cls: type,
+    ns: dict[str, Any],
+    var_of: Callable[[str], str],
+    skip: frozenset[str] = frozenset(),
+) -> list[str]:
+    hints = _cached_type_hints(cls)
+    checks: list[str] = []
+    for f in _cache_cls_fields(cast(type[DataclassProtocol], cls)):
+        if f.name in skip:
+            continue
+        if f.name in hints and (expr := _check_expr(var_of(f.name), hints[f.name], ns)):
+            checks.append(expr)
+    return checks
+
+
+def _check_block(checks: list[str], target: str) -> list[str]:
+    return [
+        "    m = _mode()",
+        "    if m.level == 1:",
+        "        m.countdown -= 1",
+        "        check = not m.countdown",
+        "        if check: m.countdown = m.sample_rate",
+        "    else:",
+        "        check = m.level == 2",
+        "    if check:",
+        "        try:",
+        f"            ok = {' and '.join(checks)}",
+        "        except TypeError:",
+        "            ok = False",
+        "        if not ok:",
+        f"            _failed({target}, m)",
+    ]
+
+
+def _compile(name: str, lines: list[str], ns: dict[str, Any]) -> Any:
+    exec("\n".join(lines), ns)
+    return ns[name]
+
+
+def _validator_for(cls: type) -> Validator:
+    if (validator := _VALIDATORS.get(cls)) is not None:
+        return validator
+
+    ns: dict[str, Any] = {
+        "_shallow_isinstance": _shallow_isinstance,
+        "_mode": _current_mode,
+        "_failed": _validation_failed,
+    }
+    checks = _checks_for(cls, ns, lambda n: f"obj.{n}")
+    lines = ["def __validate(obj):"]
+    if checks:
+        lines += _check_block(checks, "obj")
+    else:
+        lines.append("    pass")
+    validator = _compile("__validate", lines, ns)
+    _VALIDATORS[cls] = validator
+    return validator
+
+
+def _deferred_fields(cls: type) -> frozenset[str]:
+    """类属性 _deferred_fields 列出的字段解码时留空，由类自己在首次访问时填充 (如惰性解码)"""
+    return getattr(cls, "_deferred_fields", frozenset())
+
+
+def _can_compile(cls: type) -> bool:
+    # 自定义了 __init__ / __post_init__ 的类无法安全地绕过构造函数
+    if not getattr(cls, "__dataclass_params__").init:
+        return False
+    if getattr(cls, "__post_init__", None) not in (None, TypeValidatorMixin.__post_init__):
+        return False
+    for f in _cache_cls_fields(cast(type[DataclassProtocol], cls)):
+        if not f.init and f.default is MISSING and f.default_factory is MISSING:
+            return False
+    return True
+
+
+def _decoder_for[T](cls: type[T]) -> Decoder[T]:
+    if (decoder := _DECODERS.get(cls)) is not None:
+        return decoder
+    if not _can_compile(cls):
+        decoder = lambda data: _reflective_from_dict(cast(Any, cls), data)  # noqa: E731
+    else:
+        decoder = _compile_decoder(cls)
+    _DECODERS[cls] = decoder
+    return decoder
+
+
+def _trusted_decoder_for[T](cls: type[T]) -> Decoder[T]:
+    """不做类型校验的解码器，仅用于调用方自己构造、已知可信的数据 (如发出的消息段)"""
+    if (decoder := _TRUSTED_DECODERS.get(cls)) is not None:
+        return decoder
+    decoder = _compile_decoder(cls, validate=False) if _can_compile(cls) else _decoder_for(cls)
+    _TRUSTED_DECODERS[cls] = decoder
+    return decoder
+
+
+def _compile_decoder[T](cls: type[T], validate: bool = True) -> Decoder[T]:
+    ns: dict[str, Any] = {
+        "_cls": cls,
+        "_new": object.__new__,
+        "_MISSING": MISSING,
+        "_shallow_isinstance": _shallow_isinstance,
+        "_missing": lambda data: _reflective_from_dict(cast(Any, cls), data),
+        "_mode": _current_mode,
+        "_failed": _validation_failed,
+    }
+    cls_fields = _cache_cls_fields(cast(type[DataclassProtocol], cls))
+    var = {f.name: f"v{i}" for i, f in enumerate(cls_fields)}
+    deferred = _deferred_fields(cls)
+
+    required: list[str] = []
+    optional: list[str] = []
+    assigns: list[str] = []
+    for f in cls_fields:
+        if f.name in deferred:
+            continue
+        v = var[f.name]
+        if f.init and f.default is MISSING and f.default_factory is MISSING:
+            required.append(f"        {v} = data[{f.name!r}]")
+        elif f.default is not MISSING:
+            default = _bind(ns, f.default)
+            optional.append(
+                f"    {v} = get({f.name!r}, {default})" if f.init else f"    {v} = {default}"
+            )
+        else:
+            factory = _bind(ns, f.default_factory)
+            if f.init:
+                optional.append(f"    {v} = get({f.name!r}, _MISSING)")
+                optional.append(f"    if {v} is _MISSING: {v} = {factory}()")
+            else:
+                optional.append(f"    {v} = {factory}()")
+
+        # slots 类直接调用成员描述符的 __set__，绕过 frozen 的 __setattr__
+        desc = getattr(cls, f.name, None)
+        if isinstance(desc, MemberDescriptorType):
+            assigns.append(f"    {_bind(ns, desc.__set__)}(obj, {v})")
+        else:
+            assigns.append(f"    object.__setattr__(obj, {f.name!r}, {v})")
+
+    lines = ["def __decode(data):", "    get = data.get"]
+    if required:
+        lines += ["    try:", *required, "    except KeyError:", "        return _missing(data)"]
+    lines += optional
+    lines.append("    obj = _new(_cls)")
+    lines += assigns
+
+    checks = _checks_for(cls, ns, var.__getitem__, deferred)
+    if validate and TypeValidatorMixin in cls.__mro__ and checks:
+        lines += _check_block(checks, "obj")
+    lines.append("    return obj")
+    decoder = _compile("__decode", lines, ns)
+    suffix = "from_dict" if validate else "trusted_from_dict"
+    decoder.__qualname__ = f"{cls.__qualname__}.__compiled_{suffix}"
+    return decoder
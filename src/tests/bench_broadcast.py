@@ -0,0 +1,108 @@
+# tests/bench_broadcast.py
+"""
+事件扇出微基准：旧版 per-subscriber Queue 扇出 vs 共享环形缓冲。
+分别测量发布 + 全部订阅者消费完的吞吐，以及所有订阅者积压满时的内存占用。
+
+uv run src/tests/bench_broadcast.py
+"""
+import asyncio
+import time
+import tracemalloc
+from asyncio import Queue
+from typing import Any
+
+from napcat.broadcast import EventRing
+
+N_ITEMS = 50_000
+BATCH = 100
+CAPACITY = 500
+
+
+class LegacyFanout:
+    """原 Connection._broadcast / events() 的等价实现"""
+
+    _STOP = object()
+
+    def __init__(self):
+        self._queues: set[Queue[Any]] = set()
+
+    def subscribe(self) -> Queue[Any]:
+        q: Queue[Any] = Queue(maxsize=CAPACITY)
+        self._queues.add(q)
+        return q
+
+    def publish(self, item: Any):
+        for q in list(self._queues):
+            if q.full():
+                try:
+                    q.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            try:
+                q.put_nowait(item)
+            except Exception:
+                pass
+
+    def close(self):
+        self.publish(self._STOP)
+
+
+async def drain_legacy(q: Queue[Any]) -> int:
+    n = 0
+    while (await q.get()) is not LegacyFanout._STOP:
+        n += 1
+    return n
+
+
+async def drain_ring(ring: EventRing[Any]) -> int:
+    n = 0
+    async for _ in ring.subscribe():
+        n += 1
+    return n
+
+
+async def throughput(kind: str, subscribers: int) -> float:
+    hub: Any = LegacyFanout() if kind == "queue" else EventRing(CAPACITY)
+    if kind == "queue":
+        tasks = [asyncio.create_task(drain_legacy(hub.subscribe())) for _ in range(subscribers)]
+    else:
+        tasks = [asyncio.create_task(drain_ring(hub)) for _ in range(subscribers)]
+    await asyncio.sleep(0)
+    item = {"post_type": "message"}
+    start = time.perf_counter()
+    for i in range(N_ITEMS):
+        hub.publish(item)
+        if i % BATCH == 0:
+            await asyncio.sleep(0)
+    hub.close()
+    counts = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    assert all(c == N_ITEMS for c in counts), counts
+    return N_ITEMS / elapsed
+
+
+async def memory(kind: str, subscribers: int) -> int:
+    tracemalloc.start()
+    hub: Any = LegacyFanout() if kind == "queue" else EventRing(CAPACITY)
+    subs = [hub.subscribe() for _ in range(subscribers)]
+    item = {"post_type": "message"}
+    for _ in range(CAPACITY):
+        hub.publish(item)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del subs
+    return size
+
+
+async def main():
+    print(f"{'subscribers':>11} | {'queue ev/s':>12} | {'ring ev/s':>12} | {'queue mem':>10} | {'ring mem':>10}")
+    for n in (1, 4, 16, 64):
+        q_tp = await throughput("queue", n)
+        r_tp = await throughput("ring", n)
+        q_mem = await memory("queue", n)
+        r_mem = await memory("ring", n)
+        print(f"{n:>11} | {q_tp:>12,.0f} | {r_tp:>12,.0f} | {q_mem / 1024:>7,.1f} KB | {r_mem / 1024:>7,.1f} KB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
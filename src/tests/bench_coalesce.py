@@ -0,0 +1,85 @@
+# tests/bench_coalesce.py
+"""
+单飞合并：同一个群瞬间涌入 200 条消息，200 个处理函数同时调用 get_group_info(group_id=X)。
+对比 coalesce 关闭 / 开启时实际发出的请求数与整批完成耗时 (假连接每个请求耗时 5 ms，串行处理，
+模拟 NapCat 逐个处理请求)；另给出无并发时单次只读调用的端到端耗时，衡量合并带来的额外开销。
+
+uv run src/tests/bench_coalesce.py
+"""
+import asyncio
+import time
+
+import orjson
+from bench_utils import FakeWebSocket
+
+from napcat import NapCatClient
+from napcat.connection import Connection
+
+HANDLERS = 200
+SERVICE_TIME = 0.005
+SEQUENTIAL = 20_000
+
+
+class SerialWebSocket(FakeWebSocket):
+    """按到达顺序逐个处理请求，每个耗时 SERVICE_TIME"""
+
+    def __init__(self, service_time: float):
+        super().__init__()
+        self.service_time = service_time
+        self._queue: asyncio.Queue[dict] = asyncio.Queue()
+        self._worker = asyncio.ensure_future(self._serve())
+
+    async def send(self, data: bytes | str) -> None:
+        self.sent += 1
+        self._queue.put_nowait(orjson.loads(data))
+
+    async def _serve(self) -> None:
+        while True:
+            req = await self._queue.get()
+            if self.service_time:
+                await asyncio.sleep(self.service_time)
+            data = {"group_id": req["params"].get("group_id"), "group_name": "Bench Group", "member_count": 500}
+            self.feed({"status": "ok", "retcode": 0, "data": data, "echo": req["echo"]})
+
+    async def close(self) -> None:
+        self._worker.cancel()
+        await super().close()
+
+
+async def burst(coalesce: bool) -> tuple[int, float]:
+    ws = SerialWebSocket(SERVICE_TIME)
+    conn = Connection(ws)  # type: ignore[arg-type]
+    client = NapCatClient(coalesce=coalesce, _existing_conn=conn)
+    async with conn:
+        start = time.perf_counter()
+        await asyncio.gather(*(client.api.get_group_info(group_id=10001) for _ in range(HANDLERS)))
+        elapsed = time.perf_counter() - start
+        await ws.close()
+    return ws.sent, elapsed
+
+
+async def sequential(coalesce: bool) -> float:
+    ws = SerialWebSocket(0)
+    conn = Connection(ws)  # type: ignore[arg-type]
+    client = NapCatClient(coalesce=coalesce, _existing_conn=conn)
+    async with conn:
+        start = time.perf_counter()
+        for _ in range(SEQUENTIAL):
+            await client.api.get_group_info(group_id=10001)
+        elapsed = time.perf_counter() - start
+        await ws.close()
+    return elapsed / SEQUENTIAL * 1e6
+
+
+async def main():
+    print(f"{HANDLERS} concurrent get_group_info(group_id=10001), {SERVICE_TIME * 1000:.0f} ms per request on the server")
+    for coalesce in (False, True):
+        sent, elapsed = await burst(coalesce)
+        print(f"  coalesce={coalesce!s:5}: {sent:4} requests sent, burst done in {elapsed * 1000:7.1f} ms")
+    print(f"uncontended calls ({SEQUENTIAL}, no server delay)")
+    for coalesce in (False, True):
+        print(f"  coalesce={coalesce!s:5}: {await sequential(coalesce):6.1f} us/call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+# tests/bench_decode.py
+"""
+事件解码基准：编译式解码器 vs 反射式 from_dict + validate_types，
+以及惰性消息段解码 (只读 raw_message 的处理器) 的耗时与内存。
+
+uv run src/tests/bench_decode.py
+"""
+import timeit
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from bench_utils import group_message_frame
+
+from napcat import NapCatEvent
+from napcat.types import MessageEvent
+from napcat.types import utils
+from napcat.types.utils import TypeValidatorMixin
+
+N = 20_000
+
+
+@contextmanager
+def reflective() -> Iterator[None]:
+    """临时切回反射式的解码与校验实现"""
+    decoder_for, validator_for = utils._decoder_for, utils._validator_for
+
+    def reflective_decoder(cls: type) -> Any:
+        return lambda data: utils._reflective_from_dict(cls, data)  # type: ignore[arg-type]
+
+    utils._decoder_for = reflective_decoder  # type: ignore[assignment]
+    utils._validator_for = lambda cls: TypeValidatorMixin.validate_types  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        utils._decoder_for, utils._validator_for = decoder_for, validator_for
+
+
+def per_call_us(frame: dict[str, Any], lazy: bool = False) -> float:
+    if lazy:
+        decode = lambda: MessageEvent.from_dict(frame, lazy=True).raw_message
+    else:
+        decode = lambda: NapCatEvent.from_dict(frame).raw_message  # type: ignore[attr-defined]
+    decode()
+    best = min(timeit.repeat(decode, number=N, repeat=5))
+    return best / N * 1e6
+
+
+def retained_bytes(frames: list[dict[str, Any]], lazy: bool) -> int:
+    """解码后保留下来的事件对象占用 (不含原始帧本身)"""
+    tracemalloc.start()
+    if lazy:
+        events = [MessageEvent.from_dict(f, lazy=True) for f in frames]
+    else:
+        events = [NapCatEvent.from_dict(f) for f in frames]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return size
+
+
+def main():
+    frame = group_message_frame()
+    with reflective():
+        slow = per_call_us(frame)
+    fast = per_call_us(frame)
+    print("GroupMessageEvent decode (5 segments)")
+    print(f"  reflective : {slow:8.2f} us/event")
+    print(f"  compiled   : {fast:8.2f} us/event")
+    print(f"  speedup    : {slow / fast:8.2f}x")
+
+    lazy = per_call_us(frame, lazy=True)
+    frames = [group_message_frame(i) for i in range(5_000)]
+    eager_mem = retained_bytes(frames, lazy=False)
+    lazy_mem = retained_bytes(frames, lazy=True)
+    print("\nraw_message-only handler (message never touched)")
+    print(f"  eager      : {fast:8.2f} us/event  {eager_mem / len(frames):8.0f} B/event")
+    print(f"  lazy       : {lazy:8.2f} us/event  {lazy_mem / len(frames):8.0f} B/event")
+    print(f"  speedup    : {fast / lazy:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# tests/bench_events.py
+"""
+事件分发吞吐基准：1 / 4 / 16 个 events() 订阅者时的 events/sec。
+
+uv run src/tests/bench_events.py
+"""
+import asyncio
+import time
+from typing import Any
+
+from bench_utils import FakeWebSocket, group_message_frame, login_responder
+
+from napcat import NapCatClient, NapCatEvent
+from napcat.connection import Connection
+
+N_EVENTS = 5_000
+
+
+async def run(subscribers: int, shared_decode: bool) -> tuple[float, int]:
+    ws = FakeWebSocket(login_responder)
+    conn = Connection(ws)  # type: ignore[arg-type]
+    async with NapCatClient(_existing_conn=conn):
+        if not shared_decode:
+            # 旧行为：每个订阅者各自解码原始 dict
+            conn.decoder = None
+        received = [0] * subscribers
+
+        async def consume(idx: int):
+            async for item in conn.events():
+                if not shared_decode:
+                    item = NapCatEvent.from_dict(item)
+                received[idx] += 1
+
+        tasks = [asyncio.create_task(consume(i)) for i in range(subscribers)]
+        await asyncio.sleep(0)
+        frames: list[Any] = [group_message_frame(i) for i in range(N_EVENTS)]
+        start = time.perf_counter()
+        for frame in frames:
+            ws.feed(frame)
+        # 关闭后订阅者会在消费完剩余事件后退出
+        await ws.close()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    return N_EVENTS / elapsed, subscribers * N_EVENTS - sum(received)
+
+
+async def main():
+    print(f"{'subscribers':>11} | {'per-subscriber decode':>22} | {'shared decode':>14} | dropped")
+    for n in (1, 4, 16):
+        legacy, legacy_dropped = await run(n, shared_decode=False)
+        shared, shared_dropped = await run(n, shared_decode=True)
+        print(
+            f"{n:>11} | {legacy:>17,.0f} ev/s | {shared:>9,.0f} ev/s | "
+            f"{legacy_dropped} / {shared_dropped}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
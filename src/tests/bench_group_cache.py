@@ -0,0 +1,116 @@
+# tests/bench_group_cache.py
+"""
+群资料查询量对比：机器人在 30 个群中，每条群消息打日志时查询一次 get_group_info 取群名，
+仪表盘每 100 ms 对所有群查询 get_group_info 取成员数；期间穿插进 / 退群与改名通知。
+分别在不开缓存与开启 GroupCache (时间尺度缩小：member_count 最长缓存 1 秒) 时运行 3 秒，
+统计实际发出的群资料类请求数，并核对缓存给出的群名与成员数是否与"服务端"一致。
+
+uv run src/tests/bench_group_cache.py
+"""
+import asyncio
+import random
+import time
+from typing import Any
+
+from bench_utils import FakeWebSocket, group_message_frame, login_responder
+
+from napcat import GroupCache, NapCatClient
+from napcat.connection import Connection
+
+GROUPS = 30
+DURATION = 3.0
+DASHBOARD_INTERVAL = 0.1
+MESSAGES_PER_SECOND = 200
+GROUP_ACTIONS = ("get_group_list", "get_group_info", "get_group_info_ex", "get_group_detail_info")
+
+
+class GroupServer:
+    """维护群资料的"服务端"状态，并按请求生成响应"""
+
+    def __init__(self):
+        self.groups = {
+            20_000 + g: {
+                "group_all_shut": 0,
+                "group_remark": "",
+                "group_id": 20_000 + g,
+                "group_name": f"群 {g}",
+                "member_count": 100 + g,
+                "max_member_count": 500,
+            }
+            for g in range(GROUPS)
+        }
+        self.requests: dict[str, int] = {}
+
+    def __call__(self, req: dict[str, Any]) -> list[dict[str, Any]]:
+        action = req["action"]
+        self.requests[action] = self.requests.get(action, 0) + 1
+        if action == "get_group_list":
+            data: Any = [dict(g) for g in self.groups.values()]
+        elif action == "get_group_info":
+            data = dict(self.groups[int(req["params"]["group_id"])])
+        else:
+            return login_responder(req)
+        return [{"status": "ok", "retcode": 0, "data": data, "echo": req["echo"]}]
+
+
+def notice(kind: str, group_id: int, **fields: Any) -> dict[str, Any]:
+    return {"time": int(time.time()), "self_id": 123456, "post_type": "notice", "group_id": group_id} | {
+        "notice_type": kind
+    } | fields
+
+
+async def run(cached: bool) -> tuple[int, int, int]:
+    rng = random.Random(7)
+    server = GroupServer()
+    ws = FakeWebSocket(server)
+    cache = GroupCache(max_age={"member_count": 1.0}, min_refresh_interval=0.5) if cached else False
+    client = NapCatClient(group_cache=cache, _existing_conn=Connection(ws))  # type: ignore[arg-type]
+    queries = 0
+    async with client:
+        start = time.monotonic()
+        next_dashboard = start
+        i = 0
+        while (now := time.monotonic()) - start < DURATION:
+            group_id = 20_000 + rng.randrange(GROUPS)
+            ws.feed(group_message_frame(i, group_id))
+            await client.api.get_group_info(group_id=group_id)
+            queries += 1
+            roll = rng.random()
+            if roll < 0.02:
+                server.groups[group_id]["member_count"] += 1
+                ws.feed(notice("group_increase", group_id, sub_type="approve", user_id=300_000 + i, operator_id=0))
+            elif roll < 0.04:
+                server.groups[group_id]["member_count"] -= 1
+                ws.feed(notice("group_decrease", group_id, sub_type="leave", user_id=300_000 + i, operator_id=0))
+            elif roll < 0.045:
+                server.groups[group_id]["group_name"] = name = f"新群名 {i}"
+                ws.feed(notice("notify", group_id, sub_type="group_name", user_id=222222, name_new=name))
+            if now >= next_dashboard:
+                next_dashboard += DASHBOARD_INTERVAL
+                for gid in server.groups:
+                    await client.api.get_group_info(group_id=gid)
+                    queries += 1
+            i += 1
+            await asyncio.sleep(1 / MESSAGES_PER_SECOND)
+        await asyncio.sleep(0.05)
+        wrong = 0
+        for gid, truth in server.groups.items():
+            info = await client.api.get_group_info(group_id=gid)
+            wrong += info["group_name"] != truth["group_name"] or info.get("member_count") != truth["member_count"]
+        await ws.close()
+    sent = sum(server.requests.get(a, 0) for a in GROUP_ACTIONS)
+    return queries, sent, wrong
+
+
+async def main():
+    print(f"{GROUPS} groups, {DURATION:.0f}s, ~{MESSAGES_PER_SECOND} msg/s + dashboard every {DASHBOARD_INTERVAL * 1000:.0f} ms")
+    results = {}
+    for cached in (False, True):
+        queries, sent, wrong = results[cached] = await run(cached)
+        label = "GroupCache" if cached else "no cache"
+        print(f"  {label:10}: {queries:6} queries -> {sent:6} group-info requests, {wrong} stale answers at end")
+    print(f"  reduction : {results[False][1] / results[True][1]:.0f}x fewer requests")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+# tests/bench_list_stream.py
+"""
+大列表响应的内存占用：3000 人群的 get_group_member_list，
+对比 call_action (整个响应解码为 dict 树) 与 iter_list 按字段投影后收集为记录列表，
+统计调用期间的 tracemalloc 峰值 (含原始帧本身) 与耗时。
+
+uv run src/tests/bench_list_stream.py
+"""
+import asyncio
+import time
+import tracemalloc
+from typing import Any, NamedTuple
+
+import orjson
+from bench_utils import FakeWebSocket
+
+from napcat import NapCatClient
+from napcat.connection import Connection
+
+MEMBERS = 3000
+
+
+class Member(NamedTuple):
+    user_id: int
+    card: str
+    role: str
+
+
+def member_list(n: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "group_id": 10001,
+            "user_id": 10_000_000 + i,
+            "nickname": f"成员{i}",
+            "card": f"群名片 {i}",
+            "sex": "unknown",
+            "age": 0,
+            "area": "",
+            "level": str(i % 100),
+            "qq_level": 0,
+            "join_time": 1700000000 + i,
+            "last_sent_time": 1768000000 + i,
+            "title_expire_time": 0,
+            "unfriendly": False,
+            "card_changeable": True,
+            "is_robot": False,
+            "shut_up_timestamp": 0,
+            "role": "member",
+            "title": "",
+        }
+        for i in range(n)
+    ]
+
+
+_RESPONSE = orjson.dumps(
+    {"status": "ok", "retcode": 0, "data": member_list(MEMBERS), "message": "", "wording": "", "echo": "ECHO"}
+)
+
+
+class MemberListWebSocket(FakeWebSocket):
+    async def send(self, data: bytes | str) -> None:
+        self.sent += 1
+        echo = orjson.loads(data)["echo"]
+        # 真实连接上的文本帧为 str
+        self._inbox.put_nowait(_RESPONSE.replace(b'"ECHO"', orjson.dumps(echo)).decode())  # type: ignore[arg-type]
+
+
+async def measure(client: NapCatClient, mode: str) -> tuple[int, float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "call_action":
+        result: Any = await client.call_action("get_group_member_list", {"group_id": 10001})
+    elif mode == "iter_list (dict)":
+        result = [m async for m in client.iter_list("get_group_member_list", {"group_id": 10001})]
+    else:
+        result = [
+            m async for m in client.iter_list("get_group_member_list", {"group_id": 10001}, fields=Member)
+        ]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(result) == MEMBERS
+    return peak, elapsed, len(result)
+
+
+async def main():
+    print(f"get_group_member_list with {MEMBERS} members, raw frame {len(_RESPONSE) / 1024:.0f} KiB")
+    for mode in ("call_action", "iter_list (dict)", "iter_list (Member)"):
+        ws = MemberListWebSocket()
+        conn = Connection(ws)  # type: ignore[arg-type]
+        client = NapCatClient(_existing_conn=conn)
+        async with conn:
+            await measure(client, mode)  # 预热
+            peak, elapsed, _ = await measure(client, mode)
+            await ws.close()
+        print(f"  {mode:20}: peak {peak / 1024:8.0f} KiB  time {elapsed * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+# tests/bench_loop_lag.py
+"""
+大帧解码对事件循环的影响：连接上交替到达大群成员列表响应与普通群消息事件，
+同时一个 1ms 周期的计时协程测量事件循环停顿 (loop lag)。
+对比全部在事件循环上解码 (offload_threshold=None) 与大帧在线程池中解码两种情况，
+并检查事件顺序未被打乱。
+
+uv run src/tests/bench_loop_lag.py
+"""
+import asyncio
+import time
+from typing import Any
+
+import orjson
+from bench_utils import FakeWebSocket, group_message_frame
+
+from napcat import NapCatClient
+from napcat.connection import Connection
+
+MEMBERS = 20_000
+RESPONSES = 5
+TICK = 0.001
+
+
+def member_list(n: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "group_id": 10001,
+            "user_id": 10_000_000 + i,
+            "nickname": f"成员{i}",
+            "card": f"群名片 {i}",
+            "sex": "unknown",
+            "age": 0,
+            "area": "",
+            "level": str(i % 100),
+            "qq_level": 0,
+            "join_time": 1700000000 + i,
+            "last_sent_time": 1768000000 + i,
+            "title_expire_time": 0,
+            "unfriendly": False,
+            "card_changeable": True,
+            "is_robot": False,
+            "shut_up_timestamp": 0,
+            "role": "member",
+            "title": "",
+        }
+        for i in range(n)
+    ]
+
+
+# 响应帧预先序列化，避免基准自身的编码开销计入事件循环停顿
+_RESPONSE = orjson.dumps(
+    {"status": "ok", "retcode": 0, "data": member_list(MEMBERS), "message": "", "wording": "", "echo": "ECHO"}
+)
+
+
+class MemberListWebSocket(FakeWebSocket):
+    async def send(self, data: bytes | str) -> None:
+        self.sent += 1
+        echo = orjson.loads(data)["echo"]
+        self.feed(_RESPONSE.replace(b'"ECHO"', orjson.dumps(echo)))
+
+
+async def ticker(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+
+async def run(threshold: int | None) -> tuple[list[float], float, bool]:
+    ws = MemberListWebSocket()
+    conn = Connection(ws, offload_threshold=threshold)  # type: ignore[arg-type]
+    client = NapCatClient(_existing_conn=conn)
+    received: list[int] = []
+
+    async def consume() -> None:
+        async for event in client.events():
+            received.append(getattr(event, "message_id"))
+
+    async with conn:
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        lags: list[float] = []
+        stop = asyncio.Event()
+        tick = asyncio.create_task(ticker(lags, stop))
+        await asyncio.sleep(0.01)
+
+        start = time.perf_counter()
+        expected: list[int] = []
+        for i in range(RESPONSES):
+            call = asyncio.create_task(client.call_action("get_group_member_list", {"group_id": 10001}))
+            await asyncio.sleep(0)
+            # 事件紧跟在大响应之后到达
+            for j in range(20):
+                frame = group_message_frame(i * 100 + j)
+                expected.append(frame["message_id"])
+                ws.feed(frame)
+            data = await call
+            assert isinstance(data, list) and len(data) == MEMBERS
+        elapsed = time.perf_counter() - start
+
+        while len(received) < len(expected):
+            await asyncio.sleep(0.001)
+        stop.set()
+        await tick
+        consumer.cancel()
+        await ws.close()
+    return sorted(lags), elapsed, received == expected
+
+
+async def main():
+    print(
+        f"{RESPONSES} x get_group_member_list ({MEMBERS} members, {len(_RESPONSE) / 1e6:.1f} MB) "
+        "interleaved with events"
+    )
+    for label, threshold in (("on loop", None), ("thread pool", 1 << 20)):
+        lags, elapsed, ordered = await run(threshold)
+        p50 = lags[len(lags) // 2]
+        p99 = lags[int(len(lags) * 0.99)]
+        print(
+            f"  {label:12}: loop lag p50 {p50 * 1000:6.2f} ms  p99 {p99 * 1000:7.2f} ms  "
+            f"max {lags[-1] * 1000:7.2f} ms | total {elapsed * 1000:6.0f} ms | events in order: {ordered}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+# tests/bench_metrics.py
+"""
+action 统计的采集开销：单独计时 Connection.send 中新增的统计代码
+(计数器、两次 perf_counter_ns、直方图记录)，目标 < 1us/调用；
+并给出经 FakeWebSocket 的端到端调用耗时作为对照。
+
+uv run src/tests/bench_metrics.py
+"""
+import asyncio
+import time
+import timeit
+
+from bench_utils import FakeWebSocket, login_responder
+
+from napcat import NapCatClient
+from napcat.connection import Connection
+from napcat.metrics import ActionMetrics
+
+N = 200_000
+
+
+def instrumentation_ns() -> float:
+    metrics = ActionMetrics()
+    perf_counter_ns = time.perf_counter_ns
+    fut = object()
+
+    def one_call() -> None:
+        # 与 Connection.send / 读循环中新增的统计代码一一对应
+        stats = metrics["get_group_member_info"]
+        entry = (fut, stats)
+        stats.calls += 1
+        start = perf_counter_ns()
+        stats.request_bytes += 96
+        entry[1].response_bytes += 512
+        stats.latency.record(perf_counter_ns() - start + 150_000)
+
+    def baseline() -> None:
+        pass
+
+    one_call()
+    cost = min(timeit.repeat(one_call, number=N, repeat=7)) / N
+    empty = min(timeit.repeat(baseline, number=N, repeat=7)) / N
+    return (cost - empty) * 1e9
+
+
+async def end_to_end_us(calls: int = 20_000) -> tuple[float, Connection]:
+    ws = FakeWebSocket(login_responder)
+    conn = Connection(ws)  # type: ignore[arg-type]
+    client = NapCatClient(_existing_conn=conn)
+    async with conn:
+        start = time.perf_counter()
+        for _ in range(calls):
+            await client.call_action("get_login_info")
+        elapsed = time.perf_counter() - start
+        await ws.close()
+    return elapsed / calls * 1e6, conn
+
+
+def main():
+    ns = instrumentation_ns()
+    print(f"metrics overhead : {ns:7.0f} ns/call  ({'OK' if ns < 1000 else 'OVER BUDGET'}, budget 1000 ns)")
+    per_call, conn = asyncio.run(end_to_end_us())
+    print(f"end-to-end call  : {per_call:7.1f} us/call (FakeWebSocket)")
+    s = conn.metrics.snapshot()["get_login_info"]
+    print(
+        f"snapshot         : calls={s.calls} errors={s.errors} timeouts={s.timeouts} "
+        f"req={s.request_bytes}B resp={s.response_bytes}B "
+        f"p50={s.p50 * 1e6:.0f}us p99={s.p99 * 1e6:.0f}us max={s.max * 1e6:.0f}us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# tests/bench_outbox.py
+"""
+出站优先级基准：500 个批量调用 (get_group_member_list) 正在排队时，
+测量交互式调用 (send_group_msg) 的端到端延迟；socket 写入被模拟为每帧 0.2ms。
+另测 max_outbound 小于批量调用数、出站队列已满 (批量调用在入队处等待) 的情况。
+
+uv run src/tests/bench_outbox.py
+"""
+import asyncio
+import statistics
+import time
+from typing import Any
+
+from bench_utils import FakeWebSocket, login_responder
+
+from napcat import NapCatClient, Priority
+from napcat.connection import Connection
+
+BULK = 500
+INTERACTIVE = 20
+WRITE_TIME = 0.0002
+
+
+class SlowWebSocket(FakeWebSocket):
+    async def send(self, data: bytes | str) -> None:
+        await asyncio.sleep(WRITE_TIME)
+        await super().send(data)
+
+
+async def run(prioritised: bool, max_outbound: int = 1000) -> tuple[list[float], Connection]:
+    ws = SlowWebSocket(login_responder)
+    conn = Connection(ws, max_outbound=max_outbound)  # type: ignore[arg-type]
+    client = NapCatClient(_existing_conn=conn)
+    async with conn:
+        flat = None if prioritised else Priority.NORMAL
+        bulk = [
+            asyncio.create_task(
+                client.call_action("get_group_member_list", {"group_id": i}, priority=flat)
+            )
+            for i in range(BULK)
+        ]
+        await asyncio.sleep(0)
+
+        async def interactive(i: int) -> float:
+            start = time.perf_counter()
+            await client.call_action("send_group_msg", {"group_id": 1, "message": str(i)}, priority=flat)
+            return time.perf_counter() - start
+
+        latencies: list[Any] = await asyncio.gather(*(interactive(i) for i in range(INTERACTIVE)))
+        await asyncio.gather(*bulk)
+        await ws.close()
+    return latencies, conn
+
+
+async def main():
+    print(f"{INTERACTIVE} send_group_msg behind {BULK} queued bulk calls")
+    for label, prioritised, max_outbound in (
+        ("FIFO", False, 1000),
+        ("priority queue", True, 1000),
+        ("FIFO, full", False, 50),
+        ("priority, full", True, 50),
+    ):
+        latencies, conn = await run(prioritised, max_outbound)
+        stats = conn.write_stats
+        print(
+            f"  {label:14}: interactive p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+            f"max {max(latencies) * 1000:7.1f} ms | "
+            f"queue wait avg {stats.queue_wait_avg * 1000:6.1f} ms  "
+            f"write avg {stats.write_avg * 1000:5.2f} ms  depth hw {stats.depth_high_water}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
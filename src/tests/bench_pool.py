@@ -0,0 +1,53 @@
+# tests/bench_pool.py
+"""
+action 连接池基准：本地 WebSocket 服务端逐条串行处理每个连接上的请求 (模拟 NapCat 的单连接处理)，
+比较单连接与 K 条 action 连接下突发并发调用的总耗时。
+
+uv run src/tests/bench_pool.py
+"""
+import asyncio
+import time
+
+import orjson
+from websockets.asyncio.server import ServerConnection, serve
+
+from napcat import NapCatClient
+
+PORT = 18765
+CALLS = 200
+SERVICE_TIME = 0.002  # 每个请求在服务端占用连接的时间
+
+
+async def handler(ws: ServerConnection) -> None:
+    async for msg in ws:
+        req = orjson.loads(msg)
+        await asyncio.sleep(SERVICE_TIME)
+        resp = {"status": "ok", "retcode": 0, "data": {"user_id": 1}, "echo": req["echo"]}
+        await ws.send(orjson.dumps(resp))
+
+
+async def burst(action_connections: int) -> tuple[float, list[int]]:
+    url = f"ws://127.0.0.1:{PORT}"
+    async with NapCatClient(url, action_connections=action_connections) as client:
+        peak: list[int] = []
+        start = time.perf_counter()
+        calls = [client.call_action("get_group_member_info", {"group_id": 1, "user_id": i}) for i in range(CALLS)]
+        tasks = [asyncio.create_task(c) for c in calls]
+        await asyncio.sleep(0)
+        if client.pool:
+            peak = client.pool.in_flight
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start, peak
+
+
+async def main():
+    async with serve(handler, "127.0.0.1", PORT):
+        print(f"{CALLS} concurrent get_group_member_info, {SERVICE_TIME * 1000:.0f}ms per request per socket")
+        for k in (0, 2, 4, 8):
+            elapsed, peak = await burst(k)
+            label = "single socket" if k == 0 else f"{k} action sockets"
+            print(f"  {label:18}: {elapsed * 1000:8.1f} ms  in-flight per socket: {peak or '-'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+# tests/bench_roster.py
+"""
+群成员列表常驻内存的对比：200 个群、每群 500 人 (群名片 / 头衔多数为空，昵称部分重复)，
+分别以 get_group_member_list 解码出的 dict 列表与 Roster 保存，统计保留的内存 (tracemalloc)
+以及按 user_id 查找的耗时。
+
+uv run src/tests/bench_roster.py
+"""
+import gc
+import random
+import time
+import tracemalloc
+from typing import Any
+
+import orjson
+
+from napcat.roster import Roster
+
+GROUPS = 200
+MEMBERS = 500
+LOOKUPS = 200_000
+
+
+def member_list_frame(group_id: int, rng: random.Random) -> bytes:
+    members: list[dict[str, Any]] = []
+    for i in range(MEMBERS):
+        user_id = rng.randrange(10_000_000, 3_000_000_000)
+        members.append(
+            {
+                "group_id": group_id,
+                "user_id": user_id,
+                "nickname": f"用户{rng.randrange(20_000)}",
+                "card": f"群名片{i}" if rng.random() < 0.4 else "",
+                "sex": rng.choice(("male", "female", "unknown")),
+                "age": rng.randrange(0, 40),
+                "area": "",
+                "level": str(rng.randrange(1, 100)),
+                "qq_level": rng.randrange(0, 64),
+                "join_time": 1600000000 + rng.randrange(100_000_000),
+                "last_sent_time": 1700000000 + rng.randrange(60_000_000),
+                "title_expire_time": 0,
+                "unfriendly": False,
+                "card_changeable": True,
+                "is_robot": False,
+                "shut_up_timestamp": 0,
+                "role": "owner" if i == 0 else "admin" if i < 5 else "member",
+                "title": "活跃成员" if rng.random() < 0.05 else "",
+            }
+        )
+    return orjson.dumps({"status": "ok", "retcode": 0, "data": members, "echo": "x"})
+
+
+def retained(build: Any) -> tuple[Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    rng = random.Random(42)
+    frames = [(10_000 + g, member_list_frame(10_000 + g, rng)) for g in range(GROUPS)]
+    print(f"{GROUPS} groups x {MEMBERS} members ({sum(len(f) for _, f in frames) / 1e6:.1f} MB of JSON)")
+
+    dicts, dict_bytes = retained(
+        lambda: {gid: orjson.loads(frame)["data"] for gid, frame in frames}
+    )
+    rosters, roster_bytes = retained(
+        lambda: {gid: Roster(gid, orjson.loads(frame)["data"]) for gid, frame in frames}
+    )
+    print(f"  dict lists : {dict_bytes / 1e6:7.1f} MB  ({dict_bytes / (GROUPS * MEMBERS):6.0f} B/member)")
+    print(f"  Roster     : {roster_bytes / 1e6:7.1f} MB  ({roster_bytes / (GROUPS * MEMBERS):6.0f} B/member)")
+    print(f"  ratio      : {dict_bytes / roster_bytes:.1f}x smaller")
+
+    keys = [(gid, members[rng.randrange(MEMBERS)]["user_id"]) for gid, members in dicts.items()]
+    by_id = {gid: {m["user_id"]: m for m in members} for gid, members in dicts.items()}
+    probes = [keys[rng.randrange(len(keys))] for _ in range(LOOKUPS)]
+    start = time.perf_counter()
+    for gid, uid in probes:
+        by_id[gid][uid]["role"]
+    dict_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+    start = time.perf_counter()
+    for gid, uid in probes:
+        rosters[gid].role_of(uid)
+    role_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+    start = time.perf_counter()
+    for gid, uid in probes:
+        rosters[gid].get(uid)
+    get_ns = (time.perf_counter() - start) / LOOKUPS * 1e9
+    print(f"  lookup     : dict index {dict_ns:5.0f} ns | Roster.role_of {role_ns:5.0f} ns | Roster.get {get_ns:5.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
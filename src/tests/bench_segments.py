@@ -0,0 +1,52 @@
+# tests/bench_segments.py
+"""
+发送路径的消息段构造基准：旧版 __init__ (每次反射 Literal 注解) vs 预解析 type 值 vs unchecked。
+
+uv run src/tests/bench_segments.py
+"""
+import timeit
+from dataclasses import MISSING
+from typing import Any, Literal, get_args, get_origin
+
+from napcat.types import MessageText
+from napcat.types.messages.base import _cached_get_type_hints
+
+N = 100_000
+
+
+def legacy_init(self: Any, **kwargs: Any) -> None:
+    """改造前的 MessageSegment.__init__"""
+    hints = _cached_get_type_hints(self.__class__)
+    type_hint = hints.get("type")
+    type_val = None
+    if type_hint and get_origin(type_hint) is Literal:
+        args = get_args(type_hint)
+        if args and isinstance(args[0], str):
+            type_val = args[0]
+    if type_val is None:
+        type_field = self.__class__.__dataclass_fields__["type"]
+        if type_field.default is not MISSING:
+            type_val = type_field.default
+    object.__setattr__(self, "type", type_val)
+    object.__setattr__(self, "data", self.__class__._data_class.from_dict(kwargs))
+
+
+def per_call_us(fn: Any) -> float:
+    fn()
+    return min(timeit.repeat(fn, number=N, repeat=5)) / N * 1e6
+
+
+def main():
+    def legacy() -> Any:
+        seg = object.__new__(MessageText)
+        legacy_init(seg, text="hello")
+        return seg
+
+    print("MessageText construction")
+    print(f"  legacy __init__ : {per_call_us(legacy):6.2f} us")
+    print(f"  __init__        : {per_call_us(lambda: MessageText(text='hello')):6.2f} us")
+    print(f"  unchecked       : {per_call_us(lambda: MessageText.unchecked(text='hello')):6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
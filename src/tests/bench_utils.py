@@ -0,0 +1,90 @@
+# tests/bench_utils.py
+"""
+基准测试共用的假 WebSocket 与样例帧。
+
+各 bench 脚本以顶层模块 bench_utils 导入本文件：直接运行脚本时其所在目录位于 sys.path 首位，
+因此在任意工作目录下都可以运行，如在仓库根目录执行 uv run src/tests/bench_events.py。
+pytest 收集 src/tests 下的测试时同样会把该目录加入 sys.path。
+"""
+import asyncio
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import orjson
+
+Responder = Callable[[dict[str, Any]], Iterable[dict[str, Any]]]
+
+
+def group_message_frame(i: int = 0, group_id: int = 10001) -> dict[str, Any]:
+    return {
+        "time": 1768000000 + i,
+        "self_id": 123456,
+        "post_type": "message",
+        "message_type": "group",
+        "sub_type": "normal",
+        "message_id": 100000 + i,
+        "message_seq": 100000 + i,
+        "real_id": 100000 + i,
+        "real_seq": str(5000 + i),
+        "user_id": 222222,
+        "group_id": group_id,
+        "group_name": "Bench Group",
+        "message": [
+            {"type": "reply", "data": {"id": "99999"}},
+            {"type": "at", "data": {"qq": "123456", "name": "bot"}},
+            {"type": "text", "data": {"text": f"hello world #{i}"}},
+            {"type": "face", "data": {"id": "14"}},
+            {"type": "image", "data": {"file": "abc.jpg", "url": "https://example.com/abc.jpg", "summary": "[图片]", "sub_type": 0}},
+        ],
+        "raw_message": f"[CQ:reply,id=99999][CQ:at,qq=123456] hello world #{i}[CQ:face,id=14][CQ:image,file=abc.jpg]",
+        "message_format": "array",
+        "font": 14,
+        "sender": {"user_id": 222222, "nickname": "tester", "card": "", "role": "member"},
+    }
+
+
+def private_message_frame(i: int = 0) -> dict[str, Any]:
+    frame = group_message_frame(i)
+    for key in ("group_id", "group_name"):
+        frame.pop(key)
+    return frame | {"message_type": "private", "sub_type": "friend", "target_id": 123456}
+
+
+class FakeWebSocket:
+    """
+    只实现 Connection 用到的接口：send / close / 异步迭代。
+    入站帧通过 feed() 注入；responder 可根据出站请求生成响应帧。
+    """
+
+    def __init__(self, responder: Responder | None = None):
+        self._inbox: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self.responder = responder
+        self.sent = 0
+
+    def feed(self, frame: dict[str, Any] | bytes) -> None:
+        self._inbox.put_nowait(frame if isinstance(frame, bytes) else orjson.dumps(frame))
+
+    async def send(self, data: bytes | str) -> None:
+        self.sent += 1
+        if self.responder:
+            for frame in self.responder(orjson.loads(data)):
+                self.feed(frame)
+
+    async def close(self) -> None:
+        self._inbox.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        msg = await self._inbox.get()
+        if msg is None:
+            raise StopAsyncIteration
+        # 模拟真实 socket 的读等待，让出事件循环
+        await asyncio.sleep(0)
+        return msg
+
+
+def login_responder(req: dict[str, Any]) -> list[dict[str, Any]]:
+    data = {"user_id": 123456, "nickname": "bot"} if req["action"] == "get_login_info" else None
+    return [{"status": "ok", "retcode": 0, "data": data, "echo": req["echo"]}]
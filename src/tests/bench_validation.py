@@ -0,0 +1,68 @@
+# tests/bench_validation.py
+"""
+不同校验模式下的校验开销。
+
+端到端解码 (NapCatEvent.from_dict) 中校验只占一小部分，各模式的差异会被解码本身的波动掩盖，
+因此这里单独计时校验这一步：对已解码的 GroupMessageEvent 及其 sender 调用编译生成的校验函数，
+并以反射式的 validate_types() 作为参照。最后给出端到端解码的耗时供对照。
+
+uv run src/tests/bench_validation.py
+"""
+import timeit
+from typing import Any
+
+from bench_utils import group_message_frame
+
+from napcat import NapCatEvent
+from napcat.types import ValidationMode, validation_mode
+from napcat.types.utils import _validator_for
+
+N = 20_000
+REPEAT = 15
+
+
+def best_us(fn: Any) -> float:
+    return min(timeit.repeat(fn, number=N, repeat=REPEAT)) / N * 1e6
+
+
+def main():
+    frame = group_message_frame()
+    event: Any = NapCatEvent.from_dict(frame)
+    sender = event.sender
+    validate_event = _validator_for(type(event))
+    validate_sender = _validator_for(type(sender))
+
+    def compiled() -> None:
+        validate_event(event)
+        validate_sender(sender)
+
+    def reflective() -> None:
+        event.validate_types()
+        sender.validate_types()
+
+    modes = [
+        ValidationMode("strict"),
+        ValidationMode("sampled", sample_rate=100),
+        ValidationMode("off"),
+    ]
+    print(f"{type(event).__name__} + sender, validation step only")
+    with validation_mode(ValidationMode("strict")):
+        reference = best_us(reflective)
+    print(f"  reflective validate_types(): {reference:7.3f} us/event")
+    baseline = 0.0
+    for mode in modes:
+        with validation_mode(mode):
+            us = best_us(compiled)
+        baseline = baseline or us
+        print(f"  compiled, {mode.mode:<8}     : {us:7.3f} us/event ({us / baseline:5.0%} of strict)")
+
+    print("end-to-end decode (NapCatEvent.from_dict), for comparison")
+    for mode in modes:
+        with validation_mode(mode):
+            NapCatEvent.from_dict(frame)
+            us = best_us(lambda: NapCatEvent.from_dict(frame))
+        print(f"  {mode.mode:<8}: {us:7.2f} us/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# tests/test_broadcast.py
+import asyncio
+from collections.abc import Awaitable
+from typing import Any
+
+import pytest
+
+from napcat.broadcast import Block, BufferedPolicy, DropNewest, DropOldest, Envelope, EventHub
+
+
+def heartbeat(i: int) -> dict[str, Any]:
+    return {"post_type": "meta_event", "meta_event_type": "heartbeat", "time": i, "self_id": 1, "interval": 1000}
+
+
+def make_hub(**kwargs: Any) -> EventHub:
+    # 解码器原样返回原始帧，便于按 time 断言顺序
+    return EventHub(decoder=lambda raw: raw, **kwargs)
+
+
+def test_stuck_block_does_not_stall_other_subscribers():
+    async def main():
+        hub = make_hub()
+        block = Block(maxsize=2, timeout=10, max_pending=3)
+        newest, oldest = DropNewest(maxsize=100), DropOldest()
+        stuck = hub.subscribe(block)
+        fast_newest, fast_oldest = hub.subscribe(newest), hub.subscribe(oldest)
+        # 先让三个订阅者都挂上，Block 的消费者此后不再读取
+        first = asyncio.create_task(anext(stuck))
+        pending = [asyncio.create_task(anext(g)) for g in (fast_newest, fast_oldest)]
+        await asyncio.sleep(0)
+
+        for i in range(20):
+            hub.dispatch(heartbeat(i))
+
+        assert [(await t)["time"] for t in pending] == [0, 0]
+        assert [(await anext(fast_newest))["time"] for _ in range(19)] == list(range(1, 20))
+        assert (await anext(fast_oldest))["time"] == 1
+        assert hub.backlog == 0
+        # 缓冲 2 条 + 等待队列 3 条，其余丢弃并计数
+        assert block.stats.high_water == 5
+        assert block.stats.dropped == 15
+        assert (await first)["time"] == 0
+        hub.close()
+
+    asyncio.run(main())
+
+
+def test_block_keeps_order_and_drops_events_that_waited_too_long():
+    async def main():
+        hub = make_hub()
+        block = Block(maxsize=1, timeout=0.05)
+        sub = hub.subscribe(block)
+        first = asyncio.create_task(anext(sub))
+        await asyncio.sleep(0)
+        for i in range(3):
+            hub.dispatch(heartbeat(i))
+        # 事件 0 占满缓冲 (消费者尚未取走)，1 与 2 在等待队列中
+        assert block.pending == 2
+        # 消费者取走 0 时 1 补入缓冲；2 等待超时，在下一条事件到达时被丢弃
+        await asyncio.sleep(0.1)
+        hub.dispatch(heartbeat(3))
+        assert block.stats.dropped == 1
+        assert [(await first)["time"]] + [(await anext(sub))["time"] for _ in range(2)] == [0, 1, 3]
+        hub.close()
+
+    asyncio.run(main())
+
+
+def test_block_requires_a_finite_positive_timeout():
+    assert Block().timeout == 5.0
+    with pytest.raises(ValueError):
+        Block(timeout=0)
+
+
+class Stalling(BufferedPolicy):
+    """offer() 返回永不完成的 awaitable，模拟阻塞分发的自定义策略"""
+
+    def offer(self, env: Envelope) -> Awaitable[None] | None:
+        self._push(env)
+        return asyncio.get_running_loop().create_future()
+
+
+def test_hub_backlog_is_bounded():
+    async def main():
+        hub = make_hub(max_backlog=10)
+        stalling = Stalling()
+        stalling.attach(hub)
+        for i in range(25):
+            hub.dispatch(heartbeat(i))
+        await asyncio.sleep(0)
+        # 第一条事件触发阻塞，其后 10 条排队，其余丢弃
+        assert hub.backlog == 10
+        assert hub.dropped_total == 14
+        hub.close()
+        assert hub.backlog == 0
+
+    asyncio.run(main())
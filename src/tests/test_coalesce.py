@@ -0,0 +1,137 @@
+# tests/test_coalesce.py
+import asyncio
+from typing import Any
+
+import pytest
+from bench_utils import FakeWebSocket, login_responder
+
+from napcat import NapCatClient
+from napcat.client_api import READ_ONLY_ACTIONS
+from napcat.connection import Connection
+from napcat.outbox import Priority
+
+PARAMS = {"group_id": 10001}
+
+
+class Server:
+    """get_group_info 的请求先挂起，由测试调用 reply() 逐个应答"""
+
+    def __init__(self):
+        self.held: list[dict[str, Any]] = []
+        self.ws = FakeWebSocket(self.respond)
+
+    def respond(self, req: dict[str, Any]) -> list[dict[str, Any]]:
+        if req["action"] == "get_group_info":
+            self.held.append(req)
+            return []
+        return login_responder(req)
+
+    def reply(self, data: Any = None, ok: bool = True) -> None:
+        req = self.held.pop(0)
+        self.ws.feed({"status": "ok" if ok else "failed", "retcode": 0 if ok else 100, "data": data, "echo": req["echo"]})
+
+
+def run(test: Any) -> None:
+    async def main():
+        server = Server()
+        async with NapCatClient(coalesce=True, _existing_conn=Connection(server.ws)) as client:  # type: ignore[arg-type]
+            await test(server, client)
+            await server.ws.close()
+
+    asyncio.run(main())
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_identical_calls_share_one_request():
+    async def test(server: Server, client: NapCatClient):
+        calls = [asyncio.create_task(client.call_action("get_group_info", {"group_id": "10001"})) for _ in range(3)]
+        await settle()
+        assert len(server.held) == 1
+        server.reply({"group_name": "g"})
+        results = await asyncio.gather(*calls)
+        assert results == [{"group_name": "g"}] * 3
+        # 各调用方拿到各自的副本
+        assert len({id(r) for r in results}) == 3
+        assert client.metrics["get_group_info"].coalesced == 2
+
+    run(test)
+
+
+def test_calls_with_different_options_are_not_merged():
+    async def test(server: Server, client: NapCatClient):
+        calls = [
+            asyncio.create_task(client.call_action("get_group_info", PARAMS)),
+            asyncio.create_task(client.call_action("get_group_info", PARAMS, priority=Priority.INTERACTIVE)),
+            asyncio.create_task(client.call_action("get_group_info", PARAMS, use_cache=False)),
+        ]
+        await settle()
+        assert len(server.held) == 3
+        for _ in calls:
+            server.reply({})
+        await asyncio.gather(*calls)
+
+    run(test)
+
+
+def test_cancelled_initiator_hands_over_to_a_waiter():
+    async def test(server: Server, client: NapCatClient):
+        initiator = asyncio.create_task(client.call_action("get_group_info", PARAMS))
+        await settle()
+        waiter = asyncio.create_task(client.call_action("get_group_info", PARAMS))
+        await settle()
+        initiator.cancel()
+        await settle()
+        # 发起方的请求作废，等待方重新发起一次
+        assert len(server.held) == 2
+        server.held.pop(0)
+        server.reply({"group_name": "g"})
+        assert await waiter == {"group_name": "g"}
+        assert initiator.cancelled()
+
+    run(test)
+
+
+def test_cancelled_waiter_does_not_affect_others():
+    async def test(server: Server, client: NapCatClient):
+        initiator = asyncio.create_task(client.call_action("get_group_info", PARAMS))
+        await settle()
+        waiters = [asyncio.create_task(client.call_action("get_group_info", PARAMS)) for _ in range(2)]
+        await settle()
+        waiters[0].cancel()
+        server.reply({"group_name": "g"})
+        assert await initiator == {"group_name": "g"}
+        assert await waiters[1] == {"group_name": "g"}
+        assert len(server.held) == 0
+
+    run(test)
+
+
+def test_each_waiter_gets_its_own_exception():
+    async def test(server: Server, client: NapCatClient):
+        calls = [asyncio.create_task(client.call_action("get_group_info", PARAMS)) for _ in range(3)]
+        await settle()
+        server.reply(ok=False)
+        errors: list[Any] = await asyncio.gather(*calls, return_exceptions=True)
+        assert all(isinstance(e, RuntimeError) for e in errors)
+        assert len({id(e) for e in errors}) == 3
+        assert all(e.__cause__ is errors[0] for e in errors[1:])
+
+    run(test)
+
+
+def test_side_effecting_actions_are_never_merged():
+    async def test(server: Server, client: NapCatClient):
+        sent = server.ws.sent
+        await asyncio.gather(*(client.call_action("get_clientkey") for _ in range(2)))
+        assert server.ws.sent - sent == 2
+
+    run(test)
+
+
+@pytest.mark.parametrize("action", ["get_ai_record", "get_cookies", "get_credentials", "get_rkey", "send_group_msg"])
+def test_read_only_list_excludes_side_effects(action: str):
+    assert action not in READ_ONLY_ACTIONS
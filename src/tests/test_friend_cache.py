@@ -0,0 +1,100 @@
+# tests/test_friend_cache.py
+import asyncio
+from typing import Any
+
+from bench_utils import FakeWebSocket, login_responder, private_message_frame
+
+from napcat import FriendCache, NapCatClient
+from napcat.connection import Connection
+
+STALE = [{"user_id": 1, "nickname": "a"}, {"user_id": 2, "nickname": "b"}]
+FRESH = [{"user_id": 1, "nickname": "a"}, {"user_id": 5, "nickname": "new"}]
+
+
+class Server:
+    """不带 no_cache 时返回 NapCat 缓存中的旧列表，带 no_cache 时返回最新列表"""
+
+    def __init__(self):
+        self.calls: list[str] = []
+        self.ws = FakeWebSocket(self.respond)
+
+    def respond(self, req: dict[str, Any]) -> list[dict[str, Any]]:
+        action = req["action"]
+        self.calls.append(action)
+        if action == "get_friend_list":
+            data: Any = FRESH if req["params"].get("no_cache") else STALE
+        elif action in ("delete_friend", "set_friend_add_request"):
+            data = None
+        else:
+            return login_responder(req)
+        return [{"status": "ok", "retcode": 0, "data": data, "echo": req["echo"]}]
+
+
+def run(test: Any) -> None:
+    async def main():
+        server = Server()
+        # 测试中不让后台刷新自行触发
+        cache = FriendCache(min_refresh_interval=3600)
+        async with NapCatClient(friend_cache=cache, _existing_conn=Connection(server.ws)) as client:  # type: ignore[arg-type]
+            await test(server, cache, client)
+            cache.close()
+            await server.ws.close()
+
+    asyncio.run(main())
+
+
+def test_is_friend_is_unknown_before_load():
+    async def test(server: Server, cache: FriendCache, client: NapCatClient):
+        assert client.is_friend(1) is None
+        await cache.load()
+        assert client.is_friend(1) is True
+        assert client.is_friend(3) is False
+
+    run(test)
+
+
+def test_list_answered_locally_until_changed():
+    async def test(server: Server, cache: FriendCache, client: NapCatClient):
+        await cache.load()
+        await client.api.get_friend_list()
+        assert server.calls.count("get_friend_list") == 1
+        server.ws.feed({"post_type": "notice", "notice_type": "friend_add", "user_id": 5, "time": 1, "self_id": 123456})
+        await asyncio.sleep(0.01)
+        assert cache.is_friend(5)
+        # 新好友只有 user_id，列表改走网络
+        await client.api.get_friend_list()
+        assert server.calls.count("get_friend_list") == 2
+
+    run(test)
+
+
+def test_stale_list_keeps_unconfirmed_changes():
+    async def test(server: Server, cache: FriendCache, client: NapCatClient):
+        await cache.load()
+        server.ws.feed({"post_type": "notice", "notice_type": "friend_add", "user_id": 5, "time": 1, "self_id": 123456})
+        await asyncio.sleep(0.01)
+        await client.api.delete_friend(user_id=2)
+        # 不带 no_cache 的结果来自 NapCat 的旧缓存：调用方原样拿到，本地仍保留增量变更
+        result = await client.api.get_friend_list()
+        assert [f["user_id"] for f in result] == [1, 2]
+        assert cache.is_friend(5) and not cache.is_friend(2)
+        friend = cache.friend(5)
+        assert friend is not None and "nickname" not in friend
+        # no_cache 的结果确认变更
+        await client.api.get_friend_list(no_cache=True)
+        assert cache.friend(5) == {"user_id": 5, "nickname": "new"}
+        await client.api.get_friend_list()
+        assert server.calls.count("get_friend_list") == 3
+
+    run(test)
+
+
+def test_private_message_from_friend_adds_entry():
+    async def test(server: Server, cache: FriendCache, client: NapCatClient):
+        await cache.load()
+        frame = private_message_frame() | {"user_id": 9}
+        server.ws.feed(frame)
+        await asyncio.sleep(0.01)
+        assert cache.is_friend(9)
+
+    run(test)
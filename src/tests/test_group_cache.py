@@ -0,0 +1,107 @@
+# tests/test_group_cache.py
+import asyncio
+from typing import Any
+
+import pytest
+from bench_utils import FakeWebSocket, login_responder
+
+from napcat import GroupCache, NapCatClient
+from napcat.connection import Connection
+
+GROUPS = {
+    1: {"group_id": 1, "group_name": "a", "member_count": 5, "max_member_count": 50, "group_all_shut": 0, "group_remark": ""},
+    2: {"group_id": 2, "group_name": "b", "member_count": 7, "max_member_count": 50, "group_all_shut": 0, "group_remark": ""},
+}
+
+
+def notice(**fields: Any) -> dict[str, Any]:
+    return {"post_type": "notice", "time": 1, "self_id": 123456} | fields
+
+
+class Server:
+    def __init__(self):
+        self.calls: list[str] = []
+        self.ws = FakeWebSocket(self.respond)
+
+    def respond(self, req: dict[str, Any]) -> list[dict[str, Any]]:
+        action, params = req["action"], req["params"]
+        self.calls.append(action)
+        if action == "get_group_list":
+            data: Any = list(GROUPS.values())
+        elif action == "get_group_info":
+            data = GROUPS[int(params["group_id"])]
+        elif action == "get_group_detail_info":
+            data = GROUPS[int(params["group_id"])] | {"extra": 1}
+        elif action in ("set_group_name", "set_group_leave"):
+            data = None
+        else:
+            return login_responder(req)
+        return [{"status": "ok", "retcode": 0, "data": data, "echo": req["echo"]}]
+
+
+def run(test: Any, **options: Any) -> None:
+    async def main():
+        server = Server()
+        cache = GroupCache(**options)
+        async with NapCatClient(group_cache=cache, _existing_conn=Connection(server.ws)) as client:  # type: ignore[arg-type]
+            await test(server, cache, client)
+            cache.close()
+            await server.ws.close()
+
+    asyncio.run(main())
+
+
+def test_list_fills_info_lookups():
+    async def test(server: Server, cache: GroupCache, client: NapCatClient):
+        await client.api.get_group_list()
+        info = await client.api.get_group_info(group_id="2")
+        assert info["group_name"] == "b"
+        assert server.calls.count("get_group_info") == 0
+        await client.call_action("get_group_info", {"group_id": 2, "no_cache": True})
+        assert server.calls.count("get_group_info") == 1
+
+    run(test)
+
+
+def test_notices_update_cached_fields():
+    async def test(server: Server, cache: GroupCache, client: NapCatClient):
+        await client.api.get_group_list()
+        await client.api.get_group_detail_info(group_id=1)
+        server.ws.feed(notice(notice_type="notify", sub_type="group_name", group_id=1, user_id=9, name_new="renamed"))
+        server.ws.feed(notice(notice_type="group_increase", sub_type="approve", group_id=1, user_id=9, operator_id=0))
+        server.ws.feed(notice(notice_type="group_decrease", sub_type="kick_me", group_id=2, user_id=123456, operator_id=3))
+        await asyncio.sleep(0.01)
+        info = await client.api.get_group_info(group_id=1)
+        assert info["group_name"] == "renamed" and info.get("member_count") == 6
+        detail = await client.api.get_group_detail_info(group_id=1)
+        assert detail["group_name"] == "renamed"
+        assert server.calls.count("get_group_detail_info") == 1
+        assert [g["group_id"] for g in await client.api.get_group_list()] == [1]
+
+    run(test)
+
+
+def test_own_calls_update_the_cache():
+    async def test(server: Server, cache: GroupCache, client: NapCatClient):
+        await client.api.get_group_list()
+        await client.api.set_group_name(group_id=1, group_name="mine")
+        assert (cache.get(1) or {})["group_name"] == "mine"
+        await client.api.set_group_leave(group_id=2)
+        assert cache.get(2) is None
+
+    run(test)
+
+
+def test_expired_field_goes_to_network():
+    async def test(server: Server, cache: GroupCache, client: NapCatClient):
+        await client.api.get_group_list()
+        await asyncio.sleep(0.01)
+        await client.api.get_group_info(group_id=1)
+        assert server.calls.count("get_group_info") == 1
+
+    run(test, max_age={"member_count": 0.001}, min_refresh_interval=3600)
+
+
+def test_unknown_max_age_field_is_rejected():
+    with pytest.raises(ValueError):
+        GroupCache(max_age={"nam": 1})
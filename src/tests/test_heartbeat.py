@@ -0,0 +1,64 @@
+# tests/test_heartbeat.py
+import asyncio
+from typing import Any
+
+import pytest
+from bench_utils import FakeWebSocket
+
+from napcat.connection import Connection
+
+
+def heartbeat(interval_ms: int, good: bool = True) -> dict[str, Any]:
+    return {"post_type": "meta_event", "meta_event_type": "heartbeat", "time": 1, "self_id": 1,
+            "interval": interval_ms, "status": {"online": True, "good": good}}
+
+
+def silent(req: dict[str, Any]) -> list[dict[str, Any]]:
+    # 模拟半开连接：请求发出后永远没有响应
+    return []
+
+
+def test_missed_heartbeats_fail_pending_calls():
+    async def main():
+        ws = FakeWebSocket(silent)
+        async with Connection(ws, heartbeat_misses=2) as conn:  # type: ignore[arg-type]
+            ws.feed(heartbeat(20))
+            await asyncio.sleep(0.01)
+            assert conn.last_heartbeat is not None
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            with pytest.raises(ConnectionError, match="Heartbeat lost"):
+                await conn.send({"action": "send_group_msg", "params": {}}, timeout=5)
+            # 在 2 个心跳间隔左右失败，而不是等到调用超时
+            assert loop.time() - start < 1
+            assert conn.closed and not conn.healthy
+
+    asyncio.run(main())
+
+
+def test_regular_heartbeats_keep_the_connection():
+    async def main():
+        ws = FakeWebSocket(silent)
+        async with Connection(ws, heartbeat_misses=2) as conn:  # type: ignore[arg-type]
+            for _ in range(6):
+                ws.feed(heartbeat(20, good=False))
+                await asyncio.sleep(0.02)
+            assert not conn.closed and conn.healthy
+            assert conn.bot_good is False
+            await ws.close()
+
+    asyncio.run(main())
+
+
+def test_no_detection_before_first_heartbeat_or_when_disabled():
+    async def main():
+        for misses, frame in ((3, None), (None, heartbeat(10))):
+            ws = FakeWebSocket(silent)
+            async with Connection(ws, heartbeat_misses=misses) as conn:  # type: ignore[arg-type]
+                if frame is not None:
+                    ws.feed(frame)
+                await asyncio.sleep(0.05)
+                assert not conn.closed
+                await ws.close()
+
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+# tests/test_member_cache.py
+import asyncio
+from typing import Any
+
+from bench_utils import FakeWebSocket, login_responder
+
+from napcat import MemberCache, NapCatClient
+from napcat.connection import Connection
+
+GROUP = 10001
+
+
+def member(user_id: int, **fields: Any) -> dict[str, Any]:
+    return {"group_id": GROUP, "user_id": user_id, "nickname": f"n{user_id}", "card": "", "role": "member",
+            "level": "3", "join_time": 1, "last_sent_time": 2} | fields
+
+
+def notice(**fields: Any) -> dict[str, Any]:
+    return {"post_type": "notice", "time": 50, "self_id": 123456, "group_id": GROUP} | fields
+
+
+class Server:
+    def __init__(self):
+        self.calls: list[str] = []
+        self.ws = FakeWebSocket(self.respond)
+
+    def respond(self, req: dict[str, Any]) -> list[dict[str, Any]]:
+        action = req["action"]
+        self.calls.append(action)
+        if action == "get_group_member_list":
+            data: Any = [member(uid) for uid in (1, 2, 3)]
+        elif action == "get_group_member_info":
+            data = member(int(req["params"]["user_id"]), nickname="full", sex="female", shut_up_timestamp=0)
+        else:
+            return login_responder(req)
+        return [{"status": "ok", "retcode": 0, "data": data, "echo": req["echo"]}]
+
+    def count(self, action: str) -> int:
+        return self.calls.count(action)
+
+
+def run(test: Any) -> None:
+    async def main():
+        server = Server()
+        cache = MemberCache()
+        async with NapCatClient(member_cache=cache, _existing_conn=Connection(server.ws)) as client:  # type: ignore[arg-type]
+            await test(server, cache, client)
+            await server.ws.close()
+
+    asyncio.run(main())
+
+
+def test_warmed_roster_answers_without_network():
+    async def test(server: Server, cache: MemberCache, client: NapCatClient):
+        await cache.warm(GROUP)
+        info = await client.api.get_group_member_info(group_id=GROUP, user_id=2)
+        assert server.count("get_group_member_info") == 0
+        assert info["nickname"] == "n2" and info.get("level") == "3" and "sex" not in info
+        # no_cache 始终走网络
+        await client.api.get_group_member_info(group_id=GROUP, user_id=2, no_cache=True)
+        assert server.count("get_group_member_info") == 1
+
+    run(test)
+
+
+def test_record_stored_while_warming_is_kept():
+    async def test(server: Server, cache: MemberCache, client: NapCatClient):
+        # 冷启动：未命中，发起预热的同时走网络取得完整响应
+        first = await client.api.get_group_member_info(group_id=GROUP, user_id=1)
+        assert first.get("sex") == "female"
+        await asyncio.sleep(0.01)
+        assert server.count("get_group_member_list") == 1
+        again = await client.api.get_group_member_info(group_id=GROUP, user_id=1)
+        assert server.count("get_group_member_info") == 1
+        assert again.get("sex") == "female"
+
+    run(test)
+
+
+def test_full_records_survive_roster_expiry():
+    async def test(server: Server, cache: MemberCache, client: NapCatClient):
+        await cache.warm(GROUP)
+        await client.api.get_group_member_info(group_id=GROUP, user_id=1, no_cache=True)
+        cache.ttl = 0
+        await asyncio.sleep(0.001)
+        assert cache.roster(GROUP) is None
+        cache.ttl = 600
+        await cache.warm(GROUP)
+        info = await client.api.get_group_member_info(group_id=GROUP, user_id=1)
+        assert server.count("get_group_member_info") == 1
+        assert info.get("sex") == "female"
+
+    run(test)
+
+
+def test_events_update_the_roster():
+    async def test(server: Server, cache: MemberCache, client: NapCatClient):
+        await cache.warm(GROUP)
+        server.ws.feed(notice(notice_type="group_card", user_id=1, card_new="NEW", card_old=""))
+        server.ws.feed(notice(notice_type="group_admin", sub_type="set", user_id=2))
+        server.ws.feed(notice(notice_type="group_decrease", sub_type="leave", user_id=3, operator_id=0))
+        server.ws.feed(notice(notice_type="group_increase", sub_type="approve", user_id=4, operator_id=0))
+        await asyncio.sleep(0.01)
+        carded, promoted = cache.get(GROUP, 1), cache.get(GROUP, 2)
+        assert carded is not None and carded.card == "NEW"
+        assert promoted is not None and promoted.role == "admin"
+        assert cache.get(GROUP, 3) is None
+        joined = cache.get(GROUP, 4)
+        assert joined is not None and joined.join_time == 50
+        # 新成员还没有昵称，查询走网络并写回
+        await client.api.get_group_member_info(group_id=GROUP, user_id=4)
+        await client.api.get_group_member_info(group_id=GROUP, user_id=4)
+        assert server.count("get_group_member_info") == 1
+
+    run(test)
+
+
+def test_bot_leaving_drops_the_group():
+    async def test(server: Server, cache: MemberCache, client: NapCatClient):
+        await cache.warm(GROUP)
+        server.ws.feed(notice(notice_type="group_decrease", sub_type="kick_me", user_id=123456, operator_id=9))
+        await asyncio.sleep(0.01)
+        assert cache.roster(GROUP) is None
+
+    run(test)
@@ -0,0 +1,106 @@
+# tests/test_message_store.py
+import asyncio
+from typing import Any
+
+from bench_utils import FakeWebSocket, group_message_frame, login_responder
+
+from napcat import MessageStore, NapCatClient
+from napcat.connection import Connection
+
+SENT_ID = 777
+
+
+class Server:
+    def __init__(self):
+        self.calls: list[str] = []
+        self.ws = FakeWebSocket(self.respond)
+
+    def respond(self, req: dict[str, Any]) -> list[dict[str, Any]]:
+        action, params = req["action"], req["params"]
+        self.calls.append(action)
+        if action == "get_msg":
+            message_id = int(params["message_id"])
+            data: Any = group_message_frame(message_id - 100000) | {"message_id": message_id}
+        elif action.startswith("send_"):
+            data = {"message_id": SENT_ID}
+        elif action == "delete_msg":
+            data = None
+        else:
+            return login_responder(req)
+        return [{"status": "ok", "retcode": 0, "data": data, "echo": req["echo"]}]
+
+
+def run(test: Any, **options: Any) -> None:
+    async def main():
+        server = Server()
+        store = MessageStore(**options)
+        async with NapCatClient(message_store=store, _existing_conn=Connection(server.ws)) as client:  # type: ignore[arg-type]
+            await test(server, store, client)
+            await server.ws.close()
+
+    asyncio.run(main())
+
+
+def test_received_message_answers_get_msg():
+    async def test(server: Server, store: MessageStore, client: NapCatClient):
+        frame = group_message_frame(1)
+        server.ws.feed(frame)
+        await asyncio.sleep(0.01)
+        msg = await client.api.get_msg(message_id=frame["message_id"])
+        assert server.calls.count("get_msg") == 0
+        assert msg["raw_message"] == frame["raw_message"]
+
+    run(test)
+
+
+def test_sent_message_is_not_answered_until_complete():
+    async def test(server: Server, store: MessageStore, client: NapCatClient):
+        await client.send_group_msg(10001, "hi")
+        partial = store.get(SENT_ID)
+        assert partial is not None and "raw_message" not in partial
+        # 发出的消息只有部分字段，get_msg 走网络并写回完整记录
+        await client.api.get_msg(message_id=SENT_ID)
+        await client.api.get_msg(message_id=SENT_ID)
+        assert server.calls.count("get_msg") == 1
+
+    run(test)
+
+
+def test_returned_segments_are_copies():
+    async def test(server: Server, store: MessageStore, client: NapCatClient):
+        frame = group_message_frame(2)
+        server.ws.feed(frame)
+        await asyncio.sleep(0.01)
+        first: Any = await client.api.get_msg(message_id=frame["message_id"])
+        first["message"][2]["data"]["text"] = "edited"
+        second: Any = await client.api.get_msg(message_id=frame["message_id"])
+        assert second["message"][2]["data"]["text"] == "hello world #2"
+
+    run(test)
+
+
+def test_recall_and_delete_invalidate():
+    async def test(server: Server, store: MessageStore, client: NapCatClient):
+        recalled, deleted = group_message_frame(3), group_message_frame(4)
+        server.ws.feed(recalled)
+        server.ws.feed(deleted)
+        await asyncio.sleep(0.01)
+        server.ws.feed({"post_type": "notice", "notice_type": "group_recall", "time": 1, "self_id": 123456,
+                        "group_id": 10001, "user_id": 222222, "operator_id": 222222, "message_id": recalled["message_id"]})
+        await client.api.delete_msg(message_id=deleted["message_id"])
+        await asyncio.sleep(0.01)
+        assert recalled["message_id"] not in store
+        assert deleted["message_id"] not in store
+
+    run(test)
+
+
+def test_old_messages_expire():
+    async def test(server: Server, store: MessageStore, client: NapCatClient):
+        frame = group_message_frame(5)
+        server.ws.feed(frame)
+        await asyncio.sleep(0.01)
+        await client.api.get_msg(message_id=frame["message_id"])
+        assert server.calls.count("get_msg") == 1
+
+    run(test, max_age=0.001)
@@ -0,0 +1,100 @@
+# tests/test_reconnect.py
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+
+import orjson
+import pytest
+from bench_utils import group_message_frame
+from websockets.asyncio.server import ServerConnection, serve
+
+from napcat import NapCatClient
+from napcat.reconnect import ReconnectPolicy
+
+
+class NapCat:
+    """本地 WebSocket 服务端：收到 drop 中列出的 action 时 (每个只一次) 直接断开连接"""
+
+    def __init__(self, drop: Iterable[str] = ()):
+        self.drop = set(drop)
+        self.received: list[str] = []
+        self.connections: list[ServerConnection] = []
+
+    async def handler(self, ws: ServerConnection) -> None:
+        self.connections.append(ws)
+        async for msg in ws:
+            req = orjson.loads(msg)
+            action = req["action"]
+            self.received.append(action)
+            if action in self.drop:
+                self.drop.discard(action)
+                await ws.close()
+                return
+            await ws.send(orjson.dumps({"status": "ok", "retcode": 0, "data": {"user_id": 1, "action": action}, "echo": req["echo"]}))
+
+
+def run(test: Any, drop: Iterable[str] = (), **policy: Any) -> None:
+    async def main():
+        napcat = NapCat(drop)
+        async with serve(napcat.handler, "127.0.0.1", 0) as server:
+            port = next(iter(server.sockets)).getsockname()[1]
+            reconnect = ReconnectPolicy(initial_delay=0.01, **policy)
+            async with NapCatClient(f"ws://127.0.0.1:{port}", reconnect=reconnect) as client:
+                await test(napcat, client)
+
+    asyncio.run(main())
+
+
+def test_read_only_call_is_replayed_after_reconnect():
+    async def test(napcat: NapCat, client: NapCatClient):
+        data = await client.call_action("get_group_info", {"group_id": 1})
+        assert data is not None and data["action"] == "get_group_info"
+        assert napcat.received.count("get_group_info") == 2
+        assert client.reconnects == 1
+
+    run(test, drop={"get_group_info"})
+
+
+@pytest.mark.parametrize("action", ["send_group_msg", "get_clientkey"])
+def test_non_read_only_call_is_not_replayed(action: str):
+    async def test(napcat: NapCat, client: NapCatClient):
+        with pytest.raises(ConnectionError):
+            await client.call_action(action, {"group_id": 1, "message": "x"})
+        assert napcat.received.count(action) == 1
+        # 重连后新的调用照常发出
+        await asyncio.sleep(0.1)
+        await client.call_action(action, {"group_id": 1, "message": "x"})
+        assert napcat.received.count(action) == 2
+
+    run(test, drop={action})
+
+
+def test_replay_can_be_disabled():
+    async def test(napcat: NapCat, client: NapCatClient):
+        with pytest.raises(ConnectionError):
+            await client.call_action("get_group_info", {"group_id": 1})
+        assert napcat.received.count("get_group_info") == 1
+
+    run(test, drop={"get_group_info"}, replay_idempotent=False)
+
+
+def test_event_stream_survives_reconnect():
+    async def test(napcat: NapCat, client: NapCatClient):
+        received: list[int] = []
+
+        async def consume():
+            async for event in client.events():
+                received.append(getattr(event, "message_id"))
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        await napcat.connections[-1].send(orjson.dumps(group_message_frame(1)))
+        await client.call_action("get_group_info", {"group_id": 1})
+        await asyncio.sleep(0.05)
+        await napcat.connections[-1].send(orjson.dumps(group_message_frame(2)))
+        await asyncio.sleep(0.05)
+        assert received == [100001, 100002]
+        assert not consumer.done()
+        consumer.cancel()
+
+    run(test, drop={"get_group_info"})